@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+BENCH_SCHEMA_VERSION = 1
+DEFAULT_SIZES = "10,1000,10000"
+
+# PRD NFR-3: `catalog`/`suggest` on 1k skills under 200ms with a local catalog.
+NFR3_SKILLS = 1000
+NFR3_BUDGET_MS = 200.0
+NFR3_COMMANDS = ("catalog", "suggest")
+
+INSTALL_COUNT = 10
+SUGGEST_QUERY = "security review"
+DEEP_QUERY = "sparse checkout"
+
+VOCAB = (
+    "api audit bash beads build cache checkout ci cli code commit config conflict deploy diff docs "
+    "explorer feature git graph hook index lint log merge migrate monitor notebook parser patch pdf "
+    "perf plan python query rebase refactor release review revset rust schema security shell sparse "
+    "spec sql sync template test trace typescript upgrade vault web worktree yaml"
+).split()
+
+
+def run(
+    cmd: list[str],
+    *,
+    cwd: Path | None = None,
+    check: bool = True,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=check,
+    )
+
+
+def git(args: list[str], *, cwd: Path) -> subprocess.CompletedProcess[str]:
+    return run(
+        ["git", "-c", "user.name=Bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+    )
+
+
+def _paragraph_pool(rng: random.Random, count: int = 64) -> list[str]:
+    pool: list[str] = []
+    for _ in range(count):
+        words = [rng.choice(VOCAB) for _ in range(rng.randint(40, 120))]
+        pool.append(" ".join(words).capitalize() + ".\n\n")
+    return pool
+
+
+def _reference_size(rng: random.Random, median_kb: float) -> int:
+    # Log-normal around the median, clipped to what real reference docs look like (256B..64KB).
+    size = rng.lognormvariate(math.log(median_kb * 1024), 1.0)
+    return int(min(max(size, 256), 64 * 1024))
+
+
+def generate_skills_repo(dest: Path, *, skills: int, seed: int, ref_median_kb: float) -> dict[str, Any]:
+    """
+    Write a synthetic skills repo (SKILL.md + references per skill), generate its catalog and commit.
+    """
+    rng = random.Random(seed)
+    pool = _paragraph_pool(rng)
+    started = time.perf_counter()
+    ids: list[str] = []
+    total_bytes = 0
+    for n in range(skills):
+        w1, w2 = rng.sample(VOCAB, 2)
+        skill_id = f"{w1}-{w2}-{n:05d}"
+        ids.append(skill_id)
+        skill_dir = dest / "skills" / skill_id
+        skill_dir.mkdir(parents=True)
+        topics = " ".join(rng.sample(VOCAB, 6))
+        text = (
+            "---\n"
+            f"name: {skill_id}\n"
+            f'description: "Synthetic {w1} {w2} skill covering {topics}."\n'
+            "---\n\n"
+            f"# {w1.capitalize()} {w2.capitalize()} {n}\n\n" + "".join(rng.sample(pool, 3))
+        )
+        (skill_dir / "SKILL.md").write_text(text, encoding="utf-8")
+        total_bytes += len(text)
+        for r in range(rng.choice((0, 1, 1, 2, 3))):
+            size = _reference_size(rng, ref_median_kb)
+            body = [f"# {skill_id} reference {r}\n\n"]
+            while sum(map(len, body)) < size:
+                body.append(rng.choice(pool))
+            ref = skill_dir / "references" / f"ref-{r}.md"
+            ref.parent.mkdir(exist_ok=True)
+            ref.write_text("".join(body)[:size], encoding="utf-8")
+            total_bytes += size
+
+    scripts_dir = Path(__file__).resolve().parent
+    (dest / "scripts").mkdir(parents=True)
+    for name in ("generate-catalog.py", "skill_frontmatter.py"):
+        shutil.copy2(scripts_dir / name, dest / "scripts" / name)
+    run([sys.executable, str(dest / "scripts" / "generate-catalog.py"), "--fts"], cwd=dest)
+    git(["init", "-q", "-b", "main"], cwd=dest)
+    git(["add", "-A"], cwd=dest)
+    git(["commit", "-q", "-m", f"synthetic {skills} skills"], cwd=dest)
+    return {
+        "skills": skills,
+        "content_bytes": total_bytes,
+        "generate_s": round(time.perf_counter() - started, 2),
+        "ids": ids,
+    }
+
+
+def _stats(samples: list[float]) -> dict[str, Any]:
+    if not samples:
+        return {"runs": 0}
+    return {
+        "runs": len(samples),
+        "median_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+class _Timer:
+    def __init__(self, skillsctl: Path, project: Path, env: dict[str, str]) -> None:
+        self.skillsctl = skillsctl
+        self.project = project
+        self.env = env
+
+    def __call__(self, argv: list[str]) -> float:
+        started = time.perf_counter()
+        res = run([sys.executable, str(self.skillsctl), *argv], cwd=self.project, env=self.env, check=False)
+        elapsed = (time.perf_counter() - started) * 1000
+        if res.returncode != 0:
+            raise RuntimeError(f"skillsctl {' '.join(argv)} failed ({res.returncode}): {res.stderr.strip()}")
+        return elapsed
+
+    def quiet(self, argv: list[str]) -> None:
+        self(argv)
+
+
+def bench_size(
+    tmp: Path,
+    skillsctl: Path,
+    *,
+    skills: int,
+    runs: int,
+    seed: int,
+    ref_median_kb: float,
+) -> dict[str, Any]:
+    src = tmp / f"src-{skills}"
+    info = generate_skills_repo(src, skills=skills, seed=seed, ref_median_kb=ref_median_kb)
+    ids = info.pop("ids")
+    picked = random.Random(seed).sample(ids, min(INSTALL_COUNT, len(ids)))
+
+    project = tmp / f"project-{skills}"
+    project.mkdir()
+    git(["init", "-q", "-b", "main"], cwd=project)
+    (project / "README.md").write_text("bench\n", encoding="utf-8")
+    git(["add", "-A"], cwd=project)
+    git(["commit", "-q", "-m", "init"], cwd=project)
+
+    # Fresh per-size caches; the daemon is bypassed so every run pays the full CLI cost.
+    env = dict(
+        os.environ,
+        SKILLSCTL_CACHE_DIR=str(tmp / f"cache-{skills}"),
+        SKILLSCTL_NO_DAEMON="1",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    timer = _Timer(skillsctl, project, env)
+    url = src.as_uri()
+    commands: dict[str, Any] = {}
+
+    def measure(name: str, argv: list[str], *, before: list[str] | None = None) -> None:
+        cold = timer(argv)
+        warm: list[float] = []
+        for _ in range(runs):
+            if before is not None:
+                timer.quiet(before)
+            warm.append(timer(argv))
+        commands[name] = {"cold_ms": round(cold, 1), "warm": _stats(warm)}
+
+    measure("bootstrap", ["bootstrap", "--repo-url", url, "--yes"])
+    measure("catalog", ["catalog", "--toon"])
+    measure("suggest", ["suggest", SUGGEST_QUERY, "--toon"])
+    measure("suggest-deep", ["suggest", "--deep", DEEP_QUERY, "--toon"])
+    measure("status", ["status", "--toon"])
+    measure("install", ["install", *picked, "--yes"], before=["remove", *picked, "--yes"])
+    measure("sync", ["sync", "--yes"])
+    measure("remove", ["remove", *picked, "--yes"], before=["install", *picked, "--yes"])
+    return {**info, "commands": commands}
+
+
+def nfr3_report(results: list[dict[str, Any]]) -> dict[str, Any] | None:
+    at = next((r for r in results if r["skills"] == NFR3_SKILLS), None)
+    if at is None:
+        return None
+    measured = {name: at["commands"][name]["warm"].get("median_ms") for name in NFR3_COMMANDS}
+    return {
+        "skills": NFR3_SKILLS,
+        "budget_ms": NFR3_BUDGET_MS,
+        "warm_median_ms": measured,
+        "pass": all(v is not None and v < NFR3_BUDGET_MS for v in measured.values()),
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *, fail_over_pct: float | None) -> int:
+    """
+    Print warm-median deltas against a baseline report; return 1 if any exceeds --fail-over.
+    """
+    base = {r["skills"]: r["commands"] for r in baseline.get("results", [])}
+    regressions = 0
+    print(f"{'skills':>6} {'command':<13} {'base_ms':>9} {'now_ms':>9} {'delta':>8}", file=sys.stderr)
+    for result in current["results"]:
+        for name, data in result["commands"].items():
+            old = base.get(result["skills"], {}).get(name, {}).get("warm", {}).get("median_ms")
+            now = data["warm"].get("median_ms")
+            if old is None or now is None:
+                continue
+            pct = (now - old) / old * 100 if old else 0.0
+            flag = ""
+            if fail_over_pct is not None and pct > fail_over_pct:
+                regressions += 1
+                flag = "  REGRESSION"
+            print(f"{result['skills']:>6} {name:<13} {old:>9.1f} {now:>9.1f} {pct:>+7.1f}%{flag}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _tree_revision(repo_root: Path) -> dict[str, Any]:
+    head = run(["git", "rev-parse", "HEAD"], cwd=repo_root, check=False).stdout.strip() or None
+    dirty = bool(run(["git", "status", "--porcelain"], cwd=repo_root, check=False).stdout.strip())
+    return {"commit": head, "dirty": dirty}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark skillsctl commands against synthetic skills repos (file:// remotes)."
+    )
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"Comma-separated skill counts to generate (default: {DEFAULT_SIZES}).",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Warm runs per command (default: 5).")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic repos (default: 1).")
+    parser.add_argument(
+        "--ref-median-kb",
+        type=float,
+        default=3.0,
+        help="Median reference doc size in KB; sizes are log-normal, 256B..64KB (default: 3).",
+    )
+    parser.add_argument("--out", help="Write the JSON report here (default: stdout).")
+    parser.add_argument("--compare", help="Baseline JSON report to diff warm medians against.")
+    parser.add_argument(
+        "--fail-over",
+        type=float,
+        help="With --compare: exit 1 if any warm median regresses by more than this percent.",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the generated repos (path printed to stderr).")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parent.parent
+    skillsctl = repo_root / "skills" / "vi-project-bootstrap" / "scripts" / "skillsctl.py"
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    tmp = Path(tempfile.mkdtemp(prefix="skillsctl-bench-"))
+    results: list[dict[str, Any]] = []
+    try:
+        for skills in sizes:
+            print(f"[..] {skills} skills", file=sys.stderr, flush=True)
+            results.append(
+                bench_size(
+                    tmp,
+                    skillsctl,
+                    skills=skills,
+                    runs=args.runs,
+                    seed=args.seed,
+                    ref_median_kb=args.ref_median_kb,
+                )
+            )
+    finally:
+        if args.keep:
+            print(f"[OK] Kept benchmark repos in {tmp}", file=sys.stderr)
+        else:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "tree": _tree_revision(repo_root),
+        "python": platform.python_version(),
+        "git": run(["git", "--version"], check=False).stdout.strip(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "results": results,
+        "nfr3": nfr3_report(results),
+    }
+    rendered = json.dumps(report, indent=2) + "\n"
+    if args.out:
+        Path(args.out).write_text(rendered, encoding="utf-8")
+    else:
+        sys.stdout.write(rendered)
+
+    nfr3 = report["nfr3"]
+    if nfr3 is not None:
+        verdict = "OK" if nfr3["pass"] else "FAIL"
+        print(
+            f"[{verdict}] NFR-3 at {NFR3_SKILLS} skills: {nfr3['warm_median_ms']} (budget {NFR3_BUDGET_MS:g}ms)",
+            file=sys.stderr,
+        )
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        return compare(baseline, report, fail_over_pct=args.fail_over)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
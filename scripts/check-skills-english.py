@@ -2,12 +2,31 @@
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import pathlib
 import re
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
 
 
 CYRILLIC_RE = re.compile(r"[\u0400-\u052F\u2DE0-\u2DFF\uA640-\uA69F]")
+# CYRILLIC_RE as UTF-8 byte sequences: U+0400-U+052F (2-byte, leads 0xD0-0xD4), U+2DE0-U+2DFF and
+# U+A640-U+A69F (3-byte). Only lines with a hit get decoded.
+CYRILLIC_BYTES_RE = re.compile(
+    rb"[\xd0-\xd3][\x80-\xbf]|\xd4[\x80-\xaf]|\xe2\xb7[\xa0-\xbf]|\xea\x99[\x80-\xbf]|\xea\x9a[\x80-\x9f]"
+)
+# Every CYRILLIC_BYTES_RE match starts with one of these. Locating candidates with bytes.find
+# (memchr) and confirming with .match is several times faster than CYRILLIC_BYTES_RE.search,
+# which steps through the alternation byte by byte.
+CYRILLIC_LEADS = (b"\xd0", b"\xd1", b"\xd2", b"\xd3", b"\xd4", b"\xe2\xb7", b"\xea\x99", b"\xea\x9a")
+
+# Below this many files a process pool costs more than it saves.
+MIN_FILES_PER_WORKER = 32
+
+Buffer = Union[bytes, mmap.mmap]
 
 
 def iter_markdown_files(skills_dir: pathlib.Path) -> list[pathlib.Path]:
@@ -24,16 +43,115 @@ def iter_markdown_files(skills_dir: pathlib.Path) -> list[pathlib.Path]:
     return sorted(set(files))
 
 
-def check_file(path: pathlib.Path) -> list[tuple[int, str]]:
-    try:
-        text = path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        text = path.read_text(encoding="utf-8", errors="replace")
+def in_scope(rel: pathlib.PurePath) -> bool:
+    """
+    Whether a skills-dir-relative path is one iter_markdown_files would list.
+    """
+    parts = rel.parts
+    if len(parts) < 2 or not parts[0].startswith("vi-"):
+        return False
+    if len(parts) == 2:
+        return parts[1] == "SKILL.md"
+    return parts[1] == "references" and rel.suffix == ".md"
+
+
+def _next_hit(buf: Buffer, pos: int, nxt: list[int]) -> re.Match[bytes] | None:
+    """
+    First CYRILLIC_BYTES_RE match at or after pos. nxt holds the next known offset of each
+    CYRILLIC_LEADS entry (-1 = none left) and is advanced in place.
+    """
+    while True:
+        best = -1
+        for i, at in enumerate(nxt):
+            if at != -1 and at < pos:
+                at = nxt[i] = buf.find(CYRILLIC_LEADS[i], pos)
+            if at != -1 and (best == -1 or at < best):
+                best = at
+        if best == -1:
+            return None
+        m = CYRILLIC_BYTES_RE.match(buf, best)
+        if m is not None:
+            return m
+        pos = best + 1
+
+
+def scan_bytes(buf: Buffer) -> list[tuple[int, str]]:
+    """
+    (1-based line, stripped line) for every line with Cyrillic text. Newlines are counted only
+    between hits and only hit lines are decoded.
+    """
     issues: list[tuple[int, str]] = []
-    for idx, line in enumerate(text.splitlines(), start=1):
-        if CYRILLIC_RE.search(line):
-            issues.append((idx, line.strip()))
-    return issues
+    nxt = [-2] * len(CYRILLIC_LEADS)  # below any pos: not searched yet
+    lineno, counted_to, pos = 1, 0, 0
+    while True:
+        m = _next_hit(buf, pos, nxt)
+        if m is None:
+            return issues
+        start = buf.rfind(b"\n", 0, m.start()) + 1
+        end = buf.find(b"\n", m.end())
+        end = len(buf) if end < 0 else end
+        lineno += buf[counted_to:start].count(b"\n")
+        counted_to = start
+        issues.append((lineno, buf[start:end].decode("utf-8", errors="replace").strip()))
+        pos = end
+
+
+def check_file(path: pathlib.Path) -> list[tuple[int, str]]:
+    with open(path, "rb") as fh:
+        try:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return []
+    with buf:
+        return scan_bytes(buf)
+
+
+def check_files(paths: list[str]) -> list[tuple[str, list[tuple[int, str]]]]:
+    """
+    Worker: [(path, issues)] for the files with issues, in input order.
+    """
+    out: list[tuple[str, list[tuple[int, str]]]] = []
+    for path in paths:
+        issues = check_file(pathlib.Path(path))
+        if issues:
+            out.append((path, issues))
+    return out
+
+
+def _chunks(items: list[str], n: int) -> list[list[str]]:
+    return [items[i::n] for i in range(n) if items[i::n]]
+
+
+def _git_lines(repo_root: pathlib.Path, args: list[str]) -> list[str]:
+    proc = subprocess.run(["git", "-C", str(repo_root), *args], capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", errors="replace").strip() or f"git {args[0]} failed")
+    return [p for p in proc.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p]
+
+
+def changed_files(repo_root: pathlib.Path, rev: str) -> list[pathlib.Path]:
+    """
+    Files changed since rev (committed, staged or in the worktree) plus untracked ones.
+    """
+    rels = _git_lines(repo_root, ["diff", "--name-only", "--relative", "-z", "--no-renames", "--diff-filter=d", rev, "--"])
+    rels += _git_lines(repo_root, ["ls-files", "--others", "--exclude-standard", "-z"])
+    return [repo_root / rel for rel in rels]
+
+
+def select_files(skills_dir: pathlib.Path, paths: list[pathlib.Path]) -> list[pathlib.Path]:
+    """
+    The existing, in-scope subset of paths (relative ones resolve against the current directory).
+    """
+    out: set[pathlib.Path] = set()
+    for path in paths:
+        path = path.expanduser().resolve()
+        try:
+            rel = path.relative_to(skills_dir)
+        except ValueError:
+            continue
+        if in_scope(rel) and path.is_file():
+            out.add(path)
+    return sorted(out)
 
 
 def main() -> int:
@@ -45,6 +163,24 @@ def main() -> int:
         default=str(pathlib.Path(__file__).resolve().parent.parent / "skills"),
         help="Path to the skills directory (default: repo_root/skills).",
     )
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument(
+        "--files",
+        nargs="*",
+        metavar="PATH",
+        help="Scan only these files (e.g. from pre-commit); out-of-scope or missing paths are ignored.",
+    )
+    scope.add_argument(
+        "--changed-since",
+        metavar="REV",
+        help="Scan only in-scope files changed since REV (git diff REV, plus untracked files).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count; 1 = in-process).",
+    )
     args = parser.parse_args()
 
     skills_dir = pathlib.Path(args.skills_dir).expanduser().resolve()
@@ -52,25 +188,39 @@ def main() -> int:
         print(f"[ERROR] skills dir not found: {skills_dir}", file=sys.stderr)
         return 2
 
-    md_files = iter_markdown_files(skills_dir)
-    if not md_files:
-        print(f"[WARN] no skill markdown files found under: {skills_dir}", file=sys.stderr)
-        return 0
-
-    failed = False
-    for md in md_files:
-        issues = check_file(md)
-        if not issues:
-            continue
-        failed = True
-        rel = md.relative_to(skills_dir.parent)
+    if args.files is not None:
+        md_files = select_files(skills_dir, [pathlib.Path(p) for p in args.files])
+    elif args.changed_since:
+        try:
+            md_files = select_files(skills_dir, changed_files(skills_dir.parent, args.changed_since))
+        except (OSError, RuntimeError) as e:
+            print(f"[ERROR] cannot list files changed since {args.changed_since}: {e}", file=sys.stderr)
+            return 2
+    else:
+        md_files = iter_markdown_files(skills_dir)
+        if not md_files:
+            print(f"[WARN] no skill markdown files found under: {skills_dir}", file=sys.stderr)
+            return 0
+
+    paths = [str(md) for md in md_files]
+    jobs = max(1, min(args.jobs, len(paths) // MIN_FILES_PER_WORKER))
+    if jobs == 1:
+        found = check_files(paths)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            found = [hit for chunk in pool.map(check_files, _chunks(paths, jobs)) for hit in chunk]
+        order = {path: idx for idx, path in enumerate(paths)}
+        found.sort(key=lambda hit: order[hit[0]])
+
+    for path, issues in found:
+        rel = pathlib.Path(path).relative_to(skills_dir.parent)
         print(f"[FAIL] Non-English (Cyrillic) text detected in: {rel}", file=sys.stderr)
         for lineno, line in issues[:20]:
             print(f"  L{lineno}: {line}", file=sys.stderr)
         if len(issues) > 20:
             print(f"  ... and {len(issues) - 20} more lines", file=sys.stderr)
 
-    if failed:
+    if found:
         print(
             "\nFix: translate skill docs to English (SKILL.md + references/*.md), then re-run.",
             file=sys.stderr,
@@ -81,4 +231,3 @@ def main() -> int:
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
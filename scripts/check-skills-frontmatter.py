@@ -6,6 +6,8 @@ import pathlib
 import re
 import sys
 
+import skill_frontmatter
+
 
 DOUBLE_QUOTED_RE = re.compile(r'^"([^"\\\\]|\\\\.)*"$')
 SINGLE_QUOTED_RE = re.compile(r"^'([^']|'')*'$")
@@ -30,37 +32,27 @@ def _unquote_scalar(value: str) -> str:
     return value
 
 
-def _extract_front_matter_lines(
-    text: str,
-) -> tuple[list[str] | None, int | None, str | None]:
-    lines = text.splitlines()
-    if not lines:
-        return None, None, "empty file"
-
-    first = lines[0].lstrip("\ufeff").strip()
-    if first != "---":
-        return None, None, "missing opening '---' YAML front matter delimiter"
-
-    for idx in range(1, len(lines)):
-        if lines[idx].strip() == "---":
-            # YAML front matter is lines[1:idx]; content starts at idx+1.
-            # YAML content starts at 1-based line 2.
-            return lines[1:idx], 2, None
+def validate_front_matter(data: bytes | str) -> tuple[list[tuple[int, str]], dict[str, str], int]:
+    """
+    Validate the YAML front matter of SKILL.md content (only the bytes up to the closing `---`
+    are looked at).
 
-    return None, None, "missing closing '---' YAML front matter delimiter"
+    Returns (issues, raw field values, 1-based line of the first YAML line). Does not check the
+    name against the directory; see check_name_matches.
+    """
+    try:
+        front = skill_frontmatter.parse_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+    except skill_frontmatter.FrontMatterError as e:
+        return [(1, str(e))], {}, 1
+    return validate_parsed(front)
 
 
-def validate_skill_file(skill_dir: pathlib.Path) -> list[tuple[int, str]]:
+def validate_parsed(front: skill_frontmatter.FrontMatter) -> tuple[list[tuple[int, str]], dict[str, str], int]:
+    """
+    validate_front_matter for front matter that is already parsed.
+    """
     issues: list[tuple[int, str]] = []
-    skill_md = skill_dir / "SKILL.md"
-    if not skill_md.exists():
-        return [(1, "missing SKILL.md")]
-
-    text = skill_md.read_text(encoding="utf-8", errors="replace")
-    yaml_lines, start_lineno, err = _extract_front_matter_lines(text)
-    if err is not None or yaml_lines is None or start_lineno is None:
-        return [(1, err or "invalid YAML front matter")]
-
+    yaml_lines, start_lineno = front.lines, front.start_lineno
     fields: dict[str, str] = {}
     i = 0
     while i < len(yaml_lines):
@@ -129,16 +121,36 @@ def validate_skill_file(skill_dir: pathlib.Path) -> list[tuple[int, str]]:
         if not fields.get(required):
             issues.append((start_lineno, f"missing required '{required}' in YAML front matter"))
 
+    return issues, fields, start_lineno
+
+
+def name_lineno(front: skill_frontmatter.FrontMatter) -> int:
+    """
+    1-based line of the `name:` key (the first YAML line when it is missing).
+    """
+    for span in skill_frontmatter.field_spans(front):
+        if span.key == "name":
+            return span.lineno
+    return front.start_lineno
+
+
+def check_name_matches(fields: dict[str, str], lineno: int, dir_name: str) -> list[tuple[int, str]]:
     name_value = _unquote_scalar(fields.get("name", ""))
-    if name_value and name_value != skill_dir.name:
-        issues.append(
-            (
-                start_lineno,
-                f"front matter name '{name_value}' does not match directory '{skill_dir.name}'",
-            )
-        )
+    if name_value and name_value != dir_name:
+        return [(lineno, f"front matter name '{name_value}' does not match directory '{dir_name}'")]
+    return []
+
 
-    return issues
+def validate_skill_file(skill_dir: pathlib.Path) -> list[tuple[int, str]]:
+    skill_md = skill_dir / "SKILL.md"
+    if not skill_md.exists():
+        return [(1, "missing SKILL.md")]
+    try:
+        front = skill_frontmatter.read(skill_md)
+    except skill_frontmatter.FrontMatterError as e:
+        return [(1, str(e))]
+    issues, fields, _ = validate_parsed(front)
+    return issues + check_name_matches(fields, name_lineno(front), skill_dir.name)
 
 
 def main() -> int:
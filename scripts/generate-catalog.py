@@ -2,11 +2,53 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import sqlite3
+import sys
+import tempfile
+import time
 from pathlib import Path
 from typing import Any
 
+import skill_frontmatter
+
+
+# Sidecar index for `skillsctl suggest`; must stay in sync with its scorer and tokenizer.
+INDEX_SCHEMA_VERSION = 1
+INDEX_FIELDS = ("tags", "title", "description")
+WORD_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+# Entry byte ranges for `skillsctl catalog` filters/paging: parse only the entries it returns.
+OFFSETS_SCHEMA_VERSION = 1
+
+# Full-text index for `skillsctl suggest --deep` (SQLite FTS5 over SKILL.md + other *.md docs).
+# Kept outside catalog/ (always in a project's sparse checkout): skillsctl reads the blob on demand.
+FTS_DB_REL = Path("fts/skills.fts.sqlite")
+FTS_SCHEMA_VERSION = 1
+FTS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS files("
+    "path TEXT PRIMARY KEY, skill_id TEXT NOT NULL, sha256 TEXT NOT NULL, doc INTEGER NOT NULL)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5("
+    "skill_id UNINDEXED, path UNINDEXED, title, body, tokenize='porter unicode61')",
+)
+
+# Persistent build cache (gitignored, safe to delete): content hashes of skill docs keyed by
+# path + size + mtime, parsed SKILL.md fields keyed by content hash and rendered entries. The
+# small CLEAN file holds the fingerprint of the last inputs/outputs known to be consistent, so
+# --check can answer from stat calls alone without loading the cache. As in git's index, a
+# signature is only trusted for files last modified before the cache file was written (see
+# _is_racy); the cache files' own mtimes serve as the write times.
+CACHE_REL = Path(".cache/generate-catalog.json")
+CLEAN_REL = Path(".cache/generate-catalog.clean")
+CACHE_VERSION = 1
+
+# --watch polls these stat signatures; the JSON catalog is included so hand edits to curated
+# fields (tags, aliases, requires) are picked up too.
+CATALOG_REL = "catalog/skills.json"
 
 KEY_VALUE_RE = re.compile(r"^([A-Za-z0-9_-]+):(.*)$")
 DOUBLE_QUOTED_RE = re.compile(r'^"([^"\\\\]|\\\\.)*"$')
@@ -25,19 +67,6 @@ def _unquote_scalar(value: str) -> str:
     return value
 
 
-def _split_frontmatter(text: str) -> tuple[list[str], list[str]]:
-    lines = text.splitlines()
-    if not lines:
-        raise ValueError("empty file")
-    if lines[0].lstrip("\ufeff").strip() != "---":
-        raise ValueError("missing opening '---' YAML front matter delimiter")
-
-    for idx in range(1, len(lines)):
-        if lines[idx].strip() == "---":
-            return lines[1:idx], lines[idx + 1 :]
-    raise ValueError("missing closing '---' YAML front matter delimiter")
-
-
 def _parse_frontmatter_subset(frontmatter_lines: list[str]) -> dict[str, str]:
     """
     Parse a tiny YAML subset suitable for this repo's SKILL.md frontmatter.
@@ -103,15 +132,13 @@ def _parse_frontmatter_subset(frontmatter_lines: list[str]) -> dict[str, str]:
     return out
 
 
-def _extract_title(body_lines: list[str], fallback_id: str) -> str:
-    for raw in body_lines:
-        line = raw.strip()
-        if line.startswith("# "):
-            title = line[2:].strip()
-            title = title.replace("`", "")
-            title = re.sub(r"\s+", " ", title).strip()
-            if title:
-                return title
+def _extract_title(heading: str | None, fallback_id: str) -> str:
+    if heading is not None:
+        title = heading.strip()
+        title = title.replace("`", "")
+        title = re.sub(r"\s+", " ", title).strip()
+        if title:
+            return title
     # Fallback: Title Case from id.
     return " ".join(w.capitalize() for w in fallback_id.split("-") if w)
 
@@ -150,39 +177,195 @@ def _load_existing_catalog(catalog_path: Path) -> dict[str, dict[str, Any]]:
     return out
 
 
-def build_catalog(repo_root: Path) -> dict[str, Any]:
-    skills_dir = repo_root / "skills"
-    catalog_path = repo_root / "catalog" / "skills.json"
+def _generator_sha256() -> str:
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(Path(skill_frontmatter.__file__).read_bytes())
+    return digest.hexdigest()
 
-    existing = _load_existing_catalog(catalog_path)
 
-    skills: list[dict[str, Any]] = []
-    for skill_dir in sorted([p for p in skills_dir.iterdir() if p.is_dir() and not p.name.startswith(".")]):
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_md.exists():
-            continue
+def _empty_cache(generator: str) -> dict[str, Any]:
+    return {"version": CACHE_VERSION, "generator": generator, "files": {}, "skills": {}, "pieces": {}}
+
+
+def load_cache(repo_root: Path) -> dict[str, Any]:
+    """
+    Read the build cache; anything unreadable, from another version or from a different
+    generator script yields an empty cache (a full rebuild).
+    """
+    generator = _generator_sha256()
+    path = repo_root / CACHE_REL
+    try:
+        written_ns = path.stat().st_mtime_ns  # before reading: a concurrent rewrite only makes it older
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _empty_cache(generator)
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != CACHE_VERSION
+        or data.get("generator") != generator
+        or not isinstance(data.get("files"), dict)
+        or not isinstance(data.get("skills"), dict)
+        or not isinstance(data.get("pieces"), dict)
+    ):
+        return _empty_cache(generator)
+    data["files"] = {
+        rel: entry
+        for rel, entry in data["files"].items()
+        if isinstance(entry, dict) and not _is_racy(entry.get("stat"), written_ns)
+    }
+    return data
+
+
+def _write_cache_file(repo_root: Path, rel: Path, text: str) -> None:
+    path = repo_root / rel
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Cannot write {rel}: {e}", file=sys.stderr)
+
+
+def save_cache(repo_root: Path, cache: dict[str, Any], clean: str | None) -> None:
+    """
+    Persist the cache and the clean fingerprint (None: outputs are known to be stale).
+    """
+    _write_cache_file(repo_root, CACHE_REL, json.dumps(cache, separators=(",", ":"), sort_keys=True))
+    _write_cache_file(repo_root, CLEAN_REL, (clean or "") + "\n")
+
+
+def load_clean(repo_root: Path) -> tuple[str, int] | None:
+    """
+    (clean fingerprint, mtime_ns of the CLEAN file) or None.
+    """
+    path = repo_root / CLEAN_REL
+    try:
+        written_ns = path.stat().st_mtime_ns
+        clean = path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return (clean, written_ns) if clean else None
+
+
+def _is_racy(sig: Any, written_ns: int) -> bool:
+    """
+    Whether a [size, mtime_ns] signature recorded by a cache write at written_ns proves nothing.
+
+    A file modified in the same timestamp tick as (or after) the write may have changed again
+    without changing its size or mtime, so it has to be hashed (git's "racily clean" entries).
+    """
+    return not isinstance(sig, list) or len(sig) != 2 or sig[1] >= written_ns
+
 
-        text = skill_md.read_text(encoding="utf-8", errors="replace")
-        fm_lines, body_lines = _split_frontmatter(text)
-        fm = _parse_frontmatter_subset(fm_lines)
+def _stat_sig(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _cached_sha256(
+    repo_root: Path,
+    rel: str,
+    cache: dict[str, Any] | None,
+    sig: list[int] | None = None,
+) -> tuple[str, skill_frontmatter.Buffer | None]:
+    """
+    (sha256, content) of a repo file, reusing the cached hash while its size and mtime are
+    unchanged (content is None then: the file was not read). Content is an mmap, not a copy.
+    """
+    if sig is None:
+        sig = _stat_sig(repo_root / rel)
+    entry = cache["files"].get(rel) if cache is not None else None
+    if sig is not None and isinstance(entry, dict) and entry.get("stat") == sig:
+        return str(entry["sha256"]), None
+    raw = skill_frontmatter.map_file(repo_root / rel)
+    sha = hashlib.sha256(raw).hexdigest()
+    if cache is not None and sig is not None:
+        cache["files"][rel] = {"stat": sig, "sha256": sha}
+    return sha, raw
+
+
+def _parse_skill(
+    repo_root: Path,
+    skill_id: str,
+    cache: dict[str, Any] | None,
+    sig: list[int] | None = None,
+) -> dict[str, str]:
+    """
+    name / description / title of one SKILL.md; re-parsed only when its content hash changed.
+    """
+    rel = f"skills/{skill_id}/SKILL.md"
+    sha, raw = _cached_sha256(repo_root, rel, cache, sig)
+    entry = cache["skills"].get(skill_id) if cache is not None else None
+    if isinstance(entry, dict) and entry.get("sha256") == sha:
+        return dict(entry["parsed"])
+    skill_md = repo_root / rel
+    if raw is None:
+        raw = skill_frontmatter.map_file(skill_md)
+
+    try:
+        front = skill_frontmatter.parse_bytes(raw)
+    except skill_frontmatter.FrontMatterError as e:
+        raise ValueError(f"{e} in {skill_md}") from None
+    fm = _parse_frontmatter_subset(front.lines)
+
+    name = fm.get("name", "").strip()
+    desc = fm.get("description", "").strip()
+    if not name:
+        raise ValueError(f"missing frontmatter name in {skill_md}")
+    if name != skill_id:
+        raise ValueError(f"frontmatter name {name!r} does not match directory {skill_id!r} in {skill_md}")
+    if not desc:
+        raise ValueError(f"missing frontmatter description in {skill_md}")
+
+    title = _extract_title(skill_frontmatter.first_heading(raw, front.body_offset), fallback_id=skill_id)
+    parsed = {"name": name, "description": desc, "title": title}
+    if cache is not None:
+        cache["skills"][skill_id] = {"sha256": sha, "parsed": parsed}
+    return dict(parsed)
+
+
+def build_catalog(
+    repo_root: Path,
+    cache: dict[str, Any] | None = None,
+    existing: dict[str, dict[str, Any]] | None = None,
+    sigs: dict[str, list[int] | None] | None = None,
+) -> dict[str, Any]:
+    """
+    existing: current catalog entries by id (curated title/tags/aliases/requires are kept); read
+    from catalog/skills.json when None. sigs: stat signatures already taken (scan_skill_docs), so
+    unchanged skills cost no further syscalls.
+    """
+    skills_dir = repo_root / "skills"
+    catalog_path = repo_root / "catalog" / "skills.json"
 
-        skill_id = skill_dir.name
-        name = fm.get("name", "").strip()
-        desc = fm.get("description", "").strip()
-        if not name:
-            raise ValueError(f"missing frontmatter name in {skill_md}")
-        if name != skill_id:
-            raise ValueError(f"frontmatter name {name!r} does not match directory {skill_id!r} in {skill_md}")
-        if not desc:
-            raise ValueError(f"missing frontmatter description in {skill_md}")
+    if existing is None:
+        existing = _load_existing_catalog(catalog_path)
 
-        title = _extract_title(body_lines, fallback_id=skill_id)
+    skills: list[dict[str, Any]] = []
+    if sigs is not None:
+        skill_ids = sorted(rel.split("/")[1] for rel in sigs if rel.count("/") == 2 and rel.endswith("/SKILL.md"))
+    else:
+        skill_ids = [
+            p.name
+            for p in sorted(skills_dir.iterdir())
+            if p.is_dir() and not p.name.startswith(".") and (p / "SKILL.md").exists()
+        ]
+    for skill_id in skill_ids:
+        parsed = _parse_skill(repo_root, skill_id, cache, sigs.get(f"skills/{skill_id}/SKILL.md") if sigs else None)
+        desc = parsed["description"]
+        title = parsed["title"]
 
         old = existing.get(skill_id, {})
         if isinstance(old.get("title"), str) and old.get("title"):
             title = str(old["title"])
         tags = old.get("tags") if isinstance(old.get("tags"), list) else _default_tags(skill_id)
         aliases = old.get("aliases") if isinstance(old.get("aliases"), list) else []
+        requires = old.get("requires") if isinstance(old.get("requires"), list) else []
 
         skills.append(
             {
@@ -191,39 +374,551 @@ def build_catalog(repo_root: Path) -> dict[str, Any]:
                 "description": desc,
                 "tags": tags,
                 "aliases": aliases,
+                "requires": requires,
                 "targets": {"codex": {"path": f"skills/{skill_id}"}},
             }
         )
 
     skills.sort(key=lambda s: str(s.get("id", "")))
+    known = {s["id"] for s in skills}
+    if cache is not None:
+        cache["skills"] = {k: v for k, v in cache["skills"].items() if k in known}
+    for s in skills:
+        for dep in s["requires"]:
+            if dep not in known or dep == s["id"]:
+                raise ValueError(f"skill {s['id']!r} has invalid requires entry {dep!r}")
     return {"schema_version": 1, "skills": skills}
 
 
+def _words(text: str) -> set[str]:
+    return {w for w in WORD_SPLIT_RE.split(text.lower()) if w}
+
+
+def build_suggest_index(catalog: dict[str, Any], rendered: str) -> dict[str, Any]:
+    """
+    Build the inverted index `skillsctl suggest` scores from instead of scanning every entry.
+
+    - keys: sorted [lowercase id or alias, skill index] pairs for exact/prefix matches.
+    - words: lowercase alphanumeric word -> [[skill index, field mask], ...], where bit i of the
+      mask is set if the word occurs in INDEX_FIELDS[i]. Query tokens are alphanumeric, so
+      "token is a substring of the field" is equivalent to "token is a substring of one of the
+      field's words".
+    - catalog_sha256 lets readers detect a stale index.
+    """
+    ids: list[str] = []
+    keys: list[list[Any]] = []
+    postings: dict[str, dict[int, int]] = {}
+    for item in catalog.get("skills", []):
+        skill_id = str(item.get("id") or "")
+        idx = len(ids)
+        ids.append(skill_id)
+        keys.append([skill_id.lower(), idx])
+        for alias in item.get("aliases") or []:
+            if isinstance(alias, str):
+                keys.append([alias.lower(), idx])
+        tags = item.get("tags") or []
+        fields = {
+            "tags": " ".join(str(t) for t in tags) if isinstance(tags, list) else "",
+            "title": str(item.get("title") or ""),
+            "description": str(item.get("description") or ""),
+        }
+        for bit, field in enumerate(INDEX_FIELDS):
+            for word in _words(fields[field]):
+                per_skill = postings.setdefault(word, {})
+                per_skill[idx] = per_skill.get(idx, 0) | (1 << bit)
+    keys.sort()
+    return {
+        "schema_version": INDEX_SCHEMA_VERSION,
+        "catalog_sha256": hashlib.sha256(rendered.encode("utf-8")).hexdigest(),
+        "fields": list(INDEX_FIELDS),
+        "ids": ids,
+        "keys": keys,
+        "words": {w: sorted([i, m] for i, m in postings[w].items()) for w in sorted(postings)},
+    }
+
+
+def render_suggest_index(index: dict[str, Any]) -> str:
+    return json.dumps(index, ensure_ascii=False, sort_keys=True, separators=(",", ":")) + "\n"
+
+
+def _render_entry(item: dict[str, Any], cache: dict[str, Any] | None = None) -> str:
+    """
+    One catalog entry as it appears in the indent=2 rendering (depth 2: nested lines carry 4
+    extra spaces). The pure-Python indenting encoder is slow, so pieces are cached under the
+    entry's compact (C-encoded) JSON.
+    """
+    key = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+    pieces = cache.setdefault("pieces", {}) if cache is not None else {}
+    piece = pieces.get(key)
+    if piece is None:
+        piece = json.dumps(item, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+        pieces[key] = piece
+    return piece
+
+
+def render_catalog(catalog: dict[str, Any], cache: dict[str, Any] | None = None) -> str:
+    """
+    Same bytes as `json.dumps(catalog, indent=2, ensure_ascii=False) + "\\n"`, assembled from
+    per-entry pieces.
+    """
+    pieces = [_render_entry(item, cache) for item in catalog.get("skills", [])]
+    if cache is not None:
+        used = set(pieces)
+        cache["pieces"] = {k: v for k, v in cache["pieces"].items() if v in used}
+    skills = "[\n    " + ",\n    ".join(pieces) + "\n  ]" if pieces else "[]"
+    head = json.dumps({k: v for k, v in catalog.items() if k != "skills"}, indent=2, ensure_ascii=False)
+    return head[:-2] + f',\n  "skills": {skills}\n}}\n'
+
+
+def build_catalog_offsets(
+    catalog: dict[str, Any],
+    rendered: str,
+    cache: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Locate each skill entry inside the rendered catalog.
+
+    - ids / tags: per entry, in catalog order (enough to filter by id prefix or tag).
+    - spans: [byte offset, byte length] of the entry's JSON object in catalog/skills.json.
+    """
+    ids: list[str] = []
+    tags: list[list[str]] = []
+    spans: list[list[int]] = []
+    char_pos = byte_pos = 0
+    for item in catalog.get("skills", []):
+        piece = _render_entry(item, cache)
+        start = rendered.index(piece, char_pos)
+        byte_pos += len(rendered[char_pos:start].encode("utf-8"))
+        length = len(piece.encode("utf-8"))
+        ids.append(str(item.get("id") or ""))
+        item_tags = item.get("tags") or []
+        tags.append([str(t).lower() for t in item_tags] if isinstance(item_tags, list) else [])
+        spans.append([byte_pos, length])
+        char_pos = start + len(piece)
+        byte_pos += length
+    return {
+        "schema_version": OFFSETS_SCHEMA_VERSION,
+        "catalog_sha256": hashlib.sha256(rendered.encode("utf-8")).hexdigest(),
+        "ids": ids,
+        "tags": tags,
+        "spans": spans,
+    }
+
+
+def render_catalog_offsets(offsets: dict[str, Any]) -> str:
+    return json.dumps(offsets, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def fts5_available() -> bool:
+    try:
+        with sqlite3.connect(":memory:") as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def scan_skill_docs(repo_root: Path) -> dict[str, list[int] | None]:
+    """
+    Repo-relative path -> [size, mtime_ns] of every *.md file under skills/ (dot entries skipped).
+    """
+    out: dict[str, list[int] | None] = {}
+    root = str(repo_root)
+    stack = ["skills"]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            it = os.scandir(os.path.join(root, rel_dir))
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                rel = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    st = entry.stat()
+                    out[rel] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+def _iter_skill_docs(
+    repo_root: Path,
+    catalog: dict[str, Any],
+    scanned: dict[str, list[int] | None] | None = None,
+) -> dict[str, tuple[str, list[int] | None]]:
+    """
+    Map repo-relative doc path -> (skill id, stat signature) for every *.md under each skill.
+    """
+    if scanned is None:
+        scanned = scan_skill_docs(repo_root)
+    owners = {str(item["targets"]["codex"]["path"]).strip("/"): item["id"] for item in catalog.get("skills", [])}
+    docs: dict[str, tuple[str, list[int] | None]] = {}
+    for rel in sorted(scanned):
+        parts = rel.split("/")
+        for depth in range(len(parts) - 1, 0, -1):
+            owner = owners.get("/".join(parts[:depth]))
+            if owner is not None:
+                docs[rel] = (owner, scanned[rel])
+                break
+    return docs
+
+
+def _doc_title(text: str, fallback: str) -> str:
+    for raw in text.splitlines():
+        if raw.startswith("# "):
+            return raw[2:].strip().replace("`", "") or fallback
+    return fallback
+
+
+def _fts_stored_hashes(db_path: Path) -> dict[str, str] | None:
+    """
+    path -> content sha256 recorded in an FTS database; None if it is missing, unreadable or
+    from another schema version.
+    """
+    if not db_path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        version = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or version[0] != str(FTS_SCHEMA_VERSION):
+            return None
+        return {path: sha for path, sha in conn.execute("SELECT path, sha256 FROM files")}
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+
+def update_fts_index(
+    repo_root: Path,
+    catalog: dict[str, Any],
+    db_path: Path,
+    *,
+    check: bool = False,
+    cache: dict[str, Any] | None = None,
+    scanned: dict[str, list[int] | None] | None = None,
+) -> int:
+    """
+    Bring the FTS5 database in line with the skill docs. Returns the number of added/updated/
+    removed docs (with check=True, the number that would change; nothing is written).
+
+    Freshness is decided from the content hashes stored in the database. When anything differs
+    the database is rebuilt from scratch in path order, optimized and vacuumed into a temp file
+    and renamed into place, so the same docs always give the same bytes (for a given SQLite).
+    """
+    docs = _iter_skill_docs(repo_root, catalog, scanned)
+    hashes = {rel: _cached_sha256(repo_root, rel, cache, sig)[0] for rel, (_, sig) in docs.items()}
+
+    known = _fts_stored_hashes(db_path)
+    if known is None:
+        changed = len(docs) or 1
+    else:
+        changed = sum(1 for p in known if p not in docs) + sum(1 for p in docs if known.get(p) != hashes[p])
+    if check or not changed:
+        return changed
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=db_path.name + ".", dir=db_path.parent)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp)
+        try:
+            conn.execute("PRAGMA page_size = 4096")
+            for stmt in FTS_SCHEMA:
+                conn.execute(stmt)
+            conn.execute("INSERT INTO meta(key, value) VALUES ('schema_version', ?)", (str(FTS_SCHEMA_VERSION),))
+            for rel in sorted(docs):
+                skill_id, _ = docs[rel]
+                path = repo_root / rel
+                text = path.read_text(encoding="utf-8", errors="replace")
+                cur = conn.execute(
+                    "INSERT INTO docs(skill_id, path, title, body) VALUES (?, ?, ?, ?)",
+                    (skill_id, rel, _doc_title(text, fallback=path.stem), text),
+                )
+                conn.execute(
+                    "INSERT INTO files(path, skill_id, sha256, doc) VALUES (?, ?, ?, ?)",
+                    (rel, skill_id, hashes[rel], cur.lastrowid),
+                )
+            conn.execute("INSERT INTO docs(docs) VALUES ('optimize')")
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, db_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return changed
+
+
+def build_fingerprint(
+    repo_root: Path,
+    outputs: list[Path],
+    scanned: dict[str, list[int] | None],
+    *,
+    use_fts: bool,
+) -> str:
+    """
+    Digest of everything the outputs depend on, from stat calls only: size + mtime of every skill
+    doc (as scanned) and of the output files themselves.
+    """
+    files = dict(scanned)
+    for path in outputs:
+        files[path.relative_to(repo_root).as_posix()] = _stat_sig(path)
+    payload = json.dumps(
+        {"generator": _generator_sha256(), "fts": use_fts, "files": files},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def catalog_outputs(repo_root: Path, *, use_fts: bool) -> list[Path]:
+    catalog_dir = repo_root / "catalog"
+    outputs = [catalog_dir / "skills.json", catalog_dir / "skills.index.json", catalog_dir / "skills.offsets.json"]
+    return outputs + ([repo_root / FTS_DB_REL] if use_fts else [])
+
+
+def _render_outputs(
+    repo_root: Path,
+    cache: dict[str, Any] | None,
+    scanned: dict[str, list[int] | None],
+    existing: dict[str, dict[str, Any]] | None = None,
+) -> tuple[dict[str, Any], str, str, str]:
+    data = build_catalog(repo_root, cache, existing, scanned)
+    if cache is not None:
+        cache["files"] = {rel: v for rel, v in cache["files"].items() if rel in scanned}
+    rendered = render_catalog(data, cache)
+    rendered_index = render_suggest_index(build_suggest_index(data, rendered))
+    rendered_offsets = render_catalog_offsets(build_catalog_offsets(data, rendered, cache))
+    return data, rendered, rendered_index, rendered_offsets
+
+
+def check_catalog(repo_root: Path, *, use_fts: bool, use_cache: bool = True) -> list[str]:
+    """
+    Repo-relative paths of generated outputs that are out of date ([] if all are fresh).
+
+    With the cache, an unchanged tree is answered from the clean fingerprint (stat calls only),
+    unless some input was modified no earlier than the fingerprint was written: then the racy
+    inputs are hashed again.
+    """
+    outputs = catalog_outputs(repo_root, use_fts=use_fts)
+    # Scanned once up front: a doc edited mid-run leaves a stale signature, so the next run rebuilds.
+    scanned = scan_skill_docs(repo_root)
+    if use_cache:
+        clean = load_clean(repo_root)
+        if clean is not None and clean[0] == build_fingerprint(repo_root, outputs, scanned, use_fts=use_fts):
+            sigs = [*scanned.values(), *(_stat_sig(path) for path in outputs)]
+            if not any(sig is not None and _is_racy(sig, clean[1]) for sig in sigs):
+                return []
+    cache = load_cache(repo_root) if use_cache else None
+
+    data, *rendered = _render_outputs(repo_root, cache, scanned)
+    stale = [
+        path.relative_to(repo_root).as_posix()
+        for path, expected in zip(outputs, rendered)
+        if (path.read_text(encoding="utf-8") if path.exists() else "") != expected
+    ]
+    if use_fts and update_fts_index(repo_root, data, outputs[3], check=True, cache=cache, scanned=scanned):
+        stale.append(outputs[3].relative_to(repo_root).as_posix())
+    if cache is not None:
+        clean = None if stale else build_fingerprint(repo_root, outputs, scanned, use_fts=use_fts)
+        save_cache(repo_root, cache, clean)
+    return stale
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    """
+    Atomically replace path with text (temp file + rename) unless it already holds exactly that.
+    """
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def generate(
+    repo_root: Path,
+    *,
+    use_fts: bool,
+    cache: dict[str, Any] | None,
+    existing: dict[str, dict[str, Any]] | None = None,
+    persist: bool = True,
+) -> tuple[dict[str, Any], list[str], int]:
+    """
+    Rebuild the outputs, rewriting only files whose bytes change; save the cache if persist.
+
+    Returns (catalog data, repo-relative paths rewritten, FTS docs re-indexed).
+    """
+    outputs = catalog_outputs(repo_root, use_fts=use_fts)
+    scanned = scan_skill_docs(repo_root)
+    data, *rendered = _render_outputs(repo_root, cache, scanned, existing)
+    outputs[0].parent.mkdir(parents=True, exist_ok=True)
+    written = [
+        path.relative_to(repo_root).as_posix() for path, text in zip(outputs, rendered) if _write_if_changed(path, text)
+    ]
+    reindexed = update_fts_index(repo_root, data, outputs[3], cache=cache, scanned=scanned) if use_fts else 0
+    if cache is not None and persist:
+        save_cache(repo_root, cache, build_fingerprint(repo_root, outputs, scanned, use_fts=use_fts))
+    return data, written, reindexed
+
+
+def snapshot_watched(repo_root: Path) -> dict[str, list[int] | None]:
+    """
+    Stat signatures of what --watch polls: skills/*/SKILL.md and catalog/skills.json.
+    """
+    out: dict[str, list[int] | None] = {}
+    try:
+        entries = sorted(os.scandir(repo_root / "skills"), key=lambda e: e.name)
+    except OSError:
+        entries = []
+    for entry in entries:
+        if entry.name.startswith(".") or not entry.is_dir():
+            continue
+        rel = f"skills/{entry.name}/SKILL.md"
+        sig = _stat_sig(repo_root / rel)
+        if sig is not None:
+            out[rel] = sig
+    out[CATALOG_REL] = _stat_sig(repo_root / CATALOG_REL)
+    return out
+
+
+def watch(repo_root: Path, *, use_fts: bool, use_cache: bool, interval: float, debounce: float) -> int:
+    """
+    Poll stat snapshots and regenerate after each burst of edits has been quiet for `debounce`
+    seconds. Parses and rendered entries stay in memory between rebuilds (persisted too unless
+    use_cache is False), so a rebuild re-parses only the SKILL.md files that changed.
+    """
+    cache = load_cache(repo_root) if use_cache else _empty_cache(_generator_sha256())
+    existing: dict[str, dict[str, Any]] | None = None
+    snapshot: dict[str, list[int] | None] = {}
+    print(f"[OK] Watching skills/*/SKILL.md every {interval:g}s (Ctrl-C to stop)")
+    try:
+        while True:
+            current = snapshot_watched(repo_root)
+            if current != snapshot:
+                settled = current
+                while True:
+                    time.sleep(debounce)
+                    current = snapshot_watched(repo_root)
+                    if current == settled:
+                        break
+                    settled = current
+                changed = [rel for rel in current.keys() | snapshot.keys() if current.get(rel) != snapshot.get(rel)]
+                if current.get(CATALOG_REL) != snapshot.get(CATALOG_REL):
+                    existing = None  # first pass or edited by hand: re-read curated fields
+                started = time.perf_counter()
+                try:
+                    data, written, reindexed = generate(
+                        repo_root, use_fts=use_fts, cache=cache, existing=existing, persist=use_cache
+                    )
+                except (OSError, ValueError, sqlite3.Error) as e:
+                    print(f"[WARN] Rebuild failed ({e}); waiting for the next change", file=sys.stderr)
+                else:
+                    existing = {item["id"]: item for item in data["skills"]}
+                    elapsed = (time.perf_counter() - started) * 1000
+                    label = f"{len(changed)} change(s)" if snapshot else "initial build"
+                    outputs = ", ".join(written) if written else "outputs unchanged"
+                    fts = f", {reindexed} doc(s) re-indexed" if reindexed else ""
+                    print(f"[OK] {label}: {outputs}{fts} ({elapsed:.0f}ms)")
+                current[CATALOG_REL] = _stat_sig(repo_root / CATALOG_REL)
+                snapshot = current
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate catalog/skills.json from skills/*/SKILL.md")
     parser.add_argument("--check", action="store_true", help="Exit non-zero if catalog/skills.json would change.")
+    parser.add_argument(
+        "--fts",
+        action="store_true",
+        help=(
+            f"Also rebuild (with --check: compare) the SQLite FTS5 full-text index {FTS_DB_REL}. "
+            "A release step; per-PR runs leave the binary alone."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not update the build cache ({CACHE_REL}); re-parse every skill.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Poll skills/*/SKILL.md and regenerate after each burst of edits (no inotify needed).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="--watch: seconds between stat polls (default: 0.5).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="--watch: rebuild once no watched file changed for this many seconds (default: 0.3).",
+    )
     args = parser.parse_args()
+    if args.watch and args.check:
+        parser.error("--watch and --check are mutually exclusive")
 
     repo_root = Path(__file__).resolve().parent.parent
-    catalog_path = repo_root / "catalog" / "skills.json"
-
-    data = build_catalog(repo_root)
-    rendered = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    use_fts = args.fts
+    if use_fts and not fts5_available():
+        print(f"[ERROR] SQLite FTS5 is unavailable; cannot build {FTS_DB_REL}", file=sys.stderr)
+        return 2
 
     if args.check:
-        current = catalog_path.read_text(encoding="utf-8") if catalog_path.exists() else ""
-        if current != rendered:
-            print("[FAIL] catalog/skills.json is out of date. Run: python3 scripts/generate-catalog.py")
+        stale = check_catalog(repo_root, use_fts=use_fts, use_cache=not args.no_cache)
+        if stale:
+            fix = "python3 scripts/generate-catalog.py" + (" --fts" if use_fts else "")
+            print(f"[FAIL] {', '.join(stale)} out of date. Run: {fix}")
             return 1
         print("[OK] catalog/skills.json is up to date.")
         return 0
 
-    catalog_path.parent.mkdir(parents=True, exist_ok=True)
-    catalog_path.write_text(rendered, encoding="utf-8")
-    print("[OK] Wrote catalog/skills.json")
+    if args.watch:
+        return watch(
+            repo_root,
+            use_fts=use_fts,
+            use_cache=not args.no_cache,
+            interval=max(args.interval, 0.05),
+            debounce=max(args.debounce, 0.0),
+        )
+
+    _, _, reindexed = generate(repo_root, use_fts=use_fts, cache=None if args.no_cache else load_cache(repo_root))
+    print("[OK] Wrote catalog/skills.json (+ skills.index.json, skills.offsets.json)")
+    if use_fts:
+        print(
+            f"[OK] Rebuilt {FTS_DB_REL} ({reindexed} doc(s) changed)"
+            if reindexed
+            else f"[OK] {FTS_DB_REL} is up to date."
+        )
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -0,0 +1,155 @@
+"""
+Bounded SKILL.md front matter reader shared by generate-catalog.py and the skill linters.
+
+Reads only up to the closing `---` delimiter, from a file (line by line), an mmap or bytes, and
+never decodes or splits the body, so a 3MB skill costs the same as a 3KB one.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Union
+
+Buffer = Union[bytes, mmap.mmap]
+
+KEY_VALUE_RE = re.compile(r"^([A-Za-z0-9_-]+):(.*)$")
+BOM = b"\xef\xbb\xbf"
+
+
+class FrontMatterError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class FrontMatter:
+    """
+    YAML lines between the delimiters. lines[0] is 1-based line `start_lineno` (always 2);
+    `end_lineno` is the closing `---` line and `body_offset` the byte offset right after it.
+    """
+
+    lines: list[str]
+    start_lineno: int
+    end_lineno: int
+    body_offset: int
+
+
+@dataclass(frozen=True)
+class FieldSpan:
+    """
+    One top-level key: raw value text (block scalar lines included, unparsed) and the 1-based
+    lines it spans.
+    """
+
+    key: str
+    value: str
+    lineno: int
+    end_lineno: int
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+
+def _iter_buffer_lines(buf: Buffer, offset: int = 0) -> Iterator[tuple[bytes, int]]:
+    """
+    (line without the trailing newline, offset of the next line), lazily.
+    """
+    size = len(buf)
+    while offset < size:
+        end = buf.find(b"\n", offset)
+        nxt = size if end < 0 else end + 1
+        yield bytes(buf[offset : nxt if end < 0 else end]), nxt
+        offset = nxt
+
+
+def _collect(lines: Iterator[tuple[bytes, int]]) -> FrontMatter:
+    first = next(lines, None)
+    if first is None:
+        raise FrontMatterError("empty file")
+    if first[0].removeprefix(BOM).strip() != b"---":
+        raise FrontMatterError("missing opening '---' YAML front matter delimiter")
+    out: list[str] = []
+    for lineno, (raw, next_offset) in enumerate(lines, start=2):
+        if raw.strip() == b"---":
+            return FrontMatter(lines=out, start_lineno=2, end_lineno=lineno, body_offset=next_offset)
+        out.append(_decode(raw))
+    raise FrontMatterError("missing closing '---' YAML front matter delimiter")
+
+
+def parse_bytes(buf: Buffer) -> FrontMatter:
+    """
+    Front matter of SKILL.md content already in memory (bytes or an mmap); raises FrontMatterError.
+    """
+    return _collect(_iter_buffer_lines(buf))
+
+
+def read(path: Path) -> FrontMatter:
+    """
+    Front matter of a SKILL.md file, reading line by line and stopping at the closing `---`.
+    """
+    with open(path, "rb") as fh:
+
+        def lines() -> Iterator[tuple[bytes, int]]:
+            offset = 0
+            for raw in fh:
+                offset += len(raw)
+                yield raw.rstrip(b"\n"), offset
+
+        return _collect(lines())
+
+
+def first_heading(buf: Buffer, offset: int) -> str | None:
+    """
+    Text of the first `# ` heading at or after offset, scanning only up to it.
+    """
+    for raw, _ in _iter_buffer_lines(buf, offset):
+        line = _decode(raw).strip()
+        if line.startswith("# "):
+            return line[2:]
+    return None
+
+
+def field_spans(fm: FrontMatter) -> list[FieldSpan]:
+    """
+    Top-level `key: value` entries with their line spans. Indented and blank lines after a key
+    belong to it (block scalars); comments and lines that are not `key: value` are skipped.
+    """
+    spans: list[FieldSpan] = []
+    i = 0
+    while i < len(fm.lines):
+        line = fm.lines[i]
+        m = KEY_VALUE_RE.match(line)
+        if not m or line.lstrip().startswith("#"):
+            i += 1
+            continue
+        start = i
+        i += 1
+        while i < len(fm.lines) and (fm.lines[i].strip() == "" or fm.lines[i].startswith((" ", "\t"))):
+            i += 1
+        end = i
+        while end - 1 > start and fm.lines[end - 1].strip() == "":
+            end -= 1
+        value = "\n".join([m.group(2).strip(), *fm.lines[start + 1 : end]]).strip("\n")
+        spans.append(
+            FieldSpan(
+                key=m.group(1),
+                value=value,
+                lineno=fm.start_lineno + start,
+                end_lineno=fm.start_lineno + end - 1,
+            )
+        )
+    return spans
+
+
+def map_file(path: Path) -> Buffer:
+    """
+    Read-only mmap of a file (empty bytes for an empty file, which cannot be mapped).
+    """
+    with open(path, "rb") as fh:
+        try:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return b""
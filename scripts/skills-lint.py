@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import skill_frontmatter
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Below this many files a process pool costs more than it saves.
+MIN_FILES_PER_WORKER = 32
+MAX_ISSUES_SHOWN = 20
+
+Issue = tuple[int, str]
+
+
+def _load_script(name: str) -> ModuleType:
+    """
+    Import a sibling script (hyphenated file name) as a module, once per process.
+    """
+    mod_name = "_skills_lint_" + name.replace("-", "_")
+    mod = sys.modules.get(mod_name)
+    if mod is not None:
+        return mod
+    spec = importlib.util.spec_from_file_location(mod_name, SCRIPTS_DIR / f"{name}.py")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load scripts/{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[mod_name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@dataclass
+class SkillFile:
+    """
+    One enumerated file, read once; every rule sees the same bytes.
+    """
+
+    rel: str
+    skill_dir: str
+    data: bytes | None
+
+    @property
+    def is_skill_md(self) -> bool:
+        return self.rel.endswith("/SKILL.md") and self.rel.count("/") == 2
+
+
+@dataclass(frozen=True)
+class FileRule:
+    """
+    A per-file rule: `applies` selects files, `check` returns issues. `scripts` are sibling
+    scripts the rule imports (loaded before timing starts).
+    """
+
+    name: str
+    description: str
+    applies: Callable[[SkillFile], bool]
+    check: Callable[[SkillFile], list[Issue]]
+    scripts: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class RepoRule:
+    """
+    A whole-repo rule, run once in the main process: {repo-relative path: issues}.
+    """
+
+    name: str
+    description: str
+    check: Callable[[Path], dict[str, list[Issue]]]
+
+
+def _is_vi_skill(f: SkillFile) -> bool:
+    return Path(f.skill_dir).name.startswith("vi-")
+
+
+def _check_frontmatter(f: SkillFile) -> list[Issue]:
+    if f.data is None:
+        return [(1, "missing SKILL.md")]
+    issues, _, _ = _load_script("check-skills-frontmatter").validate_front_matter(f.data)
+    return issues
+
+
+def _check_name_matches(f: SkillFile) -> list[Issue]:
+    if f.data is None:
+        return []
+    mod = _load_script("check-skills-frontmatter")
+    try:
+        front = skill_frontmatter.parse_bytes(f.data)
+    except skill_frontmatter.FrontMatterError:
+        return []  # reported by the frontmatter rule
+    _, fields, _ = mod.validate_parsed(front)
+    return mod.check_name_matches(fields, mod.name_lineno(front), Path(f.skill_dir).name)
+
+
+def _check_cyrillic(f: SkillFile) -> list[Issue]:
+    if f.data is None:
+        return []
+    return _load_script("check-skills-english").scan_bytes(f.data)
+
+
+def _is_english_scope(f: SkillFile) -> bool:
+    parts = f.rel.split("/")
+    return _is_vi_skill(f) and (f.is_skill_md or (len(parts) > 3 and parts[2] == "references"))
+
+
+def _check_catalog(repo_root: Path) -> dict[str, list[Issue]]:
+    gen = _load_script("generate-catalog")
+    stale = gen.check_catalog(repo_root, use_fts=False)  # the FTS index is refreshed at release time
+    return {rel: [(1, "out of date; run: python3 scripts/generate-catalog.py")] for rel in stale}
+
+
+FILE_RULES: dict[str, FileRule] = {
+    rule.name: rule
+    for rule in (
+        FileRule(
+            "frontmatter",
+            "SKILL.md YAML front matter is valid (repo subset, quoting, required keys)",
+            lambda f: f.is_skill_md and _is_vi_skill(f),
+            _check_frontmatter,
+            ("check-skills-frontmatter",),
+        ),
+        FileRule(
+            "name-dir",
+            "front matter name matches the skill directory",
+            lambda f: f.is_skill_md and _is_vi_skill(f),
+            _check_name_matches,
+            ("check-skills-frontmatter",),
+        ),
+        FileRule(
+            "english",
+            "no Cyrillic text in SKILL.md or references/*.md",
+            _is_english_scope,
+            _check_cyrillic,
+            ("check-skills-english",),
+        ),
+    )
+}
+
+REPO_RULES: dict[str, RepoRule] = {
+    rule.name: rule
+    for rule in (RepoRule("catalog", "catalog/*.json outputs match generate-catalog.py", _check_catalog),)
+}
+
+
+def enumerate_files(skills_dir: Path) -> list[str]:
+    """
+    Every file any rule may look at, as repo-relative paths: each skill's SKILL.md (listed even
+    when missing) plus its *.md docs, skipping dot entries.
+    """
+    repo_root = skills_dir.parent
+    out: list[str] = []
+    for entry in sorted(os.scandir(skills_dir), key=lambda e: e.name):
+        if entry.name.startswith(".") or not entry.is_dir():
+            continue
+        skill_md = f"{skills_dir.relative_to(repo_root).as_posix()}/{entry.name}/SKILL.md"
+        out.append(skill_md)
+        for dirpath, dirnames, filenames in os.walk(entry.path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            rel_dir = Path(dirpath).relative_to(repo_root).as_posix()
+            for name in sorted(filenames):
+                rel = f"{rel_dir}/{name}"
+                if name.endswith(".md") and not name.startswith(".") and rel != skill_md:
+                    out.append(rel)
+    return out
+
+
+def lint_files(
+    repo_root: str,
+    rels: list[str],
+    rule_names: list[str],
+) -> tuple[dict[str, list[list]], dict[str, float]]:
+    """
+    Worker: read each file once and run the selected file rules over it.
+
+    Returns ({path: [[rule, line, message], ...]}, {rule: seconds}).
+    """
+    rules = [FILE_RULES[name] for name in rule_names]
+    for rule in rules:
+        for script in rule.scripts:
+            _load_script(script)
+    issues: dict[str, list[list]] = {}
+    timings = {name: 0.0 for name in rule_names}
+    for rel in rels:
+        skill_dir = "/".join(rel.split("/")[:2])
+        try:
+            data: bytes | None = (Path(repo_root) / rel).read_bytes()
+        except FileNotFoundError:
+            data = None
+        f = SkillFile(rel=rel, skill_dir=skill_dir, data=data)
+        for rule in rules:
+            if not rule.applies(f):
+                continue
+            started = time.perf_counter()
+            found = rule.check(f)
+            timings[rule.name] += time.perf_counter() - started
+            for lineno, msg in found:
+                issues.setdefault(rel, []).append([rule.name, lineno, msg])
+    return issues, timings
+
+
+def _chunks(items: list[str], n: int) -> list[list[str]]:
+    return [items[i::n] for i in range(n) if items[i::n]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Lint skills in one pass: every file is read once and fed to all file rules."
+    )
+    parser.add_argument(
+        "--skills-dir",
+        default=str(REPO_ROOT / "skills"),
+        help="Path to the skills directory (default: repo_root/skills).",
+    )
+    parser.add_argument(
+        "--rules",
+        help=f"Comma-separated rules to run (default: all of {', '.join([*FILE_RULES, *REPO_RULES])}).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for file rules (default: CPU count; 1 = in-process).",
+    )
+    parser.add_argument("--list-rules", action="store_true", help="List available rules and exit.")
+    args = parser.parse_args()
+
+    if args.list_rules:
+        for rule in [*FILE_RULES.values(), *REPO_RULES.values()]:
+            print(f"{rule.name:12} {rule.description}")
+        return 0
+
+    selected = [r.strip() for r in (args.rules or "").split(",") if r.strip()] or [*FILE_RULES, *REPO_RULES]
+    unknown = [r for r in selected if r not in FILE_RULES and r not in REPO_RULES]
+    if unknown:
+        print(f"[ERROR] unknown rule(s): {', '.join(unknown)} (see --list-rules)", file=sys.stderr)
+        return 2
+
+    skills_dir = Path(args.skills_dir).expanduser().resolve()
+    if not skills_dir.is_dir():
+        print(f"[ERROR] skills dir not found: {skills_dir}", file=sys.stderr)
+        return 2
+    repo_root = skills_dir.parent
+
+    started = time.perf_counter()
+    file_rules = [name for name in selected if name in FILE_RULES]
+    rels = enumerate_files(skills_dir) if file_rules else []
+    issues: dict[str, list[list]] = {}
+    timings: dict[str, float] = {name: 0.0 for name in selected}
+
+    jobs = max(1, min(args.jobs, len(rels) // MIN_FILES_PER_WORKER))
+    if jobs == 1:
+        results = [lint_files(str(repo_root), rels, file_rules)] if rels else []
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(lint_files, str(repo_root), chunk, file_rules) for chunk in _chunks(rels, jobs)]
+            results = [fut.result() for fut in futures]
+    for found, spent in results:
+        for rel, rows in found.items():
+            issues.setdefault(rel, []).extend(rows)
+        for name, seconds in spent.items():
+            timings[name] += seconds
+
+    for name in selected:
+        rule = REPO_RULES.get(name)
+        if rule is None:
+            continue
+        rule_started = time.perf_counter()
+        for rel, found_rows in rule.check(repo_root).items():
+            issues.setdefault(rel, []).extend([name, lineno, msg] for lineno, msg in found_rows)
+        timings[name] += time.perf_counter() - rule_started
+
+    counts = {name: 0 for name in selected}
+    for rel in sorted(issues):
+        rows = sorted(issues[rel], key=lambda row: (row[1], row[0]))
+        print(f"[FAIL] {rel}", file=sys.stderr)
+        for rule_name, lineno, msg in rows[:MAX_ISSUES_SHOWN]:
+            print(f"  L{lineno}: [{rule_name}] {msg}", file=sys.stderr)
+        if len(rows) > MAX_ISSUES_SHOWN:
+            print(f"  ... and {len(rows) - MAX_ISSUES_SHOWN} more issue(s)", file=sys.stderr)
+        for rule_name, _, _ in rows:
+            counts[rule_name] += 1
+
+    elapsed = time.perf_counter() - started
+    print(f"[STATS] {len(rels)} file(s), {jobs} worker(s), {elapsed * 1000:.0f}ms wall")
+    for name in selected:
+        print(f"[STATS]   {name:12} {counts[name]:5} issue(s) {timings[name] * 1000:8.1f}ms")
+    total = sum(counts.values())
+    if total:
+        print(f"[FAIL] {total} issue(s) in {len(issues)} file(s).", file=sys.stderr)
+        return 1
+    print("[OK] Skills lint passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
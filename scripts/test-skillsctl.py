@@ -1,11 +1,28 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import contextlib
+import hashlib
+import json
+import os
 import shutil
+import socket
 import subprocess
+import sys
 import tempfile
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
+
+
+# Files left out of the snapshot skills repo (and of its cache key).
+SNAPSHOT_IGNORE = (".git", ".beads", ".cache", "dist", "__pycache__", ".DS_Store")
+# Snapshot bundles kept in the cache dir; older ones are pruned.
+SNAPSHOT_KEEP = 3
 
 
 def run(
@@ -56,81 +73,852 @@ def assert_not_exists(path: Path) -> None:
         raise AssertionError(f"Expected path to not exist: {path}")
 
 
-def main() -> int:
-    repo_root = Path(__file__).resolve().parent.parent
-    skillsctl = repo_root / "skills" / "vi-project-bootstrap" / "scripts" / "skillsctl.py"
-    assert_exists(skillsctl)
+def _snapshot_files(repo_root: Path) -> list[Path]:
+    out: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(repo_root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SNAPSHOT_IGNORE)
+        out.extend(Path(dirpath) / f for f in sorted(filenames) if f not in SNAPSHOT_IGNORE)
+    return out
 
-    with tempfile.TemporaryDirectory(prefix="skillsctl-test-") as td:
-        tmp = Path(td)
 
-        # Create a snapshot skills repo from the current working tree (including uncommitted changes).
-        skills_src = tmp / "skills-src"
-        shutil.copytree(
-            repo_root,
-            skills_src,
-            ignore=shutil.ignore_patterns(".git", ".beads", "dist", "__pycache__", ".DS_Store"),
+def source_tree_hash(repo_root: Path) -> str:
+    """
+    Content hash of the working tree as the snapshot would see it (including uncommitted changes).
+    """
+    h = hashlib.sha256()
+    for path in _snapshot_files(repo_root):
+        h.update(path.relative_to(repo_root).as_posix().encode("utf-8") + b"\0")
+        h.update(b"x" if os.access(path, os.X_OK) else b"-")
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()[:20]
+
+
+def _snapshot_cache_dir() -> Path:
+    override = os.environ.get("SKILLSCTL_TEST_CACHE", "").strip()
+    if override:
+        return Path(override).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME", "").strip()
+    return (Path(xdg).expanduser() if xdg else Path.home() / ".cache") / "skillsctl-tests"
+
+
+def snapshot_bundle(repo_root: Path, tmp: Path) -> tuple[Path, bool]:
+    """
+    Return a git bundle of the working tree, built once per source tree hash. (path, cache_hit)
+    """
+    cache_dir = _snapshot_cache_dir()
+    bundle = cache_dir / f"snapshot-{source_tree_hash(repo_root)}.bundle"
+    if bundle.exists():
+        return bundle, True
+
+    work = tmp / "snapshot-build"
+    shutil.copytree(repo_root, work, ignore=shutil.ignore_patterns(*SNAPSHOT_IGNORE))
+    git(["init", "-b", "main"], cwd=work)
+    git_commit_all(work, "snapshot")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    partial = bundle.with_name(f"{bundle.name}.{os.getpid()}.tmp")
+    git(["bundle", "create", str(partial), "main"], cwd=work)
+    os.replace(partial, bundle)
+    shutil.rmtree(work, ignore_errors=True)
+
+    stale = sorted(cache_dir.glob("snapshot-*.bundle"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in stale[SNAPSHOT_KEEP:]:
+        old.unlink(missing_ok=True)
+    return bundle, False
+
+
+@dataclass
+class Scenario:
+    """
+    One independent scenario: its own temp dir, project repos, caches and daemon socket dir.
+    """
+
+    skillsctl: Path
+    skills_src: Path
+    tmp: Path
+    template: Path | None = None
+
+    @property
+    def env(self) -> dict[str, str]:
+        return dict(
+            os.environ,
+            SKILLSCTL_CACHE_DIR=str(self.tmp / "cache"),
+            XDG_RUNTIME_DIR=str(self.tmp / "run"),
         )
-        git(["init", "-b", "main"], cwd=skills_src)
-        git_commit_all(skills_src, "snapshot")
 
-        # Create a project repo.
-        project = tmp / "project"
-        project.mkdir(parents=True, exist_ok=True)
+    def ctl(
+        self,
+        argv: list[str],
+        *,
+        cwd: Path,
+        check: bool = True,
+        env: dict[str, str] | None = None,
+    ) -> subprocess.CompletedProcess[str]:
+        return run(["python3", str(self.skillsctl), *argv], cwd=cwd, check=check, env=env or self.env)
+
+    def project(self, name: str = "project", *, bootstrap: bool = True) -> Path:
+        project = self.tmp / name
+        if bootstrap and self.template is not None:
+            # Submodule gitdir links are relative, so a copied project is self-contained.
+            shutil.copytree(self.template, project, symlinks=True)
+            return project
+        project.mkdir(parents=True)
         git(["init", "-b", "main"], cwd=project)
         (project / "README.md").write_text("test\n", encoding="utf-8")
         git_commit_all(project, "init")
+        if bootstrap:
+            self.ctl(
+                ["bootstrap", "--repo-url", str(self.skills_src), "--branch", "main", "--stage", "--yes"],
+                cwd=project,
+            )
+            git_commit_all(project, "bootstrap")
+        return project
 
-        report = json.loads(run(["python3", str(skillsctl), "doctor"], cwd=project, check=True).stdout)
-        if report.get("git_repo") is not True:
-            raise AssertionError(f"expected git_repo=true in doctor report, got: {report.get('git_repo')!r}")
-
-        # Bootstrap.
-        run(
-            [
-                "python3",
-                str(skillsctl),
-                "bootstrap",
-                "--repo-url",
-                str(skills_src),
-                "--branch",
-                "main",
-                "--stage",
-                "--yes",
-            ],
-            cwd=project,
-            check=True,
-        )
-        staged = git(["diff", "--cached", "--name-only"], cwd=project).stdout.splitlines()
-        expected = {".gitmodules", ".codex/skills", ".codex/skills.config.json", ".codex/skills.manifest"}
-        if not expected.issubset(set(staged)):
-            raise AssertionError(f"bootstrap staged unexpected set.\nexpected superset: {expected}\nactual: {set(staged)}")
-        git_commit_all(project, "bootstrap")
-
-        # Install.
-        run(
-            ["python3", str(skillsctl), "install", "vi-security-guidance", "--stage", "--yes"],
-            cwd=project,
-            check=True,
-        )
-        assert_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
-        git_commit_all(project, "install security-guidance")
 
-        # Remove.
-        run(["python3", str(skillsctl), "remove", "vi-security-guidance", "--stage", "--yes"], cwd=project, check=True)
-        assert_not_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
-        git_commit_all(project, "remove security-guidance")
+def scenario_bootstrap(s: Scenario) -> None:
+    project = s.project(bootstrap=False)
+    report = json.loads(s.ctl(["doctor"], cwd=project).stdout)
+    if report.get("git_repo") is not True:
+        raise AssertionError(f"expected git_repo=true in doctor report, got: {report.get('git_repo')!r}")
+
+    s.ctl(
+        ["bootstrap", "--repo-url", str(s.skills_src), "--branch", "main", "--stage", "--yes"],
+        cwd=project,
+    )
+    staged = git(["diff", "--cached", "--name-only"], cwd=project).stdout.splitlines()
+    expected = {".gitmodules", ".codex/skills", ".codex/skills.config.json", ".codex/skills.manifest"}
+    if not expected.issubset(set(staged)):
+        raise AssertionError(f"bootstrap staged unexpected set.\nexpected superset: {expected}\nactual: {set(staged)}")
+    git_commit_all(project, "bootstrap")
+
+    # Idempotent bootstrap.
+    s.ctl(["bootstrap", "--yes"], cwd=project)
+    if git(["status", "--porcelain"], cwd=project).stdout.strip():
+        raise AssertionError("repeat bootstrap changed the project")
+
+
+def scenario_install_remove(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    assert_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+    git_commit_all(project, "install security-guidance")
+
+    # Index-backed suggest must rank exactly like the linear scan it replaces.
+    for query in ("security", "rust cli", "vi-code", "beads", "e"):
+        base = ["suggest", query, "--limit", "50", "--toon"]
+        indexed = s.ctl(base, cwd=project).stdout
+        linear = s.ctl(base + ["--no-index"], cwd=project).stdout
+        if indexed != linear:
+            raise AssertionError(f"suggest index mismatch for {query!r}:\n{indexed}\n{linear}")
+    # Index hits are decoded through the offsets sidecar; without it they come from the full catalog.
+    offsets = project / ".codex" / "skills" / "catalog" / "skills.offsets.json"
+    saved = offsets.read_bytes()
+    offsets.unlink()
+    try:
+        base = ["suggest", "rust cli", "--toon"]
+        if s.ctl(base, cwd=project).stdout != s.ctl(base + ["--no-index"], cwd=project).stdout:
+            raise AssertionError("suggest without the offsets sidecar differs from the linear scan")
+    finally:
+        offsets.write_bytes(saved)
+
+    # Deep suggest finds skills by text that only appears in their reference docs.
+    deep = json.loads(s.ctl(["suggest", "--deep", "revset operators", "--toon"], cwd=project).stdout)
+    if not deep or deep[0].get("id") != "vi-jj-docs" or not deep[0].get("snippet"):
+        raise AssertionError(f"unexpected deep suggest results: {deep!r}")
+    # The index stays out of the checkout; searches read it from a per-blob copy in the cache dir.
+    assert_not_exists(project / ".codex" / "skills" / "fts")
+    if len(list((s.tmp / "cache" / "fts").glob("*.sqlite"))) != 1:
+        raise AssertionError("expected one cached copy of the FTS index")
+
+    # In-process git reads must agree with git itself.
+    status = json.loads(s.ctl(["status", "--toon"], cwd=project).stdout)
+    listed = git(["sparse-checkout", "list"], cwd=project / ".codex" / "skills").stdout.split()
+    if status.get("sparse_paths") != listed:
+        raise AssertionError(f"sparse_paths mismatch: {status.get('sparse_paths')!r} != {listed!r}")
+    if status.get("repo_url") != str(s.skills_src):
+        raise AssertionError(f"unexpected repo_url in status: {status.get('repo_url')!r}")
+    s.ctl(["doctor"], cwd=project)
+    doctor = s.ctl(["--fork-stats", "doctor"], cwd=project)
+    forks = json.loads(doctor.stderr.split(" ", 2)[2])
+    if any(label.startswith(("git config", "git sparse-checkout", "git rev-parse", "git --version")) for label in forks):
+        raise AssertionError(f"doctor forked git for reads that should be in-process or cached: {forks!r}")
+    doctor = s.ctl(["--fork-stats", "doctor", "--no-cache"], cwd=project)
+    if "git --version" not in json.loads(doctor.stderr.split(" ", 2)[2]):
+        raise AssertionError("doctor --no-cache did not re-probe git")
+
+    # Remove.
+    s.ctl(["remove", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    assert_not_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+    git_commit_all(project, "remove security-guidance")
+
+
+def scenario_catalog_query(s: Scenario) -> None:
+    project = s.project()
+    full = json.loads(s.ctl(["catalog", "--toon"], cwd=project).stdout)
+
+    # Filters and paging over the offsets sidecar match the fully parsed catalog.
+    queries = (
+        ["--tag", "beads"],
+        ["--prefix", "vi-code", "--fields", "id,title"],
+        ["--tag", "vi", "--tag", "code", "--limit", "2", "--offset", "1"],
+        ["--offset", "1000"],
+    )
+    for query in queries:
+        indexed = s.ctl(["catalog", *query, "--toon"], cwd=project).stdout
+        linear = s.ctl(["catalog", *query, "--toon", "--no-index"], cwd=project).stdout
+        if indexed != linear:
+            raise AssertionError(f"catalog query mismatch for {query!r}:\n{indexed}\n{linear}")
+
+    prefixed = [item["id"] for item in full if item["id"].startswith("vi-code")]
+    page = json.loads(s.ctl(["catalog", "--prefix", "vi-code", "--limit", "2", "--fields", "id", "--toon"], cwd=project).stdout)
+    if page != [{"id": i} for i in prefixed[:2]]:
+        raise AssertionError(f"unexpected catalog page: {page!r}")
+    lines = s.ctl(["catalog", "--ndjson", "--fields", "id"], cwd=project).stdout.splitlines()
+    if [json.loads(line)["id"] for line in lines] != [item["id"] for item in full]:
+        raise AssertionError("catalog --ndjson must stream every entry in catalog order")
+
+
+def scenario_requires(s: Scenario) -> None:
+    # Installing a skill checks out its `requires` closure; the manifest keeps only the pick.
+    project = s.project()
+    skills = project / ".codex" / "skills" / "skills"
+    res = s.ctl(["install", "vi-feature-dev", "--yes"], cwd=project)
+    for dep in ("vi-feature-dev", "vi-code-architect", "vi-code-explorer", "vi-code-reviewer"):
+        assert_exists(skills / dep / "SKILL.md")
+    if "vi-code-explorer" not in res.stdout:
+        raise AssertionError(f"expected install to report required skills:\n{res.stdout}")
+    manifest = (project / ".codex" / "skills.manifest").read_text(encoding="utf-8")
+    if "vi-code-explorer" in manifest:
+        raise AssertionError("required skills must not be written to the manifest")
+    lock = json.loads((project / ".codex" / "skills.lock").read_text(encoding="utf-8"))
+    if "vi-code-reviewer" not in lock["skills"]:
+        raise AssertionError(f"expected required skills in the lock: {sorted(lock['skills'])}")
+    if json.loads(s.ctl(["verify", "--toon"], cwd=project).stdout).get("ok") is not True:
+        raise AssertionError("verify failed after installing a skill with requires")
+
+    # Removing an explicitly selected dependency warns and keeps it checked out.
+    s.ctl(["install", "vi-code-explorer", "--yes"], cwd=project)
+    res = s.ctl(["remove", "vi-code-explorer", "--yes"], cwd=project)
+    if "still required by vi-feature-dev" not in res.stderr:
+        raise AssertionError(f"expected a dependents warning on remove:\n{res.stderr}")
+    assert_exists(skills / "vi-code-explorer" / "SKILL.md")
+
+    s.ctl(["remove", "vi-feature-dev", "--yes"], cwd=project)
+    for dep in ("vi-feature-dev", "vi-code-explorer"):
+        assert_not_exists(skills / dep)
+
+
+def scenario_export_claude(s: Scenario) -> None:
+    project = s.project()
+    claude = project / ".claude" / "skills"
+    (claude / "mine").mkdir(parents=True)
+    (claude / "mine" / "SKILL.md").write_text("---\nname: mine\ndescription: hand-written\n---\n", encoding="utf-8")
+
+    s.ctl(["install", "vi-beads", "--claude", "--stage", "--yes"], cwd=project)
+    wrapper = claude / "vi-beads" / "SKILL.md"
+    assert_exists(wrapper)
+    text = wrapper.read_text(encoding="utf-8")
+    if "name: vi-beads" not in text or ".codex/skills/skills/vi-beads/SKILL.md" not in text:
+        raise AssertionError(f"unexpected wrapper:\n{text}")
+    staged = git(["diff", "--cached", "--name-only"], cwd=project).stdout.splitlines()
+    if ".claude/skills/vi-beads/SKILL.md" not in staged:
+        raise AssertionError(f"expected the wrapper to be staged: {staged}")
+
+    # Unchanged inputs: nothing is rewritten.
+    before = wrapper.stat().st_mtime_ns
+    result = json.loads(s.ctl(["export-claude", "--toon"], cwd=project).stdout)
+    if result["written"] or "vi-beads" not in result["unchanged"] or wrapper.stat().st_mtime_ns != before:
+        raise AssertionError(f"expected no rewrite on a repeat export: {result!r}")
+
+    # A frontmatter change in the canonical SKILL.md is an input change.
+    canonical = project / ".codex" / "skills" / "skills" / "vi-beads" / "SKILL.md"
+    bumped = canonical.read_text(encoding="utf-8").replace("---\n", "---\nversion: 2\n", 1)
+    canonical.write_text(bumped, encoding="utf-8")
+    result = json.loads(s.ctl(["export-claude", "--toon"], cwd=project).stdout)
+    if result["written"] != ["vi-beads"]:
+        raise AssertionError(f"expected the wrapper to be rewritten after a frontmatter change: {result!r}")
+    git(["checkout", "--", "."], cwd=project / ".codex" / "skills")
+
+    s.ctl(["remove", "vi-beads", "--claude", "--yes"], cwd=project)
+    assert_not_exists(claude / "vi-beads")
+    assert_exists(claude / "mine" / "SKILL.md")
+
+
+def scenario_idempotent_sync(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    git_commit_all(project, "install security-guidance")
+    s.ctl(["bootstrap", "--yes"], cwd=project)
+    s.ctl(["sync", "--yes"], cwd=project)
+
+    # A repeat sync with an unchanged selection fingerprint must not fork git.
+    res = s.ctl(["--fork-stats", "sync", "--yes"], cwd=project)
+    if "Already up to date" not in res.stdout or not res.stderr.startswith("[STATS] forks=0 "):
+        raise AssertionError(f"expected no-op sync fast path, got:\n{res.stdout}{res.stderr}")
+    assert_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+
+    # The committed lock alone (no local record of the last apply) is enough for the fast path.
+    lock = json.loads((project / ".codex" / "skills.lock").read_text(encoding="utf-8"))
+    if sorted(lock["skills"]) != ["vi-security-guidance"] or lock["commit"] != git(
+        ["rev-parse", "HEAD"], cwd=project / ".codex" / "skills"
+    ).stdout.strip():
+        raise AssertionError(f"unexpected lock: {lock!r}")
+    (project / ".git" / "modules" / ".codex" / "skills" / "skillsctl-applied.json").unlink()
+    res = s.ctl(["--fork-stats", "sync", "--yes"], cwd=project)
+    if "Already up to date" not in res.stdout or not res.stderr.startswith("[STATS] forks=0 "):
+        raise AssertionError(f"expected the lock to allow the no-op fast path, got:\n{res.stdout}{res.stderr}")
+
+    # verify hashes the materialized files against the locked tree OIDs.
+    s.ctl(["verify"], cwd=project)
+    skill_md = project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md"
+    # A CRLF checkout (core.autocrlf) is hashed as `git add` would store it, not byte for byte.
+    saved = skill_md.read_bytes()
+    git(["config", "core.autocrlf", "true"], cwd=project / ".codex" / "skills")
+    skill_md.write_bytes(saved.replace(b"\n", b"\r\n"))
+    res = s.ctl(["verify", "--toon"], cwd=project, check=False)
+    if res.returncode != 0:
+        raise AssertionError(f"verify flagged a CRLF checkout under core.autocrlf: {res.stdout}")
+    git(["config", "--unset", "core.autocrlf"], cwd=project / ".codex" / "skills")
+    skill_md.write_bytes(saved)
+    skill_md.write_text(skill_md.read_text(encoding="utf-8") + "\ntampered\n", encoding="utf-8")
+    res = s.ctl(["verify", "--toon"], cwd=project, check=False)
+    report = json.loads(res.stdout)
+    bad = [r for r in report["skills"] if not r["ok"]]
+    if res.returncode != 1 or [(r["id"], r["modified"]) for r in bad] != [("vi-security-guidance", ["SKILL.md"])]:
+        raise AssertionError(f"verify did not flag the modified file ({res.returncode}): {report!r}")
+
+
+def scenario_fast_status(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--yes"], cwd=project)
+    skills_dir = project / ".codex" / "skills"
+
+    # Bootstrap turns on the sparse index and untracked cache: the index holds unselected dirs
+    # as single sparse-directory entries.
+    status = json.loads(s.ctl(["status", "--toon"], cwd=project).stdout)
+    tuning = status.get("index_tuning") or {}
+    if not (tuning.get("sparse_index") and tuning.get("untracked_cache")):
+        raise AssertionError(f"expected a tuned submodule index: {tuning!r}")
+    if not any(line.endswith("/") for line in git(["ls-files", "--sparse"], cwd=skills_dir).stdout.splitlines()):
+        raise AssertionError("expected sparse-directory entries in the .codex/skills index")
+
+    # --fast reads only files on disk: no forks, dirty state unknown.
+    res = s.ctl(["--fork-stats", "status", "--fast", "--toon"], cwd=project)
+    fast = json.loads(res.stdout)
+    if not res.stderr.startswith("[STATS] forks=0 ") or fast.get("submodule_dirty") is not None:
+        raise AssertionError(f"unexpected status --fast result: {fast!r} {res.stderr!r}")
+    if {k: v for k, v in fast.items() if k != "submodule_dirty"} != {
+        k: v for k, v in status.items() if k != "submodule_dirty"
+    }:
+        raise AssertionError(f"status --fast disagrees with status:\n{fast!r}\n{status!r}")
+
+    # Git before 2.32 rejects --sparse-index: bootstrap still works, with a full index.
+    old_bin = s.tmp / "old-git-bin"
+    old_bin.mkdir()
+    shim = old_bin / "git"
+    shim.write_text(
+        "#!/bin/sh\n"
+        'for a in "$@"; do [ "$a" = --sparse-index ] && { echo "error: unknown option" >&2; exit 129; }; done\n'
+        f'exec {shutil.which("git")} "$@"\n',
+        encoding="utf-8",
+    )
+    shim.chmod(0o755)
+    old = s.project("old-git", bootstrap=False)
+    env = dict(s.env, PATH=f"{old_bin}{os.pathsep}{os.environ['PATH']}")
+    s.ctl(["bootstrap", "--repo-url", str(s.skills_src), "--branch", "main", "--yes"], cwd=old, env=env)
+    assert_exists(old / ".codex" / "skills" / "catalog" / "skills.json")
+
+
+def scenario_recover(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    git_commit_all(project, "install security-guidance")
+
+    # Recover after removing submodule working dir.
+    shutil.rmtree(project / ".codex" / "skills")
+    trace_file = s.tmp / "sync.trace.json"
+    res = s.ctl(["--trace", str(trace_file), "sync", "--yes"], cwd=project)
+    if "[TRACE]" not in res.stderr:
+        raise AssertionError(f"missing trace summary on stderr: {res.stderr!r}")
+    events = [e for e in json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"] if e["ph"] == "X"]
+    spans = [e for e in events if e["cat"] == "subprocess"]
+    if not any(e["name"] == "sync" and e["cat"] == "phase" for e in events) or not spans:
+        raise AssertionError(f"unexpected trace events: {events!r}")
+    for span in spans:
+        if span["args"]["phase"] is None or span["args"]["exit_code"] is None or "stdout_bytes" not in span["args"]:
+            raise AssertionError(f"incomplete subprocess span: {span!r}")
+    assert_exists(project / ".codex" / "skills" / "catalog" / "skills.json")
+    assert_exists(project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+
+
+def scenario_dirty_refusal(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    git_commit_all(project, "install security-guidance")
+
+    manifest = project / ".codex" / "skills.manifest"
+    before = manifest.read_text(encoding="utf-8")
+    skill_md = project / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md"
+    skill_md.write_text(skill_md.read_text(encoding="utf-8") + "\nlocal edit\n", encoding="utf-8")
+    res = s.ctl(["install", "vi-beads", "--yes"], cwd=project, check=False)
+    if res.returncode == 0 or ".codex/skills is dirty" not in res.stderr:
+        raise AssertionError(f"expected refusal on a dirty submodule, got ({res.returncode}):\n{res.stderr}")
+    if manifest.read_text(encoding="utf-8") != before:
+        raise AssertionError("refused install must not touch the manifest")
+    assert_not_exists(project / ".codex" / "skills" / "skills" / "vi-beads")
+
+
+def scenario_plan_apply(s: Scenario) -> None:
+    project = s.project()
+    skills_dir = project / ".codex" / "skills"
+    plan_file = s.tmp / "plan.json"
+    s.ctl(["plan", "vi-jj-docs", "--out", str(plan_file)], cwd=project)
+    plan = json.loads(plan_file.read_text(encoding="utf-8"))
+    assert_not_exists(skills_dir / "skills" / "vi-jj-docs")
+    expected = git(["ls-tree", "-r", "-l", "HEAD", "--", "skills/vi-jj-docs"], cwd=skills_dir).stdout.splitlines()
+    change = plan["changes"][0] if len(plan["changes"]) == 1 else {}
+    if change.get("id") != "vi-jj-docs" or change.get("action") != "add" or change.get("files") != len(expected):
+        raise AssertionError(f"unexpected plan changes: {plan['changes']!r}")
+    if change.get("bytes") != sum(int(line.split()[3]) for line in expected):
+        raise AssertionError(f"unexpected planned bytes: {change!r}")
+
+    # Hand-edited plans are refused with an error, not a traceback, and never widen the checkout.
+    bad_file = s.tmp / "bad-plan.json"
+    widened = dict(plan, target=dict(plan["target"], paths=plan["target"]["paths"] + ["skills/vi-prek"]))
+    for bad, message in (
+        ({k: v for k, v in plan.items() if k != "target"}, "Malformed plan"),
+        (dict(plan, totals=None), "Malformed plan"),
+        (widened, "Plan paths do not match"),
+    ):
+        bad_file.write_text(json.dumps(bad), encoding="utf-8")
+        res = s.ctl(["apply", str(bad_file)], cwd=project, check=False)
+        if res.returncode != 1 or message not in res.stderr or "Traceback" in res.stderr:
+            raise AssertionError(f"expected {message!r} for a bad plan, got ({res.returncode}): {res.stderr!r}")
+    assert_not_exists(skills_dir / "skills" / "vi-prek")
+
+    s.ctl(["apply", str(plan_file), "--stage"], cwd=project)
+    assert_exists(skills_dir / "skills" / "vi-jj-docs" / "SKILL.md")
+    status = json.loads(s.ctl(["status", "--toon"], cwd=project).stdout)
+    if status.get("manifest_ids") != ["vi-jj-docs"] or status.get("sparse_paths") != plan["target"]["paths"]:
+        raise AssertionError(f"apply left unexpected state: {status!r}")
+    res = s.ctl(["apply", str(plan_file)], cwd=project, check=False)
+    if res.returncode == 0 or "Plan is stale" not in res.stderr:
+        raise AssertionError(f"expected a stale plan to be refused, got ({res.returncode}): {res.stderr!r}")
+
+    removal = json.loads(s.ctl(["plan", "vi-jj-docs", "--remove", "--toon"], cwd=project).stdout)
+    if [(c["action"], c["id"]) for c in removal["changes"]] != [("remove", "vi-jj-docs")]:
+        raise AssertionError(f"unexpected removal plan: {removal['changes']!r}")
+
+
+def scenario_daemon(s: Scenario) -> None:
+    project = s.project()
+    # Resident daemon answers read-only commands and notices manifest changes by stat.
+    local_env = dict(s.env, SKILLSCTL_NO_DAEMON="1")
+    (s.tmp / "run").mkdir()
+    daemon = subprocess.Popen(
+        ["python3", str(s.skillsctl), "serve", "--idle-timeout", "60"],
+        cwd=str(project),
+        env=s.env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        if not daemon.stderr or not daemon.stderr.readline().startswith("[OK] Serving"):
+            raise AssertionError("skillsctl serve did not start")
+        for argv in (["status", "--toon"], ["catalog", "--toon"], ["suggest", "jj", "--toon"]):
+            served = s.ctl(argv, cwd=project).stdout
+            local = s.ctl(argv, cwd=project, env=local_env).stdout
+            if served != local:
+                raise AssertionError(f"daemon output differs for {argv}:\n{served}\n!=\n{local}")
+        manifest = project / ".codex" / "skills.manifest"
+        saved = manifest.read_text(encoding="utf-8")
+        manifest.write_text(saved + "vi-jj-docs\n", encoding="utf-8")
+        served = json.loads(s.ctl(["status", "--toon"], cwd=project).stdout)
+        manifest.write_text(saved, encoding="utf-8")
+        if "vi-jj-docs" not in served.get("manifest_ids", []):
+            raise AssertionError(f"daemon served a stale manifest: {served.get('manifest_ids')!r}")
+        # Same-size selections back to back: skillsctl renames the manifest into place, so the
+        # daemon's stat key changes even within one mtime tick.
+        for skill_id in ("vi-greptile", "vi-sops-dev"):
+            s.ctl(["set", skill_id, "--yes"], cwd=project, env=local_env)
+            served = json.loads(s.ctl(["status", "--toon"], cwd=project).stdout)
+            if served.get("manifest_ids") != [skill_id]:
+                raise AssertionError(f"daemon served a stale manifest: {served.get('manifest_ids')!r}")
+        # A command that crashes (here on a corrupt offsets sidecar) fails alone; the daemon lives on.
+        offsets = project / ".codex" / "skills" / "catalog" / "skills.offsets.json"
+        saved = offsets.read_text(encoding="utf-8")
+        data = json.loads(saved)
+        offsets.write_text(json.dumps(dict(data, spans=[0] * len(data["spans"]))), encoding="utf-8")
+        res = s.ctl(["catalog", "--toon"], cwd=project, check=False)
+        offsets.write_text(saved, encoding="utf-8")
+        if res.returncode != 1 or "TypeError" not in res.stderr:
+            raise AssertionError(f"expected the crashing request to fail with rc=1:\n{res.stderr}")
+        digest = hashlib.sha256(str(project.resolve()).encode("utf-8")).hexdigest()[:16]
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(10)
+            conn.connect(str(s.tmp / "run" / "skillsctl" / f"{digest}.sock"))
+            conn.sendall(b'{"op": "ping"}\n')
+            pong = json.loads(conn.makefile("rb").readline())
+        if pong.get("served") != 7:
+            raise AssertionError(f"unexpected ping reply after a crashing request: {pong!r}")
+        res = s.ctl(["serve", "--stop"], cwd=project)
+        if "served 7 request(s)" not in res.stdout:
+            raise AssertionError(f"unexpected daemon stop report: {res.stdout!r}")
+        daemon.wait(timeout=10)
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+        if daemon.stderr:
+            daemon.stderr.close()
+
+    # A socket dir other users can reach (e.g. pre-created in /tmp) is never trusted: clients
+    # run in-process instead of reading a spoofed reply, and serve refuses to start.
+    sock_dir = s.tmp / "run" / "skillsctl"
+    sock_dir.chmod(0o755)
+    spoof = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    spoof.bind(str(sock_dir / f"{digest}.sock"))
+    spoof.listen(1)
+    spoof.settimeout(30)
+
+    def answer() -> None:
+        with contextlib.suppress(OSError):
+            conn, _ = spoof.accept()
+            with conn:
+                conn.recv(65536)
+                conn.sendall(json.dumps({"rc": 0, "stdout": "spoofed\n", "stderr": ""}).encode("utf-8") + b"\n")
+
+    responder = threading.Thread(target=answer, daemon=True)
+    responder.start()
+    try:
+        res = s.ctl(["status", "--toon"], cwd=project)
+        if "spoofed" in res.stdout or "Ignoring skillsctl daemon socket" not in res.stderr:
+            raise AssertionError(f"client must ignore a socket in a shared dir:\n{res.stdout}{res.stderr}")
+        res = s.ctl(["serve", "--idle-timeout", "1"], cwd=project, check=False)
+        if res.returncode == 0 or "Refusing to serve" not in res.stderr:
+            raise AssertionError(f"serve must refuse a shared socket dir:\n{res.stderr}")
+    finally:
+        spoof.close()
+
+
+def scenario_fanout(s: Scenario) -> None:
+    project = s.project()
+    s.ctl(["install", "vi-security-guidance", "--stage", "--yes"], cwd=project)
+    git_commit_all(project, "install security-guidance")
+
+    # Fan-out sync over several checkouts: one NDJSON line per root, failures reported inline.
+    fanout = [s.tmp / "fanout-1", s.tmp / "fanout-2"]
+    for dest in fanout:
+        git(["clone", str(project), str(dest)], cwd=s.tmp)
+    roots_file = s.tmp / "roots.txt"
+    roots_file.write_text("\n".join([*map(str, fanout), str(s.tmp / "missing")]) + "\n", encoding="utf-8")
+    res = s.ctl(["sync", "--roots-from", str(roots_file), "--jobs", "2", "--yes"], cwd=s.tmp, check=False)
+    lines = [json.loads(line) for line in res.stdout.splitlines()]
+    ok = sorted(line["root"] for line in lines if line["ok"])
+    if res.returncode != 1 or ok != sorted(str(p.resolve()) for p in fanout) or len(lines) != 3:
+        raise AssertionError(f"unexpected fan-out sync result ({res.returncode}):\n{res.stdout}{res.stderr}")
+    for dest in fanout:
+        assert_exists(dest / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+
+
+def scenario_partial_clone(s: Scenario) -> None:
+    # Partial clone (blob:none) against a file:// remote: unselected blobs are never fetched.
+    partial = s.project("partial", bootstrap=False)
+    s.ctl(
+        [
+            "install",
+            "vi-security-guidance",
+            "--repo-url",
+            s.skills_src.as_uri(),
+            "--filter",
+            "blob:none",
+            "--stage",
+            "--yes",
+        ],
+        cwd=partial,
+    )
+    partial_skills = partial / ".codex" / "skills"
+    assert_exists(partial_skills / "skills" / "vi-security-guidance" / "SKILL.md")
+    assert_not_exists(partial_skills / "skills" / "vi-beads")
+
+    def missing_blobs() -> int:
+        res = git(["rev-list", "--objects", "--all", "--missing=print"], cwd=partial_skills)
+        return sum(1 for line in res.stdout.splitlines() if line.startswith("?"))
+
+    before = missing_blobs()
+    if before == 0:
+        raise AssertionError("expected a partial clone with missing (unfetched) blobs")
+    config = json.loads((partial / ".codex" / "skills.config.json").read_text(encoding="utf-8"))
+    if config.get("clone_filter") != "blob:none":
+        raise AssertionError(f"clone_filter not recorded in config: {config!r}")
+    git_commit_all(partial, "install security-guidance")
+
+    # Newly selected paths are fetched on demand.
+    s.ctl(["install", "vi-beads", "--yes"], cwd=partial)
+    assert_exists(partial_skills / "skills" / "vi-beads" / "SKILL.md")
+    if not 0 < missing_blobs() < before:
+        raise AssertionError("expected install to fetch only the newly selected blobs")
+
+    # Planning sizes local blobs (loose or packed) and leaves unfetched ones unsized, fetching nothing.
+    missing = missing_blobs()
+    git(["gc", "--quiet"], cwd=partial_skills)
+    removal = json.loads(s.ctl(["plan", "vi-beads", "--remove", "--toon"], cwd=partial).stdout)["totals"]
+    if removal["remove_files"] == 0 or removal["remove_bytes"] == 0 or removal["unknown_sizes"] != 0:
+        raise AssertionError(f"expected local blobs to be sized from the pack index: {removal!r}")
+    addition = json.loads(s.ctl(["plan", "vi-jj-docs", "--toon"], cwd=partial).stdout)["totals"]
+    if addition["add_files"] == 0 or addition["unknown_sizes"] == 0:
+        raise AssertionError(f"expected unfetched blobs to stay unsized: {addition!r}")
+    if missing_blobs() != missing:
+        raise AssertionError("expected plan not to fetch any blobs")
+
+    # A fresh clone of the project re-creates the submodule as a partial clone too.
+    clone = s.tmp / "partial-clone"
+    git(["clone", str(partial), str(clone)], cwd=s.tmp)
+    s.ctl(["sync", "--yes"], cwd=clone)
+    assert_exists(clone / ".codex" / "skills" / "skills" / "vi-security-guidance" / "SKILL.md")
+    res = git(["rev-list", "--objects", "--all", "--missing=print"], cwd=clone / ".codex" / "skills")
+    if not any(line.startswith("?") for line in res.stdout.splitlines()):
+        raise AssertionError("expected sync of a fresh clone to keep the partial-clone filter")
+
+
+def scenario_outdated(s: Scenario) -> None:
+    # Private upstream copy, so the new commit does not leak into other scenarios.
+    upstream = s.tmp / "outdated-src.git"
+    git(["clone", "--bare", "--quiet", str(s.skills_src), str(upstream)], cwd=s.tmp)
+    project = s.project(bootstrap=False)
+    s.ctl(["bootstrap", "--repo-url", str(upstream), "--branch", "main", "--yes"], cwd=project)
+    s.ctl(["install", "vi-beads", "--yes"], cwd=project)
+    report = json.loads(s.ctl(["outdated", "--toon", "--exit-code"], cwd=project).stdout)
+    if report["outdated"] or report["tip"] != report["pinned"]:
+        raise AssertionError(f"expected nothing outdated right after bootstrap: {report!r}")
+
+    work = s.tmp / "outdated-work"
+    git(["clone", "--quiet", "-b", "main", str(upstream), str(work)], cwd=s.tmp)
+    beads = work / "skills" / "vi-beads"
+    with (beads / "SKILL.md").open("a", encoding="utf-8") as fh:
+        fh.write("\nExtra upstream line.\n")
+    (beads / "NOTES.md").write_text("notes\n", encoding="utf-8")
+    with (work / "skills" / "vi-greptile" / "SKILL.md").open("a", encoding="utf-8") as fh:
+        fh.write("\nUnselected change.\n")
+    git_commit_all(work, "upstream change")
+    git(["push", "--quiet", "origin", "HEAD:main"], cwd=work)
+
+    res = s.ctl(["outdated", "--toon", "--exit-code"], cwd=project, check=False)
+    if res.returncode != 1:
+        raise AssertionError(f"expected exit 1 from outdated --exit-code, got {res.returncode}:\n{res.stderr}")
+    report = json.loads(res.stdout)
+    by_id = {row["id"]: row for row in report["skills"]}
+    manifest = project / ".codex" / "skills.manifest"
+    lines = (line.strip() for line in manifest.read_text(encoding="utf-8").splitlines())
+    selected = {line for line in lines if line and not line.startswith("#")}
+    if set(by_id) != selected or "vi-beads" not in selected:
+        raise AssertionError(f"outdated should report exactly the selected skills: {sorted(by_id)}")
+    beads_row = by_id["vi-beads"]
+    if not (beads_row["changed"] and beads_row["files_added"] == 1 and beads_row["files_modified"] == 1):
+        raise AssertionError(f"unexpected vi-beads row: {beads_row!r}")
+    expected_delta = len("\nExtra upstream line.\n") + len("notes\n")
+    if beads_row["bytes_delta"] != expected_delta:
+        raise AssertionError(f"expected bytes_delta {expected_delta}, got {beads_row['bytes_delta']}")
+    if any(row["changed"] for skill_id, row in by_id.items() if skill_id != "vi-beads"):
+        raise AssertionError(f"only vi-beads should be outdated: {report!r}")
+    # Reporting never moves the pin.
+    pinned = git(["ls-tree", "HEAD", ".codex/skills"], cwd=project).stdout.split()
+    head = git(["rev-parse", "HEAD"], cwd=project / ".codex" / "skills").stdout.strip()
+    if report["pinned"] == report["tip"] or head != report["pinned"] or (pinned and pinned[2] != head):
+        raise AssertionError(f"outdated must not move the pinned submodule: {report!r}")
+
+    # The printed bump hint must survive sync (which re-checks-out the recorded gitlink).
+    text = s.ctl(["outdated"], cwd=project).stdout
+    hint = next((line.split("Bump with: ", 1)[1] for line in text.splitlines() if "Bump with: " in line), None)
+    if hint is None or report["tip"] not in hint:
+        raise AssertionError(f"expected a bump hint with the tip sha:\n{text}")
+    for step in hint.split(" && "):
+        argv = step.split()
+        if argv[0] == "skillsctl":
+            s.ctl([*argv[1:], "--yes"], cwd=project)
+        else:
+            run(argv, cwd=project)
+    head = git(["rev-parse", "HEAD"], cwd=project / ".codex" / "skills").stdout.strip()
+    if head != report["tip"]:
+        raise AssertionError(f"bump hint left .codex/skills at {head}, expected {report['tip']}")
+    report = json.loads(s.ctl(["outdated", "--toon", "--exit-code"], cwd=project).stdout)
+    if report["outdated"] or report["pinned"] != report["tip"]:
+        raise AssertionError(f"nothing should be outdated after the bump: {report!r}")
+
+
+def scenario_shared_cache(s: Scenario) -> None:
+    # Shared object cache: the second project borrows every object from the cache.
+    shared: list[Path] = []
+    for name in ("shared-a", "shared-b"):
+        proj = s.tmp / name
+        proj.mkdir()
+        git(["init", "-b", "main"], cwd=proj)
+        s.ctl(["bootstrap", "--repo-url", s.skills_src.as_uri(), "--shared-cache", "--yes"], cwd=proj)
+        shared.append(proj)
+        if len(shared) == 1:
+            # A mirror from an older skillsctl lacks the no-prune settings; the next refresh adds them.
+            (mirror,) = (s.tmp / "cache" / "objects").glob("*.git")
+            git(["config", "--unset", "gc.pruneExpire"], cwd=mirror)
+    # Borrowed objects must survive force-pushes: the mirror never auto-gcs or prunes.
+    for key, value in (("gc.auto", "0"), ("maintenance.auto", "false"), ("gc.pruneExpire", "never")):
+        got = git(["config", "--get", key], cwd=mirror, check=False).stdout.strip()
+        if got != value:
+            raise AssertionError(f"shared mirror {key} is {got!r}, expected {value!r}")
+    counts = git(["count-objects", "-v"], cwd=shared[1] / ".codex" / "skills").stdout
+    if "count: 0" not in counts.splitlines() or "in-pack: 0" not in counts.splitlines():
+        raise AssertionError(f"expected no local objects with a shared cache:\n{counts}")
+    gc = json.loads(s.ctl(["cache", "gc", "--toon"], cwd=s.tmp).stdout)
+    if len(gc["kept"]) != 1 or gc["removed"]:
+        raise AssertionError(f"cache gc must keep a cache that is still borrowed: {gc!r}")
+    for proj in shared:
+        shutil.rmtree(proj)
+    gc = json.loads(s.ctl(["cache", "gc", "--max-age-days", "0", "--toon"], cwd=s.tmp).stdout)
+    if len(gc["removed"]) != 1:
+        raise AssertionError(f"cache gc must remove an unused cache: {gc!r}")
+
+
+def scenario_store(s: Scenario) -> None:
+    # Blob store: the same skill file in two projects is one inode in ~/.cache/skillsctl/store.
+    env = dict(s.env, SKILLSCTL_STORE="1")
+    projects = [s.project(f"store-{i}") for i in range(2)]
+    for project in projects:
+        s.ctl(["install", "vi-beads", "--yes"], cwd=project, env=env)
+    files = [p / ".codex" / "skills" / "skills" / "vi-beads" / "SKILL.md" for p in projects]
+    a, b = (f.stat() for f in files)
+    if not os.path.samestat(a, b) or a.st_nlink < 3:
+        raise AssertionError(f"expected one hardlinked inode shared with the store (nlink={a.st_nlink})")
+    for project in projects:
+        if git(["status", "--porcelain"], cwd=project / ".codex" / "skills").stdout.strip():
+            raise AssertionError("store links must leave .codex/skills clean")
+        if json.loads(s.ctl(["verify", "--toon"], cwd=project).stdout).get("ok") is not True:
+            raise AssertionError("verify failed on a store-backed checkout")
+
+    s.ctl(["remove", "vi-beads", "--yes"], cwd=projects[0], env=env)
+    s.ctl(["cache", "gc", "--toon"], cwd=s.tmp, env=env)
+    assert_exists(files[1])
+    if files[1].stat().st_nlink < 2:
+        raise AssertionError("gc must keep store blobs still linked by a project")
+    # A planned apply materializes through the store like `install --store`.
+    plan = s.tmp / "store-plan.json"
+    s.ctl(["plan", "vi-beads", "--out", str(plan)], cwd=projects[0])
+    s.ctl(["apply", str(plan), "--store"], cwd=projects[0])
+    if not os.path.samestat(files[0].stat(), files[1].stat()):
+        raise AssertionError("apply --store did not link the skill files from the store")
+    s.ctl(["remove", "vi-beads", "--yes"], cwd=projects[0], env=env)
+    s.ctl(["remove", "vi-beads", "--yes"], cwd=projects[1], env=env)
+    gc = json.loads(s.ctl(["cache", "gc", "--toon"], cwd=s.tmp, env=env).stdout)
+    if gc.get("store_removed", 0) <= 0:
+        raise AssertionError(f"expected gc to prune unlinked store blobs: {gc!r}")
+
+    # --store on an unchanged selection is not skipped by the no-op fast path.
+    late = s.project("store-late")
+    s.ctl(["install", "vi-beads", "--yes"], cwd=late)
+    s.ctl(["sync", "--store", "--yes"], cwd=late)
+    if (late / ".codex" / "skills" / "skills" / "vi-beads" / "SKILL.md").stat().st_nlink < 2:
+        raise AssertionError("sync --store on an unchanged selection did not link from the store")
+
+    # An in-place edit through a shared link (after chmod u+w) must not reach later checkouts.
+    tampered = s.project("store-tampered")
+    s.ctl(["install", "vi-beads", "--yes"], cwd=tampered, env=env)
+    skill_md = tampered / ".codex" / "skills" / "skills" / "vi-beads" / "SKILL.md"
+    skill_md.chmod(0o644)
+    with skill_md.open("a", encoding="utf-8") as fh:
+        fh.write("\ntampered\n")
+    fresh = s.project("store-fresh")
+    s.ctl(["install", "vi-beads", "--yes"], cwd=fresh, env=env)
+    if json.loads(s.ctl(["verify", "--toon"], cwd=fresh).stdout).get("ok") is not True:
+        raise AssertionError("a damaged store blob was linked into a new checkout")
+
+
+SCENARIOS: dict[str, Callable[[Scenario], None]] = {
+    "bootstrap": scenario_bootstrap,
+    "install-remove": scenario_install_remove,
+    "catalog-query": scenario_catalog_query,
+    "requires": scenario_requires,
+    "export-claude": scenario_export_claude,
+    "idempotent-sync": scenario_idempotent_sync,
+    "fast-status": scenario_fast_status,
+    "recover": scenario_recover,
+    "dirty-refusal": scenario_dirty_refusal,
+    "plan-apply": scenario_plan_apply,
+    "daemon": scenario_daemon,
+    "fanout": scenario_fanout,
+    "partial-clone": scenario_partial_clone,
+    "outdated": scenario_outdated,
+    "shared-cache": scenario_shared_cache,
+    "store": scenario_store,
+}
+
+
+def _run_scenario(name: str, s: Scenario) -> tuple[str, float, str | None]:
+    started = time.perf_counter()
+    s.tmp.mkdir(parents=True)
+    try:
+        SCENARIOS[name](s)
+        error = None
+    except subprocess.CalledProcessError as e:
+        error = f"{' '.join(map(str, e.cmd))} failed ({e.returncode}):\n{e.stdout}{e.stderr}"
+    except Exception as e:  # report every scenario, not just the first failure
+        error = f"{type(e).__name__}: {e}"
+    return name, time.perf_counter() - started, error
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="skillsctl integration tests (independent scenarios in parallel).")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(len(SCENARIOS), os.cpu_count() or 1),
+        help="Scenarios to run at once (default: one per CPU).",
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="SCENARIO",
+        help=f"Run only these scenarios ({', '.join(SCENARIOS)}).",
+    )
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    selected = args.scenarios or list(SCENARIOS)
+
+    repo_root = Path(__file__).resolve().parent.parent
+    skillsctl = repo_root / "skills" / "vi-project-bootstrap" / "scripts" / "skillsctl.py"
+    assert_exists(skillsctl)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="skillsctl-test-") as td:
+        tmp = Path(td)
+
+        # Snapshot skills repo from the current working tree (including uncommitted changes),
+        # cached as a bundle per source tree hash and shared read-only by every scenario.
+        bundle, hit = snapshot_bundle(repo_root, tmp)
+        skills_src = tmp / "skills-src.git"
+        git(["clone", "--quiet", "--bare", str(bundle), str(skills_src)], cwd=tmp)
+        git(["remote", "remove", "origin"], cwd=skills_src)
+        git(["config", "uploadpack.allowFilter", "true"], cwd=skills_src)
+        print(f"[..] snapshot {'cached' if hit else 'built'}: {bundle.name}", flush=True)
 
-        # Idempotent bootstrap/sync.
-        run(["python3", str(skillsctl), "bootstrap", "--yes"], cwd=project, check=True)
-        run(["python3", str(skillsctl), "sync", "--yes"], cwd=project, check=True)
+        # One bootstrapped project, copied by every scenario that starts from a bootstrapped repo.
+        template = Scenario(skillsctl, skills_src, tmp / "template").project()
 
-        # Recover after removing submodule working dir.
-        shutil.rmtree(project / ".codex" / "skills")
-        run(["python3", str(skillsctl), "sync", "--yes"], cwd=project, check=True)
-        assert_exists(project / ".codex" / "skills" / "catalog" / "skills.json")
+        failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [
+                pool.submit(_run_scenario, name, Scenario(skillsctl, skills_src, tmp / name, template)) for name in selected
+            ]
+            for fut in futures:
+                name, elapsed, error = fut.result()
+                if error is None:
+                    print(f"[OK]   {name:<16} {elapsed:6.2f}s", flush=True)
+                    continue
+                failed += 1
+                print(f"[FAIL] {name:<16} {elapsed:6.2f}s\n{error}", flush=True)
 
-    print("[OK] skillsctl integration tests passed.")
+    elapsed = time.perf_counter() - started
+    if failed:
+        print(f"[FAIL] {failed} of {len(selected)} skillsctl scenario(s) failed ({elapsed:.2f}s).", file=sys.stderr)
+        return 1
+    print(f"[OK] skillsctl integration tests passed ({len(selected)} scenarios, {elapsed:.2f}s).")
     return 0
 
 
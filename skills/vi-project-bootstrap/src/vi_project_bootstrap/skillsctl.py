@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
+import functools
+import hashlib
+import io
 import json
+import mmap
 import os
 import re
 import shutil
+import socket
+import sqlite3
+import stat
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterator, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: advisory locks become no-ops.
+    fcntl = None  # type: ignore[assignment]
 
 
 DEFAULT_REPO_URL = "git@github.com:t3chn/codex-skills.git"
@@ -18,10 +39,84 @@ DEFAULT_BRANCH = "main"
 SUBMODULE_REL = Path(".codex/skills")
 CONFIG_REL = Path(".codex/skills.config.json")
 MANIFEST_REL = Path(".codex/skills.manifest")
+LOCK_REL = Path(".codex/skills.lock")
+LOCK_VERSION = 1
+DEFAULT_VERIFY_JOBS = 8
+# Below this many files per process, another `git hash-object` costs more than it saves.
+VERIFY_MIN_FILES_PER_JOB = 256
+
+# Claude Code project skills: generated `.claude/skills/<id>/SKILL.md` wrappers (PRD FR-15/16).
+CLAUDE_SKILLS_REL = Path(".claude/skills")
+CLAUDE_WRAPPER_VERSION = 1
+CLAUDE_WRAPPER_MARKER_RE = re.compile(r"<!-- skillsctl export-claude inputs=([0-9a-f]{64}) -->")
+
+# Fingerprint of the last successfully applied selection, kept in the submodule's git dir.
+APPLIED_STATE_NAME = "skillsctl-applied.json"
+
+GITLINK_MODE = 0o160000
+
+# `<tool> --version` results keyed by resolved binary path + inode/mtime/size (user cache).
+PROBE_CACHE_NAME = "probes.json"
+PROBE_CACHE_VERSION = 1
+
+# Resident daemon (`skillsctl serve`): read-only commands it may answer for the CLI.
+DAEMON_COMMANDS = frozenset({"status", "catalog", "suggest"})
+DAEMON_IDLE_TIMEOUT = 600.0
+DAEMON_CONNECT_TIMEOUT = 0.2
+# A daemon that has not answered by then is treated as absent (the command runs in-process).
+DAEMON_REQUEST_TIMEOUT = 30.0
+DAEMON_ENV_PREFIX = "SKILLSCTL_"
+
+# Builtin fsmonitor daemon (macOS/Windows only).
+FSMONITOR_MIN_GIT = (2, 36)
+
+# `skillsctl plan` output consumed by `skillsctl apply`.
+PLAN_SCHEMA_VERSION = 1
+
+# Per-repo lock (in the superproject git dir) serializing selection changes.
+REPO_LOCK_NAME = "skillsctl.lock"
+DEFAULT_SYNC_JOBS = 4
+
+# Machine-wide bare mirrors used as --reference for .codex/skills clones.
+OBJECT_CACHE_SUBDIR = "objects"
+OBJECT_CACHE_USERS = "skillsctl-users"
+# Set in every shared mirror: a forced fetch can orphan commits that borrowing projects still
+# pin, and automatic gc/maintenance would prune them once they age past gc.pruneExpire.
+OBJECT_CACHE_CONFIG = {"gc.auto": "0", "maintenance.auto": "false", "gc.pruneExpire": "never"}
+OBJECT_CACHE_MAX_AGE_DAYS = 30
+
+# Machine-wide content-addressed store of skill files (<oid[:2]>/<oid[2:]>[.x]), hardlinked
+# into .codex/skills checkouts. Checkouts that got reflinks or copies (another device) hold no
+# link, so they list the blobs they use in STORE_USERS_SUBDIR/<digest>.json instead; gc keeps
+# those. FICLONE is the Linux reflink ioctl.
+STORE_SUBDIR = "store"
+STORE_USERS_SUBDIR = "store-users"
+STORE_LOCK_NAME = "store.lock"
+FICLONE = 0x40049409
 
 CATALOG_REL = Path("catalog/skills.json")
+SUGGEST_INDEX_REL = Path("catalog/skills.index.json")
+SUGGEST_INDEX_SCHEMA_VERSION = 1
+# Full-text index for `suggest --deep`. It lives outside the sparse cone, so it is read from the
+# object store (fetched on first use in a partial clone) into FTS_CACHE_SUBDIR/<blob oid>.sqlite.
+FTS_DB_REL = Path("fts/skills.fts.sqlite")
+FTS_CACHE_SUBDIR = "fts"
+FTS_CACHE_KEEP = 3
+# Per-entry byte ranges into catalog/skills.json (see scripts/generate-catalog.py).
+CATALOG_OFFSETS_REL = Path("catalog/skills.offsets.json")
+CATALOG_OFFSETS_SCHEMA_VERSION = 1
+FTS_SCHEMA_VERSION = 1
+# bm25 column weights for docs(skill_id, path, title, body); unindexed columns get 0.
+FTS_BM25_WEIGHTS = (0.0, 0.0, 5.0, 1.0)
+FTS_ROWS_PER_RESULT = 20
+
+# Suggest scoring (PRD section 8). Field weights apply once per query token.
+SUGGEST_EXACT = 100
+SUGGEST_PREFIX = 40
+SUGGEST_FIELD_WEIGHTS = {"tags": 20, "title": 10, "description": 5}
 
 ID_RE = re.compile(r"^[a-z0-9-]+$")
+CLONE_FILTER_RE = re.compile(r"^(blob:none|blob:limit=\d+[kmg]?|tree:\d+)$")
 SEMVER_RE = re.compile(r"\b(\d+\.\d+\.\d+)\b")
 
 PYTHON_MARKERS = (
@@ -40,6 +135,151 @@ class SkillsCtlError(RuntimeError):
     pass
 
 
+# Subprocess launches per label ("git status", "uvx", ...) for the current process.
+_FORK_COUNTS: Counter[str] = Counter()
+_FORK_COUNTS_LOCK = threading.Lock()
+
+# Memoized file parses keyed by path; reused only while the file's stat key is unchanged.
+_STAT_MEMO: dict[tuple[str, str], tuple[tuple[int, int, int], Any]] = {}
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class _Tracer:
+    """
+    Collects command phases and subprocess spans as Chrome trace events (ph="X", microseconds).
+
+    Spans are complete events on the calling thread's track, so a subprocess span nests under
+    whatever phase was open on that thread when it ran.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.t0 = time.perf_counter()
+        self.events: list[dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.tids: dict[int, int] = {}
+        self.local = threading.local()
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        with self.lock:
+            if ident not in self.tids:
+                self.tids[ident] = len(self.tids) + 1
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": self.tids[ident],
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            return self.tids[ident]
+
+    def _stack(self) -> list[str]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def _us(self, t: float) -> float:
+        return round((t - self.t0) * 1e6, 1)
+
+    def add(self, name: str, cat: str, start: float, end: float, args: dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(start),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": self._tid(),
+            "args": args,
+        }
+        with self.lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.add(name, "phase", start, time.perf_counter(), {"parent": parent})
+
+    def subprocess(self, cmd: list[str], cwd: Path | None, start: float, rc: int | None, out: str, err: str) -> None:
+        stack = self._stack()
+        self.add(
+            _fork_label(cmd),
+            "subprocess",
+            start,
+            time.perf_counter(),
+            {
+                "argv": cmd,
+                "cwd": str(cwd) if cwd else os.getcwd(),
+                "exit_code": rc,
+                "stdout_bytes": len(out.encode("utf-8")),
+                "stderr_bytes": len(err.encode("utf-8")),
+                "phase": stack[-1] if stack else None,
+            },
+        )
+
+    def write(self) -> None:
+        _ensure_parent_dir(self.path)
+        with self.lock:
+            data = {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+        self.path.write_text(json.dumps(data) + "\n", encoding="utf-8")
+
+    def summary(self) -> list[str]:
+        rows: dict[tuple[str, str], list[float]] = {}
+        with self.lock:
+            for e in self.events:
+                if e["ph"] == "X":
+                    rows.setdefault((e["cat"], e["name"]), []).append(e["dur"] / 1000)
+        order = sorted(rows.items(), key=lambda kv: (kv[0][0] != "phase", -sum(kv[1])))
+        width = max([len(name) for (_, name) in rows] + [5])
+        lines = [f"[TRACE] {self.path} ({sum(len(v) for v in rows.values())} spans)"]
+        lines.append(f"  {'kind':<10} {'name':<{width}} {'count':>5} {'total_ms':>10} {'max_ms':>9}")
+        for (cat, name), durs in order:
+            lines.append(f"  {cat:<10} {name:<{width}} {len(durs):>5} {sum(durs):>10.1f} {max(durs):>9.1f}")
+        return lines
+
+
+# Active tracer for the current main() call (`--trace FILE` / SKILLSCTL_TRACE=FILE).
+_TRACE: _Tracer | None = None
+
+
+@contextlib.contextmanager
+def _phase(name: str) -> Iterator[None]:
+    tracer = _TRACE
+    if tracer is None:
+        yield
+        return
+    with tracer.phase(name):
+        yield
+
+
+def _traced(name: str) -> Callable[[_F], _F]:
+    """
+    Decorator: run the function inside a trace phase.
+    """
+
+    def wrap(func: _F) -> _F:
+        @functools.wraps(func)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            with _phase(name):
+                return func(*args, **kwargs)
+
+        return inner  # type: ignore[return-value]
+
+    return wrap
+
+
 def _eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
@@ -58,25 +298,65 @@ def _extract_semver(text: str) -> str | None:
     return m.group(1) if m else None
 
 
+def _fork_label(cmd: list[str]) -> str:
+    name = Path(cmd[0]).name if cmd else "?"
+    if name != "git":
+        return name
+    i = 1
+    while i < len(cmd) and cmd[i] in ("-c", "-C"):
+        # Skip global options that take a separate value.
+        i += 2
+    rest = cmd[i:]
+    if not rest:
+        return "git"
+    if rest[0] in ("submodule", "sparse-checkout", "config") and len(rest) > 1:
+        return f"git {rest[0]} {rest[1]}"
+    return f"git {rest[0]}"
+
+
+def _fork_stats_enabled(flag: bool) -> bool:
+    return flag or os.environ.get("SKILLSCTL_FORK_STATS", "").strip() not in ("", "0")
+
+
+def _print_fork_stats() -> None:
+    total = sum(_FORK_COUNTS.values())
+    _eprint(f"[STATS] forks={total} {_dump_toon(dict(_FORK_COUNTS))}")
+
+
 def _run(
     cmd: list[str],
     *,
     cwd: Path | None = None,
     check: bool = True,
     input_text: str | None = None,
+    stdout_file: BinaryIO | None = None,
 ) -> subprocess.CompletedProcess[str]:
+    with _FORK_COUNTS_LOCK:
+        _FORK_COUNTS[_fork_label(cmd)] += 1
+    tracer = _TRACE
+    start = time.perf_counter()
+    rc: int | None = None
+    out = err = ""
     try:
-        return subprocess.run(
+        res = subprocess.run(
             cmd,
             cwd=str(cwd) if cwd else None,
             input=input_text,
             text=True,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.PIPE if stdout_file is None else stdout_file,
             stderr=subprocess.PIPE,
             check=check,
         )
+        rc, out, err = res.returncode, res.stdout or "", res.stderr
+        return res
+    except subprocess.CalledProcessError as e:
+        rc, out, err = e.returncode, e.stdout or "", e.stderr or ""
+        raise
     except FileNotFoundError as e:
         raise SkillsCtlError(f"[ERROR] Command not found: {cmd[0]}") from e
+    finally:
+        if tracer is not None:
+            tracer.subprocess(cmd, cwd, start, rc, out, err)
 
 
 def _git(
@@ -104,7 +384,228 @@ def _git_stdout(
     return res.stdout.strip()
 
 
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _memo_by_stat(kind: str, path: Path, load: Any) -> Any:
+    """
+    Return load(path), cached until the file's (mtime, size, inode) changes.
+
+    Missing files are not cached; load() decides what "missing" means.
+    """
+    key = _stat_key(path)
+    if key is None:
+        return load(path)
+    slot = (kind, str(path))
+    hit = _STAT_MEMO.get(slot)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    value = load(path)
+    _STAT_MEMO[slot] = (key, value)
+    return value
+
+
+def _git_dir(worktree: Path) -> Path | None:
+    """
+    Resolve the git dir of a work tree without forking git.
+
+    Handles both a `.git` directory and a `.git` file (`gitdir: <path>`), as used by submodules.
+    """
+    dot_git = worktree / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        text = dot_git.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    first = text.splitlines()[0].strip() if text.strip() else ""
+    if not first.startswith("gitdir:"):
+        return None
+    target = Path(first[len("gitdir:") :].strip())
+    if not target.is_absolute():
+        target = worktree / target
+    target = Path(os.path.normpath(target))
+    return target if target.is_dir() else None
+
+
+def _find_git_root(start: Path) -> Path | None:
+    """
+    Find the nearest enclosing work tree root by walking up from start, like git's discovery.
+
+    Returns None when no work tree is found. GIT_DIR/GIT_WORK_TREE are not consulted: callers
+    that must honour them check _git_env_overrides() first and let git decide (see _repo_root).
+    """
+    for parent in (start, *start.parents):
+        if (parent / ".git").exists():
+            return parent if _git_dir(parent) is not None else None
+    return None
+
+
+def _git_common_dir(git_dir: Path) -> Path:
+    try:
+        rel = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except OSError:
+        return git_dir
+    return Path(os.path.normpath(git_dir / rel))
+
+
+def _resolve_ref(git_dir: Path, ref: str) -> str | None:
+    common = _git_common_dir(git_dir)
+    for base in (git_dir, common):
+        try:
+            value = (base / ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+        if value.startswith("ref:"):
+            return _resolve_ref(git_dir, value[len("ref:") :].strip())
+        return value or None
+    try:
+        packed = (common / "packed-refs").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    for line in packed.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[1] == ref and not line.startswith(("#", "^")):
+            return parts[0]
+    return None
+
+
+def _read_head_commit(worktree: Path) -> str | None:
+    """
+    Return the commit checked out in worktree by reading HEAD/refs directly (no fork).
+    """
+    git_dir = _git_dir(worktree)
+    if git_dir is None:
+        return None
+    return _resolve_ref(git_dir, "HEAD")
+
+
+def _object_hash_len(git_dir: Path) -> int:
+    cfg = _read_git_config_file(_git_common_dir(git_dir) / "config") or {}
+    fmt = cfg.get("extensions", {}).get("objectformat", "sha1").lower()
+    return 32 if fmt == "sha256" else 20
+
+
+def _scan_index_for_gitlink(data: bytes, rel: str, hash_len: int) -> str | None:
+    """
+    Find the stage-0 gitlink entry for rel in a v2/v3 index without decoding every entry.
+
+    v2/v3 entries store the full path followed by NUL, so a byte search plus validation of the
+    fixed-size header in front of each hit is enough. Returns None for v4 (prefix-compressed
+    paths) or when no valid entry is found.
+    """
+    if len(data) < 12 or data[:4] != b"DIRC":
+        return None
+    version = int.from_bytes(data[4:8], "big")
+    if version not in (2, 3):
+        return None
+    needle = rel.encode("utf-8") + b"\x00"
+    name_len = min(len(rel.encode("utf-8")), 0xFFF)
+    pos = data.find(needle, 12)
+    while pos >= 0:
+        for ext in (0, 2):
+            flags_at = pos - 2 - ext
+            start = flags_at - hash_len - 40
+            if start < 12:
+                continue
+            flags = int.from_bytes(data[flags_at : flags_at + 2], "big")
+            if flags & 0xFFF != name_len or (flags >> 12) & 0x3 != 0:
+                continue
+            if bool(flags & 0x4000) != bool(ext):
+                continue
+            mode = int.from_bytes(data[start + 24 : start + 28], "big")
+            if mode != GITLINK_MODE:
+                continue
+            return data[start + 40 : start + 40 + hash_len].hex()
+        pos = data.find(needle, pos + 1)
+    return None
+
+
+def _read_gitlink(root: Path, rel: Path) -> str | None:
+    """
+    Return the commit recorded for the submodule at rel in the superproject index.
+
+    Reads `$GIT_DIR/index` in-process (memoized by stat); falls back to one `git ls-files -s`
+    fork for index formats the scanner does not handle (v4, split index).
+    """
+    git_dir = _git_dir(root)
+    if git_dir is None:
+        return None
+    hash_len = _object_hash_len(git_dir)
+
+    def load(index_path: Path) -> str | None:
+        try:
+            data = index_path.read_bytes()
+        except OSError:
+            return None
+        found = _scan_index_for_gitlink(data, rel.as_posix(), hash_len)
+        if found is not None:
+            return found
+        res = _git(["ls-files", "-s", "--", rel.as_posix()], cwd=root, check=False)
+        for line in res.stdout.splitlines():
+            meta, _, path = line.partition("\t")
+            parts = meta.split()
+            if path == rel.as_posix() and len(parts) == 3 and parts[0] == "160000" and parts[2] == "0":
+                return parts[1]
+        return None
+
+    return _memo_by_stat("gitlink:" + rel.as_posix(), git_dir / "index", load)
+
+
+def _global_git_config_files() -> list[Path]:
+    xdg = os.environ.get("XDG_CONFIG_HOME", "").strip()
+    xdg_config = (Path(xdg).expanduser() if xdg else Path.home() / ".config") / "git" / "config"
+    return [Path("/etc/gitconfig"), xdg_config, Path.home() / ".gitconfig"]
+
+
+def _hook_path(root: Path, hook: str) -> Path | None:
+    """
+    In-process equivalent of `git rev-parse --git-path hooks/<hook>` (honors core.hooksPath).
+
+    Falls back to git when config comes from the environment or a config file uses syntax the
+    parser does not handle (e.g. includes).
+    """
+    git_dir = _git_dir(root)
+    if git_dir is None:
+        return None
+    common = _git_common_dir(git_dir)
+    env_config = any(
+        os.environ.get(name) for name in ("GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM", "GIT_CONFIG_COUNT", "GIT_CONFIG_PARAMETERS")
+    )
+    hooks_path: str | None = None
+    files = [*_global_git_config_files(), common / "config", git_dir / "config.worktree"]
+    for path in files if not env_config else []:
+        if not path.exists():
+            continue
+        cfg = _read_git_config_file(path)
+        if cfg is None:
+            env_config = True
+            break
+        hooks_path = cfg.get("core", {}).get("hookspath", hooks_path)
+    if env_config:
+        res = _run(["git", "rev-parse", "--git-path", f"hooks/{hook}"], cwd=root, check=False)
+        rel = res.stdout.strip()
+        return (root / rel) if res.returncode == 0 and rel else None
+    if hooks_path:
+        return root / Path(hooks_path).expanduser() / hook
+    return common / "hooks" / hook
+
+
+def _git_env_overrides() -> bool:
+    return bool(os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"))
+
+
 def _repo_root() -> Path:
+    if not _git_env_overrides():
+        root = _find_git_root(Path.cwd().resolve())
+        if root is not None:
+            return root
+        raise SkillsCtlError("[ERROR] Not inside a git repository (needed for .codex/ bootstrap).")
     res = _run(["git", "rev-parse", "--show-toplevel"], check=False)
     if res.returncode != 0:
         raise SkillsCtlError("[ERROR] Not inside a git repository (needed for .codex/ bootstrap).")
@@ -115,10 +616,62 @@ def _detect_root() -> tuple[Path, bool]:
     """
     Return (root, is_git_repo). If not in a git repo, root is the current working directory.
     """
-    res = _run(["git", "rev-parse", "--show-toplevel"], check=False)
-    if res.returncode == 0 and res.stdout.strip():
-        return Path(res.stdout.strip()).resolve(), True
-    return Path.cwd().resolve(), False
+    try:
+        return _repo_root(), True
+    except SkillsCtlError:
+        return Path.cwd().resolve(), False
+
+
+def _probe_key(binary: str) -> str | None:
+    real = os.path.realpath(binary)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return None
+    return f"{real}|{st.st_ino}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _load_probe_cache() -> dict[str, Any]:
+    data = _memo_by_stat("probe-cache", _user_cache_dir() / PROBE_CACHE_NAME, _read_json_file_quiet)
+    if data.get("version") != PROBE_CACHE_VERSION or not isinstance(data.get("probes"), dict):
+        return {"version": PROBE_CACHE_VERSION, "probes": {}}
+    return data
+
+
+def _read_json_file_quiet(path: Path) -> dict[str, Any]:
+    try:
+        return _read_json_file(path)
+    except SkillsCtlError:
+        return {}
+
+
+def _probe_version(tool: str, *, use_cache: bool = True) -> tuple[bool, str | None]:
+    """
+    Return (present, semver) for `<tool> --version`.
+
+    Results are cached per resolved binary (path, inode, mtime, size), so a probe only runs again
+    after the binary is replaced or upgraded.
+    """
+    binary = shutil.which(tool)
+    if binary is None:
+        return False, None
+    key = _probe_key(binary)
+    cache = _load_probe_cache()
+    if use_cache and key is not None and key in cache["probes"]:
+        return True, cache["probes"][key]
+    res = _run([binary, "--version"], check=False)
+    version = _extract_semver(res.stdout.strip() or res.stderr.strip()) or None
+    if key is not None and res.returncode == 0:
+        probes = {k: v for k, v in cache["probes"].items() if not k.startswith(key.split("|", 1)[0] + "|")}
+        probes[key] = version
+        try:
+            _write_file_atomic(
+                _user_cache_dir() / PROBE_CACHE_NAME,
+                _dump_toon({"version": PROBE_CACHE_VERSION, "probes": probes}) + "\n",
+            )
+        except OSError:
+            pass
+    return True, version
 
 
 def _is_python_project(root: Path) -> bool:
@@ -136,6 +689,54 @@ def _ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on path (created if missing) for the duration of the block.
+    """
+    _ensure_parent_dir(path)
+    with open(path, "a+", encoding="utf-8") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _user_cache_dir() -> Path:
+    override = os.environ.get("SKILLSCTL_CACHE_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME", "").strip()
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "skillsctl"
+
+
+def _write_file_atomic(path: Path, text: str) -> None:
+    """
+    Write via a temp file + rename, keeping path's mode (0644 for a new file).
+
+    The rename also gives path a new inode, so _memo_by_stat readers (a resident daemon) see the
+    change even when size and mtime tick are unchanged.
+    """
+    _ensure_parent_dir(path)
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 def _read_json_file(path: Path) -> dict[str, Any]:
     try:
         data = json.loads(path.read_text(encoding="utf-8"))
@@ -155,42 +756,144 @@ def _write_json_file(path: Path, data: dict[str, Any]) -> None:
 
 def _load_config(root: Path) -> dict[str, str]:
     data = _read_json_file(root / CONFIG_REL)
-    repo_url = data.get("repo_url")
-    branch = data.get("branch")
     out: dict[str, str] = {}
-    if isinstance(repo_url, str) and repo_url.strip():
-        out["repo_url"] = repo_url.strip()
-    if isinstance(branch, str) and branch.strip():
-        out["branch"] = branch.strip()
+    for key in ("repo_url", "branch", "clone_filter"):
+        value = data.get(key)
+        if isinstance(value, str) and value.strip():
+            out[key] = value.strip()
     return out
 
 
-def _write_config(root: Path, *, repo_url: str, branch: str) -> None:
-    _write_json_file(root / CONFIG_REL, {"repo_url": repo_url, "branch": branch})
+def _write_config(root: Path, *, repo_url: str, branch: str, clone_filter: str | None = None) -> None:
+    data = {"repo_url": repo_url, "branch": branch}
+    if clone_filter:
+        data["clone_filter"] = clone_filter
+    _write_json_file(root / CONFIG_REL, data)
 
 
-def _find_submodule_name_by_path(root: Path, submodule_path: str) -> str | None:
+def _unescape_config_value(raw: str) -> str:
+    """
+    Decode a git-config value: strip inline comments, honor double quotes and backslash escapes.
+    """
+    out: list[str] = []
+    in_quotes = False
+    i = 0
+    while i < len(raw):
+        ch = raw[i]
+        if ch == "\\" and i + 1 < len(raw):
+            nxt = raw[i + 1]
+            out.append({"n": "\n", "t": "\t", "b": "\b"}.get(nxt, nxt))
+            i += 2
+            continue
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch in "#;" and not in_quotes:
+            break
+        else:
+            out.append(ch)
+        i += 1
+    if in_quotes:
+        raise ValueError("unterminated quote")
+    return "".join(out).strip()
+
+
+def _parse_git_config(text: str) -> dict[str, dict[str, str]]:
+    """
+    Parse the git-config subset used by `.gitmodules` and `$GIT_DIR/config`.
+
+    Returns {"section" or "section.subsection": {key: value}} with lowercased section/key names
+    (subsections keep their case) and last-value-wins semantics. Raises ValueError on anything
+    outside the subset (includes, continuation lines), so callers can fall back to `git config`.
+    """
+    out: dict[str, dict[str, str]] = {}
+    section: str | None = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith(("#", ";")):
+            continue
+        if line.startswith("["):
+            end = line.find("]")
+            if end < 0:
+                raise ValueError(f"invalid section header: {raw!r}")
+            header = line[1:end].strip()
+            rest = line[end + 1 :].strip()
+            if rest and not rest.startswith(("#", ";")):
+                raise ValueError(f"unsupported text after section header: {raw!r}")
+            if " " in header:
+                name, sub = header.split(None, 1)
+                sub = sub.strip()
+                if not (len(sub) >= 2 and sub.startswith('"') and sub.endswith('"')):
+                    raise ValueError(f"invalid subsection: {raw!r}")
+                sub = sub[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+                section = f"{name.lower()}.{sub}"
+            else:
+                section = header.lower()
+            if section in ("include", "includeif") or section.startswith(("include.", "includeif.")):
+                raise ValueError("config includes are not supported")
+            out.setdefault(section, {})
+            continue
+        if section is None:
+            raise ValueError(f"key outside of a section: {raw!r}")
+        if raw.rstrip().endswith("\\"):
+            raise ValueError("continuation lines are not supported")
+        if "=" in line:
+            key, value = line.split("=", 1)
+            key = key.strip().lower()
+            value = _unescape_config_value(value)
+        else:
+            key, value = line.split(None, 1)[0].lower(), "true"
+        out[section][key] = value
+    return out
+
+
+def _read_git_config_file(path: Path) -> dict[str, dict[str, str]] | None:
+    """
+    Parse a git config file (memoized by stat). Returns None if missing or outside the subset.
+    """
+
+    def load(p: Path) -> dict[str, dict[str, str]] | None:
+        try:
+            return _parse_git_config(p.read_text(encoding="utf-8", errors="replace"))
+        except (OSError, ValueError):
+            return None
+
+    return _memo_by_stat("git-config", path, load)
+
+
+def _read_gitmodules(root: Path) -> dict[str, dict[str, str]] | None:
+    """
+    Return {submodule_name: {path, url, branch, ...}} from `.gitmodules`.
+
+    Parsed in-process; falls back to one `git config --list` fork if the file uses syntax the
+    parser does not handle. Returns None when `.gitmodules` is missing or unreadable.
+    """
     gitmodules = root / ".gitmodules"
     if not gitmodules.exists():
         return None
-    res = _git(
-        ["config", "-f", ".gitmodules", "--get-regexp", r"^submodule\..*\.path$"],
-        cwd=root,
-        check=False,
-    )
-    if res.returncode != 0:
+    parsed = _read_git_config_file(gitmodules)
+    if parsed is None:
+        res = _git(["config", "-f", ".gitmodules", "--list"], cwd=root, check=False)
+        if res.returncode != 0:
+            return None
+        parsed = {}
+        for line in res.stdout.splitlines():
+            key, _, value = line.partition("=")
+            section, _, name = key.rpartition(".")
+            parsed.setdefault(section, {})[name] = value
+    out: dict[str, dict[str, str]] = {}
+    for section, values in parsed.items():
+        if section.startswith("submodule."):
+            out[section[len("submodule.") :]] = values
+    return out
+
+
+def _find_submodule_name_by_path(root: Path, submodule_path: str) -> str | None:
+    modules = _read_gitmodules(root)
+    if not modules:
         return None
-    for line in res.stdout.splitlines():
-        parts = line.strip().split(None, 1)
-        if len(parts) != 2:
-            continue
-        key, value = parts
-        if value.strip() != submodule_path:
-            continue
-        # key: submodule.<name>.path
-        if not key.startswith("submodule.") or not key.endswith(".path"):
-            continue
-        return key[len("submodule.") : -len(".path")]
+    for name, values in modules.items():
+        if values.get("path", "").strip() == submodule_path:
+            return name
     return None
 
 
@@ -198,14 +901,10 @@ def _read_gitmodules_url_branch(root: Path) -> tuple[str | None, str | None]:
     name = _find_submodule_name_by_path(root, str(SUBMODULE_REL))
     if name is None:
         return None, None
-    url = _git_stdout(["config", "-f", ".gitmodules", "--get", f"submodule.{name}.url"], cwd=root)
-    branch_res = _git(
-        ["config", "-f", ".gitmodules", "--get", f"submodule.{name}.branch"],
-        cwd=root,
-        check=False,
-    )
-    branch = branch_res.stdout.strip() if branch_res.returncode == 0 else ""
-    return (url.strip() or None, branch.strip() or None)
+    values = (_read_gitmodules(root) or {}).get(name, {})
+    url = values.get("url", "").strip()
+    branch = values.get("branch", "").strip()
+    return (url or None, branch or None)
 
 
 def _choose_repo_url_branch(root: Path, *, cli_repo_url: str | None, cli_branch: str | None) -> tuple[str, str]:
@@ -232,6 +931,18 @@ def _choose_repo_url_branch(root: Path, *, cli_repo_url: str | None, cli_branch:
     return DEFAULT_REPO_URL, DEFAULT_BRANCH
 
 
+def _choose_clone_filter(root: Path, *, cli_filter: str | None) -> str | None:
+    """
+    Partial-clone filter for .codex/skills: CLI flag, else project config, else none (full clone).
+    """
+    value = (cli_filter or "").strip() or _load_config(root).get("clone_filter")
+    if value and not CLONE_FILTER_RE.match(value):
+        raise SkillsCtlError(
+            f"[ERROR] Unsupported clone filter: {value!r} (expected e.g. blob:none, blob:limit=1m, tree:0)"
+        )
+    return value or None
+
+
 def _validate_ids(ids: list[str]) -> list[str]:
     cleaned: list[str] = []
     for raw in ids:
@@ -247,22 +958,23 @@ def _validate_ids(ids: list[str]) -> list[str]:
 
 
 def _load_manifest(root: Path) -> list[str]:
-    path = root / MANIFEST_REL
-    if not path.exists():
-        return []
-    ids: list[str] = []
-    for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
-            continue
-        if not ID_RE.match(line):
-            raise SkillsCtlError(f"[ERROR] Invalid id in manifest {MANIFEST_REL}: {line!r}")
-        ids.append(line)
-    return sorted(set(ids))
+    def load(path: Path) -> list[str]:
+        if not path.exists():
+            return []
+        ids: list[str] = []
+        for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            if not ID_RE.match(line):
+                raise SkillsCtlError(f"[ERROR] Invalid id in manifest {MANIFEST_REL}: {line!r}")
+            ids.append(line)
+        return sorted(set(ids))
+
+    return list(_memo_by_stat("manifest", root / MANIFEST_REL, load))
 
 
 def _write_manifest(root: Path, ids: list[str]) -> None:
-    _ensure_parent_dir(root / MANIFEST_REL)
     unique = sorted(set(_validate_ids(ids)))
     header = (
         "# .codex/skills.manifest\n"
@@ -270,25 +982,202 @@ def _write_manifest(root: Path, ids: list[str]) -> None:
     )
     body = "\n".join(unique)
     text = header + (body + "\n" if body else "")
-    (root / MANIFEST_REL).write_text(text, encoding="utf-8")
+    path = root / MANIFEST_REL
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    _write_file_atomic(path, text)
 
 
 def _is_git_repo(path: Path) -> bool:
-    res = _run(["git", "-C", str(path), "rev-parse", "--is-inside-work-tree"], check=False)
-    return res.returncode == 0 and res.stdout.strip() == "true"
+    """
+    True if path is itself the root of a work tree (has a usable `.git` dir or gitdir file).
+    """
+    return _git_dir(path) is not None
+
 
+def _shared_cache_enabled(flag: bool) -> bool:
+    return flag or os.environ.get("SKILLSCTL_SHARED_CACHE", "").strip() not in ("", "0")
 
-def _ensure_submodule(root: Path, *, repo_url: str, branch: str) -> None:
+
+def _store_enabled(flag: bool) -> bool:
+    return flag or os.environ.get("SKILLSCTL_STORE", "").strip() not in ("", "0")
+
+
+def _object_cache_path(repo_url: str) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", repo_url.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1])
+    slug = slug.removesuffix(".git").strip("-.") or "repo"
+    digest = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:12]
+    return _user_cache_dir() / OBJECT_CACHE_SUBDIR / f"{slug}-{digest}.git"
+
+
+def _pin_cache_objects(cache: Path) -> None:
+    """
+    Make sure an existing mirror carries OBJECT_CACHE_CONFIG (mirrors made by older versions).
+    """
+    config = _read_git_config_file(cache / "config") or {}
+    for key, value in OBJECT_CACHE_CONFIG.items():
+        section, _, name = key.rpartition(".")
+        if config.get(section, {}).get(name.lower()) != value:
+            _git(["config", key, value], cwd=cache, check=False)
+
+
+@_traced("object cache")
+def _refresh_object_cache(repo_url: str, *, allow_file: bool) -> Path | None:
+    """
+    Create or incrementally update the shared bare mirror for repo_url.
+
+    Returns the cache path to pass as --reference, or None (with a warning) if the cache could
+    not be prepared; callers then clone without it. Refs are never pruned and objects are never
+    deleted, since project clones borrow them through alternates: the mirror has automatic
+    gc/maintenance off and gc.pruneExpire=never (OBJECT_CACHE_CONFIG), and fetches skip auto-gc.
+    """
+    if repo_url.startswith(("./", "../")):
+        # Relative to the superproject's remote; only `git submodule` can resolve it.
+        return None
+    cache = _object_cache_path(repo_url)
+    with _file_lock(cache.with_name(cache.name + ".lock")):
+        if cache.is_dir():
+            _pin_cache_objects(cache)
+            res = _git(
+                ["fetch", "--quiet", "--no-auto-gc", "--no-auto-maintenance", "origin", "+refs/heads/*:refs/heads/*"],
+                cwd=cache,
+                allow_file_protocol=allow_file,
+                check=False,
+            )
+        else:
+            tmp = Path(tempfile.mkdtemp(prefix=cache.name + ".", dir=cache.parent))
+            pinned = [arg for key, value in OBJECT_CACHE_CONFIG.items() for arg in ("-c", f"{key}={value}")]
+            res = _git(
+                ["clone", "--quiet", "--bare", *pinned, repo_url, str(tmp)],
+                cwd=cache.parent,
+                allow_file_protocol=allow_file,
+                check=False,
+            )
+            if res.returncode == 0:
+                tmp.rename(cache)
+            else:
+                shutil.rmtree(tmp, ignore_errors=True)
+    if res.returncode != 0:
+        _eprint(f"[WARN] Shared object cache unavailable ({cache}): {res.stderr.strip()}")
+        return None
+    return cache
+
+
+def _register_cache_user(cache: Path, module_git_dir: Path) -> None:
+    users_path = cache / OBJECT_CACHE_USERS
+    with _file_lock(cache.with_name(cache.name + ".lock")):
+        try:
+            users = set(users_path.read_text(encoding="utf-8").split("\n"))
+        except OSError:
+            users = set()
+        users.add(str(module_git_dir.resolve()))
+        users_path.write_text("\n".join(sorted(u for u in users if u)) + "\n", encoding="utf-8")
+
+
+def _cache_users_alive(cache: Path) -> list[str]:
+    """
+    Module git dirs that still borrow objects from cache (their alternates point at it).
+    """
+    objects = str((cache / "objects").resolve())
+    try:
+        users = (cache / OBJECT_CACHE_USERS).read_text(encoding="utf-8").split()
+    except OSError:
+        return []
+    alive: list[str] = []
+    for user in users:
+        try:
+            alternates = (Path(user) / "objects" / "info" / "alternates").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        if any(str(Path(ln.strip()).resolve()) == objects for ln in alternates.splitlines() if ln.strip()):
+            alive.append(user)
+    return alive
+
+
+@_traced("partial clone")
+def _partial_clone(
+    root: Path,
+    *,
+    repo_url: str,
+    branch: str,
+    clone_filter: str,
+    allow_file: bool,
+    reference: Path | None = None,
+) -> None:
+    """
+    Clone the skills repo into .codex/skills as a partial clone with only root files checked out.
+
+    Blobs are then fetched lazily by git as sparse-checkout paths are added. Plain local paths
+    need --no-local, otherwise git hardlinks the objects and ignores the filter.
+    """
+    cmd = ["clone", "--quiet", f"--filter={clone_filter}", "--sparse", "-b", branch]
+    if allow_file and not repo_url.startswith("file://"):
+        cmd.append("--no-local")
+    if reference is not None:
+        cmd += ["--reference-if-able", str(reference)]
+    cmd += [repo_url, str(SUBMODULE_REL)]
+    res = _git(cmd, cwd=root, allow_file_protocol=allow_file, check=False)
+    if res.returncode != 0:
+        raise SkillsCtlError(f"[ERROR] Partial clone of {repo_url} failed:\n{res.stderr.strip()}")
+
+
+def _submodule_config_url(root: Path, name: str) -> str | None:
+    git_dir = _git_dir(root)
+    cfg = _read_git_config_file(git_dir / "config") if git_dir is not None else None
+    url = (cfg or {}).get(f"submodule.{name}", {}).get("url", "").strip()
+    return url or None
+
+
+@_traced("submodule")
+def _ensure_submodule(
+    root: Path,
+    *,
+    repo_url: str,
+    branch: str,
+    clone_filter: str | None = None,
+    shared_cache: bool = False,
+) -> None:
     submodule_dir = root / SUBMODULE_REL
     allow_file = _looks_like_local_repo_url(repo_url)
+    update_cmd = ["submodule", "update", "--init"]
+    if not clone_filter:
+        update_cmd += ["--depth", "1"]
 
+    root_git_dir = _git_dir(root)
     registered_name = _find_submodule_name_by_path(root, str(SUBMODULE_REL))
+    module_name = registered_name or str(SUBMODULE_REL)
+    module_git_dir = root_git_dir / "modules" / module_name if root_git_dir is not None else None
+    needs_clone = module_git_dir is not None and not module_git_dir.exists()
+
     if registered_name is not None:
-        _git(
-            ["submodule", "update", "--init", "--depth", "1", "--", str(SUBMODULE_REL)],
-            cwd=root,
-            allow_file_protocol=allow_file,
-        )
+        head = _read_head_commit(submodule_dir)
+        if head is not None and head == _read_gitlink(root, SUBMODULE_REL):
+            return
+        url = repo_url
+        if needs_clone and (clone_filter or shared_cache):
+            _git(["submodule", "init", "--", str(SUBMODULE_REL)], cwd=root)
+            url = _submodule_config_url(root, registered_name) or repo_url
+        cache = _refresh_object_cache(url, allow_file=allow_file) if needs_clone and shared_cache else None
+        if needs_clone and clone_filter:
+            # `submodule update` would check out the full tree (fetching every blob) before we
+            # can narrow it, so clone it ourselves and let git adopt the repo.
+            _partial_clone(
+                root,
+                repo_url=url,
+                branch=branch,
+                clone_filter=clone_filter,
+                allow_file=_looks_like_local_repo_url(url),
+                reference=cache,
+            )
+            _git(["submodule", "absorbgitdirs", "--", str(SUBMODULE_REL)], cwd=root)
+        elif cache is not None:
+            update_cmd += ["--reference", str(cache)]
+        _git(update_cmd + ["--", str(SUBMODULE_REL)], cwd=root, allow_file_protocol=allow_file)
+        if cache is not None and module_git_dir is not None:
+            _register_cache_user(cache, module_git_dir)
         return
 
     if submodule_dir.exists():
@@ -299,43 +1188,186 @@ def _ensure_submodule(root: Path, *, repo_url: str, branch: str) -> None:
         raise SkillsCtlError(f"[ERROR] {SUBMODULE_REL} exists but is not a git repo/submodule.")
 
     (root / SUBMODULE_REL.parent).mkdir(parents=True, exist_ok=True)
-    _git(
-        ["submodule", "add", "-b", branch, repo_url, str(SUBMODULE_REL)],
-        cwd=root,
-        allow_file_protocol=allow_file,
-    )
-    _git(
-        ["submodule", "update", "--init", "--depth", "1", "--", str(SUBMODULE_REL)],
-        cwd=root,
-        allow_file_protocol=allow_file,
-    )
+    cache = _refresh_object_cache(repo_url, allow_file=allow_file) if shared_cache and needs_clone else None
+    reference = ["--reference", str(cache)] if cache is not None else []
+    if clone_filter:
+        _partial_clone(
+            root,
+            repo_url=repo_url,
+            branch=branch,
+            clone_filter=clone_filter,
+            allow_file=allow_file,
+            reference=cache,
+        )
+        # `submodule add` adopts the existing clone at the branch tip; then move its .git
+        # into .git/modules like a regular submodule.
+        _git(
+            ["submodule", "add", "-b", branch, repo_url, str(SUBMODULE_REL)],
+            cwd=root,
+            allow_file_protocol=allow_file,
+        )
+        _git(["submodule", "absorbgitdirs", "--", str(SUBMODULE_REL)], cwd=root)
+    else:
+        _git(
+            ["submodule", "add"] + reference + ["-b", branch, repo_url, str(SUBMODULE_REL)],
+            cwd=root,
+            allow_file_protocol=allow_file,
+        )
+        _git(update_cmd + ["--", str(SUBMODULE_REL)], cwd=root, allow_file_protocol=allow_file)
+    if cache is not None and module_git_dir is not None:
+        _register_cache_user(cache, module_git_dir)
 
 
-def _ensure_sparse(skills_repo_dir: Path) -> None:
-    res = _git(["sparse-checkout", "init", "--cone"], cwd=skills_repo_dir, check=False)
-    if res.returncode != 0:
-        raise SkillsCtlError(
-            "[ERROR] git sparse-checkout is not available. "
-            "Upgrade git to a version that supports `git sparse-checkout`."
-        )
+def _git_bool(value: str | None) -> bool:
+    return (value or "false").lower() in ("true", "yes", "on", "1")
 
 
-def _set_sparse(skills_repo_dir: Path, paths: list[str]) -> None:
+def _worktree_git_config(worktree: Path) -> dict[str, dict[str, str]]:
+    """
+    Local config of a work tree (`config` overlaid with `config.worktree`), read in-process.
+    """
+    git_dir = _git_dir(worktree)
+    merged: dict[str, dict[str, str]] = {}
+    if git_dir is None:
+        return merged
+    for name in ("config", "config.worktree"):
+        for section, values in (_read_git_config_file(git_dir / name) or {}).items():
+            merged.setdefault(section, {}).update(values)
+    return merged
+
+
+def _sparse_cone_enabled(skills_repo_dir: Path) -> bool:
+    core = _worktree_git_config(skills_repo_dir).get("core", {})
+    return all(_git_bool(core.get(key)) for key in ("sparsecheckout", "sparsecheckoutcone"))
+
+
+def _fsmonitor_supported() -> bool:
+    """
+    Git ships a builtin fsmonitor daemon only on macOS and Windows (git >= 2.36).
+    """
+    if sys.platform not in ("darwin", "win32"):
+        return False
+    version = _probe_version("git")[1]
+    if version is None:
+        return False
+    return tuple(int(part) for part in version.split(".")[:2]) >= FSMONITOR_MIN_GIT
+
+
+def _index_tuning(skills_repo_dir: Path) -> dict[str, bool]:
+    cfg = _worktree_git_config(skills_repo_dir)
+    core = cfg.get("core", {})
+    return {
+        "sparse_index": _git_bool(cfg.get("index", {}).get("sparse")),
+        "untracked_cache": _git_bool(core.get("untrackedcache")),
+        "fsmonitor": _git_bool(core.get("fsmonitor")),
+    }
+
+
+def _tune_index(skills_repo_dir: Path) -> None:
+    """
+    Keep `git status` in .codex/skills proportional to the selected skills.
+
+    Enables the sparse index, the untracked cache and (where available) the builtin fsmonitor.
+    Settings the user configured explicitly, including to false, are left alone. Reads config
+    in-process, so an already tuned checkout costs no forks.
+    """
+    cfg = _worktree_git_config(skills_repo_dir)
+    core = cfg.get("core", {})
+    if "sparse" not in cfg.get("index", {}):
+        # Re-running init keeps the cone patterns and rewrites the index in sparse form. Git
+        # before 2.32 rejects --sparse-index; the checkout then just keeps a full index.
+        _git(["sparse-checkout", "init", "--cone", "--sparse-index"], cwd=skills_repo_dir, check=False)
+    if "untrackedcache" not in core:
+        _git(["config", "core.untrackedCache", "true"], cwd=skills_repo_dir, check=False)
+    if "fsmonitor" not in core and _fsmonitor_supported():
+        _git(["config", "core.fsmonitor", "true"], cwd=skills_repo_dir, check=False)
+
+
+def _ensure_sparse(skills_repo_dir: Path) -> None:
+    if not _sparse_cone_enabled(skills_repo_dir):
+        # Plain cone mode works on any git with sparse-checkout; the sparse index (git >= 2.32)
+        # is enabled best-effort by _tune_index.
+        res = _git(["sparse-checkout", "init", "--cone"], cwd=skills_repo_dir, check=False)
+        if res.returncode != 0:
+            raise SkillsCtlError(
+                "[ERROR] git sparse-checkout is not available. "
+                "Upgrade git to a version that supports `git sparse-checkout`."
+            )
+    _tune_index(skills_repo_dir)
+
+
+@_traced("sparse-checkout")
+def _set_sparse(skills_repo_dir: Path, paths: list[str]) -> None:
+    """
+    Make the cone set equal to paths, touching only what changed.
+
+    Pure additions use `sparse-checkout add`; any removal needs a full `set` (git has no
+    per-path remove). An unchanged set is a no-op.
+    """
     _ensure_sparse(skills_repo_dir)
     unique = sorted({p.strip().strip("/") for p in paths if p.strip()})
     if not unique:
         unique = ["catalog"]
-    input_text = "\n".join(unique) + "\n"
+    current = _read_sparse_paths(skills_repo_dir)
+    if current is not None and set(current) == set(unique):
+        return
+    if current is not None and set(current) < set(unique):
+        verb, todo = "add", sorted(set(unique) - set(current))
+    else:
+        verb, todo = "set", unique
     res = _git(
-        ["sparse-checkout", "set", "--stdin"],
+        ["sparse-checkout", verb, "--stdin"],
         cwd=skills_repo_dir,
         check=False,
-        input_text=input_text,
+        input_text="\n".join(todo) + "\n",
     )
     if res.returncode != 0:
         raise SkillsCtlError(f"[ERROR] Failed to set sparse-checkout:\n{res.stderr.strip()}")
 
 
+def _unescape_sparse_pattern(pattern: str) -> str:
+    return re.sub(r"\\(.)", r"\1", pattern)
+
+
+def _read_sparse_paths(skills_repo_dir: Path) -> list[str] | None:
+    """
+    In-process equivalent of `git sparse-checkout list`.
+
+    Reads `$GIT_DIR/info/sparse-checkout` plus core.sparseCheckout(Cone) from `config` and
+    `config.worktree`. Returns None when the work tree is not sparse (where git would fail).
+    """
+    git_dir = _git_dir(skills_repo_dir)
+    if git_dir is None:
+        return None
+    core: dict[str, str] = {}
+    for name in ("config", "config.worktree"):
+        cfg = _read_git_config_file(git_dir / name)
+        if cfg:
+            core.update(cfg.get("core", {}))
+    if core.get("sparsecheckout", "false").lower() not in ("true", "yes", "on", "1"):
+        return None
+    try:
+        text = (git_dir / "info" / "sparse-checkout").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip() and not ln.startswith("#")]
+    cone = core.get("sparsecheckoutcone", "false").lower() in ("true", "yes", "on", "1")
+    if not cone or lines[:2] != ["/*", "!/*/"]:
+        return lines
+
+    # Cone mode: positive `/dir/` entries are recursive unless a matching `!/dir/*/` marks
+    # them as parent-only (a prefix of a deeper selected directory).
+    positive: list[str] = []
+    parents: set[str] = set()
+    for ln in lines[2:]:
+        if ln.startswith("!") and ln.endswith("/*/"):
+            parents.add(_unescape_sparse_pattern(ln[2:-3]))
+        elif ln.startswith("/") and ln.endswith("/"):
+            positive.append(_unescape_sparse_pattern(ln[1:-1]))
+    return sorted({p for p in positive if p not in parents})
+
+
+@_traced("dirty check")
 def _submodule_dirty(skills_repo_dir: Path) -> bool:
     res = _git(["status", "--porcelain"], cwd=skills_repo_dir, check=True)
     return bool(res.stdout.strip())
@@ -350,22 +1382,40 @@ def _ensure_catalog_present(skills_repo_dir: Path) -> None:
         raise SkillsCtlError(f"[ERROR] Missing catalog after sparse checkout: {catalog_path}")
 
 
+def _read_catalog_bytes(catalog_path: Path) -> tuple[bytes, str]:
+    """
+    Return (raw bytes, sha256) of the catalog file, memoized by stat.
+    """
+
+    def load(p: Path) -> tuple[bytes, str]:
+        raw = p.read_bytes()
+        return raw, hashlib.sha256(raw).hexdigest()
+
+    return _memo_by_stat("catalog-bytes", catalog_path, load)
+
+
 def _load_catalog(skills_repo_dir: Path) -> dict[str, Any]:
+    """
+    The parsed, validated catalog, memoized by stat. Shared between callers: treat it as read-only.
+    """
     catalog_path = skills_repo_dir / CATALOG_REL
     if not catalog_path.exists():
         raise SkillsCtlError(f"[ERROR] Missing catalog: {catalog_path} (run `skillsctl bootstrap`)")
-    try:
-        data = json.loads(catalog_path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as e:
-        raise SkillsCtlError(f"[ERROR] Invalid catalog JSON: {catalog_path} ({e})") from e
-    if not isinstance(data, dict):
-        raise SkillsCtlError(f"[ERROR] Invalid catalog (expected object): {catalog_path}")
-    if data.get("schema_version") != 1:
-        raise SkillsCtlError(f"[ERROR] Unsupported catalog schema_version: {data.get('schema_version')!r}")
-    skills = data.get("skills")
-    if not isinstance(skills, list):
-        raise SkillsCtlError("[ERROR] Invalid catalog: skills must be a list")
-    return data
+
+    def load(p: Path) -> dict[str, Any]:
+        try:
+            data = json.loads(_read_catalog_bytes(p)[0].decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise SkillsCtlError(f"[ERROR] Invalid catalog JSON: {p} ({e})") from e
+        if not isinstance(data, dict):
+            raise SkillsCtlError(f"[ERROR] Invalid catalog (expected object): {p}")
+        if data.get("schema_version") != 1:
+            raise SkillsCtlError(f"[ERROR] Unsupported catalog schema_version: {data.get('schema_version')!r}")
+        if not isinstance(data.get("skills"), list):
+            raise SkillsCtlError("[ERROR] Invalid catalog: skills must be a list")
+        return data
+
+    return _memo_by_stat("catalog", catalog_path, load)
 
 
 def _catalog_by_id(catalog: dict[str, Any]) -> dict[str, dict[str, Any]]:
@@ -379,27 +1429,94 @@ def _catalog_by_id(catalog: dict[str, Any]) -> dict[str, dict[str, Any]]:
     return out
 
 
+def _skill_path(by_id: dict[str, dict[str, Any]], skill_id: str) -> str:
+    item = by_id.get(skill_id)
+    if item is None:
+        raise SkillsCtlError(f"[ERROR] Unknown skill id: {skill_id!r}")
+    targets = item.get("targets") or {}
+    codex = targets.get("codex") if isinstance(targets, dict) else None
+    path = codex.get("path") if isinstance(codex, dict) else None
+    if not isinstance(path, str) or not path.strip():
+        raise SkillsCtlError(f"[ERROR] Skill {skill_id!r} is missing targets.codex.path in catalog")
+    return path.strip().strip("/")
+
+
+def _requires_table(by_id: dict[str, dict[str, Any]]) -> dict[str, tuple[str, ...]]:
+    """
+    Adjacency table of catalog `requires` edges: {id: (required id, ...)}.
+    """
+    table: dict[str, tuple[str, ...]] = {}
+    for skill_id, item in by_id.items():
+        requires = item.get("requires")
+        if isinstance(requires, list):
+            table[skill_id] = tuple(r for r in requires if isinstance(r, str) and r)
+    return table
+
+
+def _resolve_ids(catalog: dict[str, Any], ids: list[str]) -> list[str]:
+    """
+    The selected ids plus everything they transitively require, sorted.
+
+    Iterative DFS over the `requires` table; an edge back into the current path is a cycle and
+    is reported with the offending chain.
+    """
+    by_id = _catalog_by_id(catalog)
+    table = _requires_table(by_id)
+    done: set[str] = set()
+    for start in ids:
+        if start in done:
+            continue
+        if start not in by_id:
+            raise SkillsCtlError(f"[ERROR] Unknown skill id: {start!r}")
+        stack = [(start, iter(table.get(start, ())))]
+        chain = [start]
+        while stack:
+            node, edges = stack[-1]
+            dep = next(edges, None)
+            if dep is None:
+                stack.pop()
+                chain.pop()
+                done.add(node)
+                continue
+            if dep in chain:
+                cycle = " -> ".join(chain[chain.index(dep) :] + [dep])
+                raise SkillsCtlError(f"[ERROR] Dependency cycle in catalog requires: {cycle}")
+            if dep in done:
+                continue
+            if dep not in by_id:
+                raise SkillsCtlError(f"[ERROR] Skill {node!r} requires unknown skill {dep!r}")
+            stack.append((dep, iter(table.get(dep, ()))))
+            chain.append(dep)
+    return sorted(done)
+
+
 def _resolve_paths(catalog: dict[str, Any], ids: list[str]) -> list[str]:
     by_id = _catalog_by_id(catalog)
     paths: set[str] = {"catalog"}
-    for skill_id in ids:
-        item = by_id.get(skill_id)
-        if item is None:
-            raise SkillsCtlError(f"[ERROR] Unknown skill id: {skill_id!r}")
-        targets = item.get("targets") or {}
-        codex = targets.get("codex") if isinstance(targets, dict) else None
-        path = codex.get("path") if isinstance(codex, dict) else None
-        if not isinstance(path, str) or not path.strip():
-            raise SkillsCtlError(f"[ERROR] Skill {skill_id!r} is missing targets.codex.path in catalog")
-        paths.add(path.strip().strip("/"))
+    for skill_id in _resolve_ids(catalog, ids):
+        paths.add(_skill_path(by_id, skill_id))
     return sorted(paths)
 
 
+def _dependents(catalog: dict[str, Any], ids: list[str], targets: set[str]) -> dict[str, list[str]]:
+    """
+    For each id in targets, the ids among `ids` that (transitively) require it.
+    """
+    out: dict[str, list[str]] = {}
+    for skill_id in ids:
+        for dep in _resolve_ids(catalog, [skill_id]):
+            if dep in targets and dep != skill_id:
+                out.setdefault(dep, []).append(skill_id)
+    return out
+
+
+@_traced("stage")
 def _stage_project_files(root: Path) -> None:
     candidates = [
         root / ".gitmodules",
         root / CONFIG_REL,
         root / MANIFEST_REL,
+        root / LOCK_REL,
         root / SUBMODULE_REL,
     ]
     existing = [str(p.relative_to(root)) for p in candidates if p.exists()]
@@ -420,9 +1537,9 @@ def _score_suggest(query: str, item: dict[str, Any]) -> int:
     score = 0
     if skill_id:
         if q == skill_id:
-            score += 100
+            score += SUGGEST_EXACT
         elif skill_id.startswith(q):
-            score += 40
+            score += SUGGEST_PREFIX
 
     aliases = item.get("aliases") or []
     if isinstance(aliases, list):
@@ -431,9 +1548,9 @@ def _score_suggest(query: str, item: dict[str, Any]) -> int:
                 continue
             a = alias.lower()
             if q == a:
-                score += 100
+                score += SUGGEST_EXACT
             elif a.startswith(q):
-                score += 40
+                score += SUGGEST_PREFIX
 
     tokens = _tokenize_query(query)
     tags = item.get("tags") or []
@@ -442,35 +1559,204 @@ def _score_suggest(query: str, item: dict[str, Any]) -> int:
 
     for tok in tokens:
         if isinstance(tags, list) and any(tok in str(tag).lower() for tag in tags):
-            score += 20
+            score += SUGGEST_FIELD_WEIGHTS["tags"]
         if tok and tok in title:
-            score += 10
+            score += SUGGEST_FIELD_WEIGHTS["title"]
         if tok and tok in desc:
-            score += 5
+            score += SUGGEST_FIELD_WEIGHTS["description"]
 
     return score
 
 
+@dataclass(frozen=True)
+class _SuggestIndex:
+    ids: list[str]
+    keys: list[str]
+    key_skills: list[int]
+    words: list[str]
+    word_starts: list[int]
+    vocab: str
+    postings: dict[str, list[list[int]]]
+    field_weights: list[int]
+
+
+def _load_suggest_index(skills_repo_dir: Path) -> _SuggestIndex | None:
+    """
+    Load catalog/skills.index.json if present and generated from the current catalog bytes.
+
+    Returns None (caller falls back to the linear scan) when missing, stale or unreadable.
+    """
+    catalog_path = skills_repo_dir / CATALOG_REL
+
+    def load(p: Path) -> tuple[Any, _SuggestIndex] | None:
+        # Memoized as built: only the catalog hash check below runs per call.
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("schema_version") != SUGGEST_INDEX_SCHEMA_VERSION:
+            return None
+        try:
+            fields = data["fields"]
+            if any(f not in SUGGEST_FIELD_WEIGHTS for f in fields):
+                return None
+            words = sorted(data["words"])
+            index = _SuggestIndex(
+                ids=data["ids"],
+                keys=[k for k, _ in data["keys"]],
+                key_skills=[i for _, i in data["keys"]],
+                words=words,
+                word_starts=[],
+                vocab="\n".join(words),
+                postings=data["words"],
+                field_weights=[SUGGEST_FIELD_WEIGHTS[f] for f in fields],
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+        offset = 0
+        for word in words:
+            index.word_starts.append(offset)
+            offset += len(word) + 1
+        return data.get("catalog_sha256"), index
+
+    built = _memo_by_stat("suggest-index", skills_repo_dir / SUGGEST_INDEX_REL, load)
+    if built is None:
+        return None
+    try:
+        if built[0] != _read_catalog_bytes(catalog_path)[1]:
+            return None
+    except OSError:
+        return None
+    return built[1]
+
+
+def _score_suggest_index(query: str, index: _SuggestIndex) -> dict[str, int]:
+    """
+    Same scores as _score_suggest over every catalog item, computed from the inverted index.
+    """
+    q = query.strip().lower()
+    if not q:
+        return {}
+    scores: dict[int, int] = {}
+
+    lo = bisect.bisect_left(index.keys, q)
+    for pos in range(lo, len(index.keys)):
+        key = index.keys[pos]
+        if not key.startswith(q):
+            break
+        idx = index.key_skills[pos]
+        scores[idx] = scores.get(idx, 0) + (SUGGEST_EXACT if key == q else SUGGEST_PREFIX)
+
+    for tok in _tokenize_query(query):
+        # Every word containing tok: substring search over the joined vocabulary, mapped back
+        # to word positions by offset.
+        matched: set[int] = set()
+        hit = index.vocab.find(tok)
+        while hit >= 0:
+            word_pos = bisect.bisect_right(index.word_starts, hit) - 1
+            matched.add(word_pos)
+            hit = index.vocab.find(tok, index.word_starts[word_pos] + len(index.words[word_pos]))
+        masks: dict[int, int] = {}
+        for word_pos in matched:
+            for idx, mask in index.postings[index.words[word_pos]]:
+                masks[idx] = masks.get(idx, 0) | mask
+        for idx, mask in masks.items():
+            bonus = sum(w for bit, w in enumerate(index.field_weights) if mask & (1 << bit))
+            scores[idx] = scores.get(idx, 0) + bonus
+
+    return {index.ids[idx]: score for idx, score in scores.items()}
+
+
 @dataclass(frozen=True)
 class _Ctx:
     root: Path
     repo_url: str
     branch: str
+    clone_filter: str | None = None
+    shared_cache: bool = False
+    store: bool = False
 
 
-def _ctx_from_args(*, cli_repo_url: str | None, cli_branch: str | None) -> _Ctx:
-    root = _repo_root()
+def _ctx_from_args(
+    *,
+    cli_repo_url: str | None,
+    cli_branch: str | None,
+    cli_filter: str | None = None,
+    cli_shared_cache: bool = False,
+    cli_store: bool = False,
+    root: Path | None = None,
+) -> _Ctx:
+    root = root or _repo_root()
     repo_url, branch = _choose_repo_url_branch(root, cli_repo_url=cli_repo_url, cli_branch=cli_branch)
-    return _Ctx(root=root, repo_url=repo_url, branch=branch)
+    clone_filter = _choose_clone_filter(root, cli_filter=cli_filter)
+    return _Ctx(
+        root=root,
+        repo_url=repo_url,
+        branch=branch,
+        clone_filter=clone_filter,
+        shared_cache=_shared_cache_enabled(cli_shared_cache),
+        store=_store_enabled(cli_store),
+    )
 
 
-def cmd_bootstrap(args: argparse.Namespace) -> int:
-    ctx = _ctx_from_args(cli_repo_url=args.repo_url, cli_branch=args.branch)
-    _ensure_submodule(ctx.root, repo_url=ctx.repo_url, branch=ctx.branch)
+def _ctx_from_repo_flags(args: argparse.Namespace, *, root: Path | None = None) -> _Ctx:
+    return _ctx_from_args(
+        cli_repo_url=args.repo_url,
+        cli_branch=args.branch,
+        cli_filter=args.filter,
+        cli_shared_cache=args.shared_cache,
+        cli_store=args.store,
+        root=root,
+    )
+
+
+@contextlib.contextmanager
+def _repo_lock(root: Path) -> Iterator[None]:
+    """
+    Serialize manifest/sparse-checkout changes per project (e.g. hooks racing a fan-out sync).
+    """
+    git_dir = _git_dir(root)
+    if git_dir is None:
+        yield
+        return
+    with _file_lock(_git_common_dir(git_dir) / REPO_LOCK_NAME):
+        yield
+
+
+def _ensure_config(ctx: _Ctx) -> None:
+    """
+    Write .codex/skills.config.json if missing; record a newly requested clone filter.
+    """
+    if (ctx.root / CONFIG_REL).exists():
+        config = _load_config(ctx.root)
+        if not ctx.clone_filter or config.get("clone_filter") == ctx.clone_filter:
+            return
+        _write_config(
+            ctx.root,
+            repo_url=config.get("repo_url") or ctx.repo_url,
+            branch=config.get("branch") or ctx.branch,
+            clone_filter=ctx.clone_filter,
+        )
+        return
+    url, branch = _read_gitmodules_url_branch(ctx.root)
+    _write_config(
+        ctx.root,
+        repo_url=url or ctx.repo_url,
+        branch=branch or ctx.branch,
+        clone_filter=ctx.clone_filter,
+    )
+
 
-    if not (ctx.root / CONFIG_REL).exists():
-        url, branch = _read_gitmodules_url_branch(ctx.root)
-        _write_config(ctx.root, repo_url=url or ctx.repo_url, branch=branch or ctx.branch)
+def cmd_bootstrap(args: argparse.Namespace) -> int:
+    ctx = _ctx_from_repo_flags(args)
+    _ensure_submodule(
+        ctx.root,
+        repo_url=ctx.repo_url,
+        branch=ctx.branch,
+        clone_filter=ctx.clone_filter,
+        shared_cache=ctx.shared_cache,
+    )
+    _ensure_config(ctx)
 
     skills_repo_dir = ctx.root / SUBMODULE_REL
     _set_sparse(skills_repo_dir, ["catalog"])
@@ -485,18 +1771,121 @@ def cmd_bootstrap(args: argparse.Namespace) -> int:
     return 0
 
 
+def _load_catalog_offsets(skills_repo_dir: Path) -> dict[str, Any] | None:
+    """
+    Load catalog/skills.offsets.json if it was generated from the current catalog bytes.
+    """
+
+    def load(p: Path) -> dict[str, Any] | None:
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    data = _memo_by_stat("catalog-offsets", skills_repo_dir / CATALOG_OFFSETS_REL, load)
+    if not data or data.get("schema_version") != CATALOG_OFFSETS_SCHEMA_VERSION:
+        return None
+    try:
+        if data.get("catalog_sha256") != _read_catalog_bytes(skills_repo_dir / CATALOG_REL)[1]:
+            return None
+        if not len(data["ids"]) == len(data["tags"]) == len(data["spans"]):
+            return None
+    except (OSError, KeyError, TypeError):
+        return None
+    return data
+
+
+def _query_catalog(
+    skills_repo_dir: Path,
+    *,
+    tags: list[str],
+    prefix: str,
+    offset: int,
+    limit: int | None,
+    use_index: bool = True,
+) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Filter catalog entries by id prefix and tags (all must match), then page.
+
+    Returns (matches before paging, page). With a current offsets sidecar only the entries on
+    the page are parsed; otherwise the whole catalog is loaded and filtered.
+    """
+    wanted = {t.lower() for t in tags}
+    end = None if limit is None else offset + limit
+    offsets = _load_catalog_offsets(skills_repo_dir) if use_index else None
+    if offsets is not None:
+        matches = [
+            i
+            for i, skill_id in enumerate(offsets["ids"])
+            if skill_id.startswith(prefix) and wanted.issubset(offsets["tags"][i])
+        ]
+        raw = _read_catalog_bytes(skills_repo_dir / CATALOG_REL)[0]
+        page = []
+        for i in matches[offset:end]:
+            start, length = offsets["spans"][i]
+            page.append(json.loads(raw[start : start + length].decode("utf-8")))
+        return len(matches), page
+
+    items = [
+        item
+        for item in _load_catalog(skills_repo_dir).get("skills", [])
+        if isinstance(item, dict)
+        and str(item.get("id") or "").startswith(prefix)
+        and wanted.issubset({str(t).lower() for t in item.get("tags") or []})
+    ]
+    return len(items), items[offset:end]
+
+
+def _catalog_entries(skills_repo_dir: Path, ids: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Catalog entries for ids, keyed by id (unknown ids are left out).
+
+    With a current offsets sidecar only those entries are parsed; otherwise the whole catalog is.
+    """
+    wanted = set(ids)
+    offsets = _load_catalog_offsets(skills_repo_dir)
+    if offsets is None:
+        by_id = _catalog_by_id(_load_catalog(skills_repo_dir))
+        return {skill_id: by_id[skill_id] for skill_id in wanted if skill_id in by_id}
+    raw = _read_catalog_bytes(skills_repo_dir / CATALOG_REL)[0]
+    out: dict[str, dict[str, Any]] = {}
+    for i, skill_id in enumerate(offsets["ids"]):
+        if skill_id in wanted:
+            start, length = offsets["spans"][i]
+            out[skill_id] = json.loads(raw[start : start + length].decode("utf-8"))
+    return out
+
+
 def cmd_catalog(args: argparse.Namespace) -> int:
     root = _repo_root()
     skills_repo_dir = root / SUBMODULE_REL
     if not skills_repo_dir.exists():
         raise SkillsCtlError("[ERROR] Missing .codex/skills. Run `skillsctl bootstrap` first.")
+    if args.offset < 0 or (args.limit is not None and args.limit < 0):
+        raise SkillsCtlError("[ERROR] --limit and --offset must be >= 0")
     _ensure_catalog_present(skills_repo_dir)
-    catalog = _load_catalog(skills_repo_dir)
-    if args.toon:
-        print(_dump_toon(catalog.get("skills", [])))
+    total, page = _query_catalog(
+        skills_repo_dir,
+        tags=args.tag or [],
+        prefix=args.prefix or "",
+        offset=args.offset,
+        limit=args.limit,
+        use_index=not args.no_index,
+    )
+
+    if args.ndjson or args.toon:
+        fields = [f.strip() for f in (args.fields or "").split(",") if f.strip()]
+        if fields:
+            page = [{f: item[f] for f in fields if f in item} for item in page]
+        if args.toon:
+            print(_dump_toon(page))
+            return 0
+        for item in page:
+            print(_dump_toon(item), flush=True)
         return 0
 
-    for item in catalog.get("skills", []):
+    for item in page:
         if not isinstance(item, dict):
             continue
         skill_id = item.get("id")
@@ -512,28 +1901,141 @@ def cmd_catalog(args: argparse.Namespace) -> int:
             first_line = desc.strip().splitlines()[0]
             print(f"  {first_line}")
         print()
+    if len(page) < total:
+        first = args.offset + 1 if page else args.offset
+        print(f"showing {first}-{args.offset + len(page)} of {total} (use --offset/--limit to page)")
     return 0
 
 
+def _fts_db(skills_repo_dir: Path) -> Path | None:
+    """
+    Local copy of the FTS5 database committed at HEAD of .codex/skills (None if there is none).
+    """
+    spec = f"HEAD:{FTS_DB_REL.as_posix()}"
+    res = _git(["rev-parse", "--verify", "--quiet", spec], cwd=skills_repo_dir, check=False)
+    oid = res.stdout.strip()
+    if res.returncode != 0 or not oid:
+        return None
+    cache_dir = _user_cache_dir() / FTS_CACHE_SUBDIR
+    db_path = cache_dir / f"{oid}.sqlite"
+    if db_path.exists():
+        return db_path
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=db_path.name + ".", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            res = _run(["git", "cat-file", "blob", oid], cwd=skills_repo_dir, check=False, stdout_file=fh)
+        if res.returncode != 0:
+            Path(tmp).unlink(missing_ok=True)
+            return None
+        os.replace(tmp, db_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    # Readers of an older copy keep their open file; new searches only ever open the current one.
+    stale = sorted(cache_dir.glob("*.sqlite"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in stale[FTS_CACHE_KEEP:]:
+        old.unlink(missing_ok=True)
+    return db_path
+
+
+def _deep_search(skills_repo_dir: Path, query: str, limit: int) -> list[dict[str, Any]] | None:
+    """
+    Rank skills by BM25 over the FTS5 doc index, best-matching doc per skill.
+
+    Returns None when the database is missing, has another schema version, or FTS5 is not
+    compiled into this Python's sqlite3.
+    """
+    tokens = _tokenize_query(query)
+    db_path = _fts_db(skills_repo_dir)
+    if db_path is None:
+        return None
+    if not tokens:
+        return []
+    match = " OR ".join(f'"{tok}"' for tok in dict.fromkeys(tokens))
+    weights = ", ".join(str(w) for w in FTS_BM25_WEIGHTS)
+    try:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        version = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or version[0] != str(FTS_SCHEMA_VERSION):
+            return None
+        rows = conn.execute(
+            f"SELECT skill_id, path, bm25(docs, {weights}) AS rank, "
+            "snippet(docs, 3, '[', ']', ' ... ', 16) "
+            "FROM docs WHERE docs MATCH ? ORDER BY rank LIMIT ?",
+            (match, max(limit, 1) * FTS_ROWS_PER_RESULT),
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+    best: dict[str, dict[str, Any]] = {}
+    for skill_id, path, rank, snippet in rows:
+        hit = best.get(skill_id)
+        if hit is None:
+            best[skill_id] = {
+                "id": skill_id,
+                "score": round(-rank, 3),
+                "path": path,
+                "snippet": " ".join(snippet.split()),
+                "matches": 1,
+            }
+        else:
+            hit["matches"] += 1
+    return list(best.values())[:limit]
+
+
+def _deep_hit_meta(item: dict[str, Any] | None) -> dict[str, Any]:
+    item = item or {}
+    return {"title": item.get("title"), "description": item.get("description"), "tags": item.get("tags")}
+
+
 def cmd_suggest(args: argparse.Namespace) -> int:
     root = _repo_root()
     skills_repo_dir = root / SUBMODULE_REL
     if not skills_repo_dir.exists():
         raise SkillsCtlError("[ERROR] Missing .codex/skills. Run `skillsctl bootstrap` first.")
     _ensure_catalog_present(skills_repo_dir)
-    catalog = _load_catalog(skills_repo_dir)
+
+    if args.deep:
+        hits = _deep_search(skills_repo_dir, args.query, args.limit)
+        if hits is not None:
+            by_id = _catalog_entries(skills_repo_dir, [h["id"] for h in hits])
+            hits = [dict(h, **_deep_hit_meta(by_id.get(h["id"]))) for h in hits if h["id"] in by_id]
+            if args.toon:
+                print(_dump_toon(hits))
+                return 0
+            for hit in hits:
+                print(f"{hit['id']} — {hit['title']} (score: {hit['score']})")
+                print(f"  {hit['path']}: {hit['snippet']}")
+            return 0
+        _eprint(f"[WARN] Full-text index {FTS_DB_REL} unavailable; using catalog scoring.")
 
     scored: list[tuple[int, str, dict[str, Any]]] = []
-    for item in catalog.get("skills", []):
-        if not isinstance(item, dict):
-            continue
-        skill_id = item.get("id")
-        if not isinstance(skill_id, str):
-            continue
-        score = _score_suggest(args.query, item)
-        if score <= 0:
-            continue
-        scored.append((score, skill_id, item))
+    index = None if args.no_index else _load_suggest_index(skills_repo_dir)
+    if index is not None:
+        # Rank on the index alone, then parse just the entries that make the cut.
+        ranked = sorted(
+            ((score, skill_id) for skill_id, score in _score_suggest_index(args.query, index).items() if score > 0),
+            key=lambda t: (-t[0], t[1]),
+        )[: args.limit]
+        by_id = _catalog_entries(skills_repo_dir, [skill_id for _, skill_id in ranked])
+        scored = [(score, skill_id, by_id[skill_id]) for score, skill_id in ranked if skill_id in by_id]
+    else:
+        for item in _load_catalog(skills_repo_dir).get("skills", []):
+            if not isinstance(item, dict):
+                continue
+            skill_id = item.get("id")
+            if not isinstance(skill_id, str):
+                continue
+            score = _score_suggest(args.query, item)
+            if score <= 0:
+                continue
+            scored.append((score, skill_id, item))
 
     scored.sort(key=lambda t: (-t[0], t[1]))
     scored = scored[: args.limit]
@@ -552,86 +2054,1082 @@ def cmd_suggest(args: argparse.Namespace) -> int:
             )
         print(_dump_toon(out))
         return 0
-
-    for score, skill_id, item in scored:
-        title = item.get("title")
-        desc = item.get("description") or ""
-        print(f"{skill_id} — {title} (score: {score})")
-        if isinstance(desc, str) and desc.strip():
-            print(f"  {desc.strip().splitlines()[0]}")
+
+    for score, skill_id, item in scored:
+        title = item.get("title")
+        desc = item.get("description") or ""
+        print(f"{skill_id} — {title} (score: {score})")
+        if isinstance(desc, str) and desc.strip():
+            print(f"  {desc.strip().splitlines()[0]}")
+    return 0
+
+
+def _selection_fingerprint(root: Path, ids: list[str]) -> dict[str, Any] | None:
+    """
+    Fingerprint of the on-disk selection state, or None if it is not fully materialized.
+
+    Covers the manifest ids, the gitlink commit (which HEAD must match) and the resolved sparse
+    paths (which the live sparse-checkout patterns must match). Reads files only, no forks.
+    """
+    skills_repo_dir = root / SUBMODULE_REL
+    if not (root / CONFIG_REL).exists() or not (skills_repo_dir / CATALOG_REL).exists():
+        return None
+    gitlink = _read_gitlink(root, SUBMODULE_REL)
+    if gitlink is None or _read_head_commit(skills_repo_dir) != gitlink:
+        return None
+    paths = _resolve_paths(_load_catalog(skills_repo_dir), ids)
+    if _read_sparse_paths(skills_repo_dir) != paths:
+        return None
+    if not all((skills_repo_dir / p).is_dir() for p in paths):
+        return None
+    manifest = hashlib.sha256("\n".join(sorted(set(ids))).encode("utf-8")).hexdigest()
+    return {"manifest": manifest, "gitlink": gitlink, "paths": paths}
+
+
+def _applied_state_path(root: Path) -> Path | None:
+    git_dir = _git_dir(root / SUBMODULE_REL)
+    return git_dir / APPLIED_STATE_NAME if git_dir is not None else None
+
+
+def _load_applied_fingerprint(root: Path) -> dict[str, Any] | None:
+    path = _applied_state_path(root)
+    if path is None:
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _record_applied_fingerprint(root: Path, ids: list[str], *, store: bool) -> None:
+    path = _applied_state_path(root)
+    fingerprint = _selection_fingerprint(root, ids)
+    if path is None or fingerprint is None:
+        return
+    path.write_text(_dump_toon(dict(fingerprint, store=store)) + "\n", encoding="utf-8")
+
+
+def _borrows_objects(skills_repo_dir: Path) -> bool:
+    git_dir = _git_dir(skills_repo_dir)
+    try:
+        return git_dir is not None and bool((git_dir / "objects" / "info" / "alternates").read_text().strip())
+    except OSError:
+        return False
+
+
+def _checkout_has_settings(ctx: _Ctx) -> bool:
+    """
+    True if ctx asks for nothing the existing checkout lacks: no --repo-url/--branch/--filter
+    overriding the project config, objects borrowed if --shared-cache, and a store-linked last
+    apply if --store.
+    """
+    root = ctx.root
+    if _choose_repo_url_branch(root, cli_repo_url=None, cli_branch=None) != (ctx.repo_url, ctx.branch):
+        return False
+    if _choose_clone_filter(root, cli_filter=None) != ctx.clone_filter:
+        return False
+    if ctx.shared_cache and not _borrows_objects(root / SUBMODULE_REL):
+        return False
+    return not ctx.store or (_load_applied_fingerprint(root) or {}).get("store") is True
+
+
+def _load_lock(root: Path) -> dict[str, Any] | None:
+    def load(path: Path) -> dict[str, Any] | None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("lock_version") != LOCK_VERSION:
+            return None
+        if not isinstance(data.get("commit"), str) or not isinstance(data.get("skills"), dict):
+            return None
+        return data
+
+    return _memo_by_stat("lock", root / LOCK_REL, load)
+
+
+def _lock_paths(lock: dict[str, Any]) -> list[str]:
+    paths = {str(entry.get("path")) for entry in lock["skills"].values() if isinstance(entry, dict)}
+    catalog = lock.get("catalog")
+    if isinstance(catalog, dict):
+        paths.add(str(catalog.get("path")))
+    return sorted(paths)
+
+
+def _lock_matches(root: Path, ids: list[str], fingerprint: dict[str, Any]) -> bool:
+    """
+    True if .codex/skills.lock pins exactly this commit, selection and sparse set.
+    """
+    lock = _load_lock(root)
+    if lock is None:
+        return False
+    return (
+        lock["commit"] == fingerprint["gitlink"]
+        and sorted(lock["skills"]) == _resolve_ids(_load_catalog(root / SUBMODULE_REL), ids)
+        and _lock_paths(lock) == fingerprint["paths"]
+    )
+
+
+def _write_lock(root: Path, ids: list[str], catalog: dict[str, Any]) -> None:
+    """
+    Pin the checked-out commit and the tree OID of every selected path (required skills
+    included) in .codex/skills.lock.
+    """
+    skills_repo_dir = root / SUBMODULE_REL
+    commit = _read_head_commit(skills_repo_dir)
+    if commit is None:
+        return
+    by_id = _catalog_by_id(catalog)
+    skill_paths = {skill_id: _skill_path(by_id, skill_id) for skill_id in _resolve_ids(catalog, ids)}
+    wanted = sorted({"catalog", *skill_paths.values()})
+    res = _git(["ls-tree", "--full-tree", commit, "--", *wanted], cwd=skills_repo_dir)
+    trees: dict[str, str] = {}
+    for line in res.stdout.splitlines():
+        meta, _, rel = line.partition("\t")
+        fields = meta.split()
+        if len(fields) == 3 and fields[1] == "tree":
+            trees[rel] = fields[2]
+    lock = {
+        "lock_version": LOCK_VERSION,
+        "commit": commit,
+        "catalog": {"path": "catalog", "tree": trees.get("catalog")},
+        "skills": {
+            skill_id: {"path": path, "tree": trees.get(path)} for skill_id, path in sorted(skill_paths.items())
+        },
+    }
+    text = json.dumps(lock, indent=2, ensure_ascii=False) + "\n"
+    path = root / LOCK_REL
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    _write_file_atomic(path, text)
+
+
+def _git_object_id(kind: str, data: bytes, hash_len: int) -> str:
+    h = hashlib.sha256() if hash_len == 32 else hashlib.sha1()
+    h.update(f"{kind} {len(data)}\0".encode("ascii"))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _worktree_blobs(skills_repo_dir: Path, rels: list[str], hash_len: int, jobs: int) -> dict[str, tuple[str, str]]:
+    """
+    (git mode, blob OID) of worktree files as `git add` would record them; missing ones are left out.
+
+    Regular files go through `git hash-object --stdin-paths`, so clean filters, eol attributes and
+    core.autocrlf apply as they would on add. Up to jobs such processes run in parallel.
+    """
+    out: dict[str, tuple[str, str]] = {}
+    files: list[tuple[str, str]] = []
+    for rel in rels:
+        path = skills_repo_dir / rel
+        try:
+            st = path.lstat()
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        if stat.S_ISLNK(st.st_mode):
+            out[rel] = ("120000", _git_object_id("blob", os.fsencode(os.readlink(path)), hash_len))
+        elif stat.S_ISREG(st.st_mode):
+            files.append((rel, "100755" if st.st_mode & 0o100 else "100644"))
+    n = max(1, min(jobs, len(files) // VERIFY_MIN_FILES_PER_JOB))
+    chunks = [files[i::n] for i in range(n) if files[i::n]]
+
+    def hash_chunk(chunk: list[tuple[str, str]]) -> list[tuple[str, tuple[str, str]]]:
+        res = _git(
+            ["hash-object", "--stdin-paths"],
+            cwd=skills_repo_dir,
+            input_text="".join(rel + "\n" for rel, _ in chunk),
+            check=False,
+        )
+        oids = res.stdout.split()
+        if res.returncode != 0 or len(oids) != len(chunk):
+            raise SkillsCtlError(f"[ERROR] git hash-object failed in .codex/skills: {res.stderr.strip()}")
+        return [(rel, (mode, oid)) for (rel, mode), oid in zip(chunk, oids)]
+
+    if chunks:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            for pairs in pool.map(hash_chunk, chunks):
+                out.update(pairs)
+    return out
+
+
+def _tree_oid(entries: dict[str, Any], hash_len: int) -> str:
+    """
+    Git tree OID of nested {name: (mode, oid) | {subtree}} entries.
+    """
+    rows: list[tuple[bytes, str, bytes, str]] = []
+    for name, value in entries.items():
+        raw = name.encode("utf-8")
+        if isinstance(value, dict):
+            rows.append((raw + b"/", "40000", raw, _tree_oid(value, hash_len)))
+        else:
+            rows.append((raw, value[0], raw, value[1]))
+    body = b"".join(mode.encode("ascii") + b" " + raw + b"\0" + bytes.fromhex(oid) for _, mode, raw, oid in sorted(rows))
+    return _git_object_id("tree", body, hash_len)
+
+
+def _nest(files: dict[str, tuple[str, str]]) -> dict[str, Any]:
+    root: dict[str, Any] = {}
+    for rel, value in files.items():
+        node = root
+        *dirs, name = rel.split("/")
+        for d in dirs:
+            node = node.setdefault(d, {})
+        node[name] = value
+    return root
+
+
+def cmd_verify(args: argparse.Namespace) -> int:
+    root = _repo_root()
+    lock = _load_lock(root)
+    if lock is None:
+        raise SkillsCtlError(f"[ERROR] Missing or invalid {LOCK_REL}. Run `skillsctl sync` to write it.")
+    skills_repo_dir = root / SUBMODULE_REL
+    git_dir = _git_dir(skills_repo_dir)
+    if git_dir is None:
+        raise SkillsCtlError("[ERROR] Missing .codex/skills. Run `skillsctl sync` first.")
+    hash_len = _object_hash_len(git_dir)
+
+    targets: list[tuple[str | None, dict[str, Any]]] = []
+    if isinstance(lock.get("catalog"), dict):
+        targets.append((None, lock["catalog"]))
+    targets += [(skill_id, entry) for skill_id, entry in sorted(lock["skills"].items()) if isinstance(entry, dict)]
+    paths = [str(entry.get("path")) for _, entry in targets]
+
+    res = _git(["ls-tree", "-r", "--full-tree", lock["commit"], "--", *paths], cwd=skills_repo_dir, check=False)
+    if res.returncode != 0:
+        raise SkillsCtlError(
+            f"[ERROR] Locked commit {lock['commit']} is not available in .codex/skills. Run `skillsctl sync`."
+        )
+    expected: dict[str, dict[str, tuple[str, str]]] = {p: {} for p in paths}
+    for line in res.stdout.splitlines():
+        meta, _, rel = line.partition("\t")
+        mode, _kind, oid = meta.split()
+        owner = next((p for p in paths if rel.startswith(p + "/")), None)
+        if owner is not None:
+            expected[owner][rel[len(owner) + 1 :]] = (mode, oid)
+
+    blob_paths = [
+        f"{p}/{rel}" for p, files in expected.items() for rel, (mode, _) in files.items() if mode != "160000"
+    ]
+    hashed = _worktree_blobs(skills_repo_dir, blob_paths, hash_len, max(1, args.jobs))
+
+    results: list[dict[str, Any]] = []
+    for skill_id, entry in targets:
+        path = str(entry.get("path"))
+        actual: dict[str, tuple[str, str]] = {}
+        modified: list[str] = []
+        missing: list[str] = []
+        for rel, (mode, oid) in sorted(expected[path].items()):
+            got = (mode, oid) if mode == "160000" else hashed.get(f"{path}/{rel}")
+            if got is None:
+                missing.append(rel)
+                continue
+            actual[rel] = got
+            if got != (mode, oid):
+                modified.append(rel)
+        untracked: list[str] = []
+        base = skills_repo_dir / path
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            for name in sorted(filenames):
+                rel = (Path(dirpath) / name).relative_to(base).as_posix()
+                if rel not in expected[path]:
+                    untracked.append(rel)
+        tree = _tree_oid(_nest(actual), hash_len) if actual else None
+        results.append(
+            {
+                "id": skill_id,
+                "path": path,
+                "tree": tree,
+                "ok": tree is not None and tree == entry.get("tree") and not missing,
+                "modified": modified,
+                "missing": missing,
+                "untracked": untracked,
+            }
+        )
+
+    ok = all(r["ok"] for r in results)
+    if args.toon:
+        print(_dump_toon({"commit": lock["commit"], "ok": ok, "skills": results}))
+        return 0 if ok else 1
+    for r in results:
+        label = r["id"] or r["path"]
+        if r["ok"]:
+            print(f"[OK] {label}")
+            continue
+        print(f"[FAIL] {label}: {len(r['modified'])} modified, {len(r['missing'])} missing (tree {r['tree']})")
+        for rel in r["modified"]:
+            print(f"  M {r['path']}/{rel}")
+        for rel in r["missing"]:
+            print(f"  D {r['path']}/{rel}")
+    for r in results:
+        for rel in r["untracked"]:
+            print(f"[WARN] untracked: {r['path']}/{rel}")
+    if not ok:
+        return 1
+    print(f"[OK] {len(results)} path(s) match {LOCK_REL} (commit {lock['commit'][:12]}).")
+    return 0
+
+
+def _object_dirs(git_dir: Path) -> list[Path]:
+    """
+    The objects dir of git_dir followed by its alternates (recursively), in git's lookup order.
+    """
+    dirs: list[Path] = []
+    pending = [_git_common_dir(git_dir) / "objects"]
+    while pending:
+        objects = pending.pop(0)
+        if objects in dirs or not objects.is_dir():
+            continue
+        dirs.append(objects)
+        try:
+            lines = (objects / "info" / "alternates").read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        pending += [(objects / ln.strip()).resolve() for ln in lines if ln.strip() and not ln.startswith("#")]
+    return dirs
+
+
+def _pack_index_hits(idx: Path, raws: list[bytes]) -> set[bytes]:
+    """
+    Which of the raw object names appear in a v2 pack index (fanout + sorted names, binary search).
+    """
+    hits: set[bytes] = set()
+    try:
+        with idx.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[:8] != b"\377tOc\0\0\0\2":
+                return hits
+            fanout = struct.unpack_from(">256I", buf, 8)
+            names = 8 + 256 * 4
+            for raw in raws:
+                n = len(raw)
+                lo, hi = (fanout[raw[0] - 1] if raw[0] else 0), fanout[raw[0]]
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    name = buf[names + mid * n : names + (mid + 1) * n]
+                    if name == raw:
+                        hits.add(raw)
+                        break
+                    if name < raw:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+    except (OSError, ValueError, struct.error):
+        pass
+    return hits
+
+
+def _local_objects(skills_repo_dir: Path, oids: list[str]) -> set[str]:
+    """
+    The oids stored locally (loose or packed, here or in an alternate).
+
+    Read from the object dirs directly: any git query for an absent object in a partial clone
+    lazily fetches it from the promisor remote.
+    """
+    git_dir = _git_dir(skills_repo_dir)
+    if git_dir is None:
+        return set()
+    want = {bytes.fromhex(oid): oid for oid in oids}
+    found: set[str] = set()
+    for objects in _object_dirs(git_dir):
+        found.update(oid for oid in want.values() if (objects / oid[:2] / oid[2:]).is_file())
+        for idx in sorted((objects / "pack").glob("*.idx")):
+            remaining = [raw for raw, oid in want.items() if oid not in found]
+            if not remaining:
+                return found
+            found.update(want[raw] for raw in _pack_index_hits(idx, remaining))
+    return found
+
+
+def _blob_sizes(skills_repo_dir: Path, oids: list[str]) -> dict[str, int]:
+    """
+    Sizes of the given blobs from one `git cat-file --batch-check` process.
+
+    In a partial clone only blobs already present locally are sized (no lazy fetch per blob);
+    absent ones are left out of the result.
+    """
+    if _is_partial_clone(skills_repo_dir):
+        local = _local_objects(skills_repo_dir, oids)
+        oids = [oid for oid in oids if oid in local]
+    if not oids:
+        return {}
+    cmd = ["cat-file", "--batch-check=%(objectname) %(objectsize)"]
+    res = _git(cmd, cwd=skills_repo_dir, input_text="\n".join(oids) + "\n", check=False)
+    sizes: dict[str, int] = {}
+    for line in res.stdout.splitlines():
+        oid, _, size = line.partition(" ")
+        if size.isdigit():
+            sizes[oid] = int(size)
+    return sizes
+
+
+def _fetch_branch_tip(skills_repo_dir: Path, branch: str) -> str:
+    """
+    Fetch origin/<branch> into .codex/skills and return its commit.
+
+    Shallow checkouts stay shallow (--depth 1); partial clones keep their filter (git reads it
+    from remote.origin.partialclonefilter), so only commits and trees are transferred there.
+    """
+    git_dir = _git_dir(skills_repo_dir)
+    if git_dir is None:
+        raise SkillsCtlError("[ERROR] Missing .codex/skills. Run `skillsctl sync` first.")
+    url = _worktree_git_config(skills_repo_dir).get("remote.origin", {}).get("url", "")
+    ref = f"refs/remotes/origin/{branch}"
+    cmd = ["fetch", "--quiet", "--no-tags", "origin", f"+refs/heads/{branch}:{ref}"]
+    if (_git_common_dir(git_dir) / "shallow").exists():
+        cmd.insert(1, "--depth=1")
+    res = _git(cmd, cwd=skills_repo_dir, allow_file_protocol=_looks_like_local_repo_url(url), check=False)
+    if res.returncode != 0:
+        raise SkillsCtlError(f"[ERROR] git fetch of {branch!r} failed: {res.stderr.strip()}")
+    tip = _resolve_ref(git_dir, ref)
+    if tip is None:
+        raise SkillsCtlError(f"[ERROR] Cannot resolve {ref} after fetch.")
+    return tip
+
+
+def cmd_outdated(args: argparse.Namespace) -> int:
+    root = _repo_root()
+    skills_repo_dir = root / SUBMODULE_REL
+    config = _load_config(root)
+    branch = args.branch or config.get("branch") or DEFAULT_BRANCH
+    pinned = _read_gitlink(root, SUBMODULE_REL)
+    if pinned is None:
+        raise SkillsCtlError("[ERROR] No gitlink for .codex/skills. Run `skillsctl bootstrap` first.")
+    _ensure_catalog_present(skills_repo_dir)
+    catalog = _load_catalog(skills_repo_dir)
+    by_id = _catalog_by_id(catalog)
+    ids = _resolve_ids(catalog, _load_manifest(root))
+    paths = {skill_id: _skill_path(by_id, skill_id) for skill_id in ids}
+    tip = _fetch_branch_tip(skills_repo_dir, branch)
+
+    changes: dict[str, list[tuple[str, str, str]]] = {skill_id: [] for skill_id in ids}
+    if tip != pinned and paths:
+        res = _git(
+            ["diff-tree", "-r", "-z", "--no-renames", pinned, tip, "--", *sorted(set(paths.values()))],
+            cwd=skills_repo_dir,
+        )
+        fields = res.stdout.split("\0")
+        owners = sorted(paths.items(), key=lambda kv: -len(kv[1]))
+        for meta, rel in zip(fields[0::2], fields[1::2]):
+            if not meta.startswith(":"):
+                continue
+            _old_mode, _new_mode, old_oid, new_oid, status = meta[1:].split(" ")
+            owner = next((skill_id for skill_id, p in owners if rel.startswith(p + "/")), None)
+            if owner is not None:
+                changes[owner].append((status[:1], old_oid, new_oid))
+
+    null_oids = {"0" * 40, "0" * 64}
+    wanted = sorted({oid for rows in changes.values() for _, a, b in rows for oid in (a, b) if oid not in null_oids})
+    sizes = _blob_sizes(skills_repo_dir, wanted)
+
+    report: list[dict[str, Any]] = []
+    for skill_id in ids:
+        rows = changes[skill_id]
+        delta = 0
+        unknown = 0
+        for _status, old_oid, new_oid in rows:
+            for oid, sign in ((old_oid, -1), (new_oid, 1)):
+                if oid in null_oids:
+                    continue
+                if oid in sizes:
+                    delta += sign * sizes[oid]
+                else:
+                    unknown += 1
+        report.append(
+            {
+                "id": skill_id,
+                "path": paths[skill_id],
+                "changed": bool(rows),
+                "files_added": sum(1 for st, _, _ in rows if st == "A"),
+                "files_modified": sum(1 for st, _, _ in rows if st not in ("A", "D")),
+                "files_deleted": sum(1 for st, _, _ in rows if st == "D"),
+                "bytes_delta": delta,
+                "unsized_blobs": unknown,
+            }
+        )
+
+    outdated = any(r["changed"] for r in report)
+    if args.toon:
+        print(_dump_toon({"branch": branch, "pinned": pinned, "tip": tip, "outdated": outdated, "skills": report}))
+    else:
+        print(f"pinned: {pinned[:12]}  {branch}: {tip[:12]}")
+        for r in report:
+            if not r["changed"]:
+                print(f"  = {r['id']}")
+                continue
+            unsized = f" (+{r['unsized_blobs']} unsized blob(s))" if r["unsized_blobs"] else ""
+            print(
+                f"  ~ {r['id']}: +{r['files_added']} ~{r['files_modified']} -{r['files_deleted']} files, "
+                f"{r['bytes_delta']:+d} bytes{unsized}"
+            )
+        if outdated:
+            # Stage the gitlink first: sync re-checks-out whatever commit the project records.
+            sub = SUBMODULE_REL.as_posix()
+            print(
+                "[OK] Selected skills changed upstream. Bump with: "
+                f"git -C {sub} checkout {tip} && git add {sub} && skillsctl sync"
+            )
+        else:
+            print("[OK] No selected skill changed upstream.")
+    return 1 if args.exit_code and outdated else 0
+
+
+def _apply_selection(
+    *,
+    ctx: _Ctx,
+    next_ids: list[str],
+    stage: bool,
+) -> bool:
+    """
+    Bring .codex/skills and the manifest to next_ids.
+
+    Returns False without running git when next_ids are already materialized (a non-None
+    _selection_fingerprint: HEAD at the gitlink, sparse set and directories in place) and ctx
+    asks for nothing the checkout lacks; True after a full apply.
+    """
+    fingerprint = _selection_fingerprint(ctx.root, next_ids)
+    if fingerprint is not None and _checkout_has_settings(ctx):
+        _write_manifest(ctx.root, next_ids)
+        if not _lock_matches(ctx.root, next_ids, fingerprint):
+            _write_lock(ctx.root, next_ids, _load_catalog(ctx.root / SUBMODULE_REL))
+        if stage:
+            _stage_project_files(ctx.root)
+        return False
+
+    skills_repo_dir = ctx.root / SUBMODULE_REL
+    if _read_head_commit(skills_repo_dir) is not None:
+        # Clone-time settings: an existing checkout keeps its origin and objects.
+        if _choose_repo_url_branch(ctx.root, cli_repo_url=None, cli_branch=None) != (ctx.repo_url, ctx.branch):
+            _eprint(f"[WARN] .codex/skills already exists; --repo-url/--branch apply only to a new clone ({CONFIG_REL}).")
+        if ctx.shared_cache and not _borrows_objects(skills_repo_dir):
+            _eprint("[WARN] .codex/skills already exists; --shared-cache applies only to a new clone.")
+    _ensure_submodule(
+        ctx.root,
+        repo_url=ctx.repo_url,
+        branch=ctx.branch,
+        clone_filter=ctx.clone_filter,
+        shared_cache=ctx.shared_cache,
+    )
+    _ensure_config(ctx)
+
+    if skills_repo_dir.exists() and _submodule_dirty(skills_repo_dir):
+        raise SkillsCtlError(
+            "[ERROR] Refusing to change sparse-checkout selection because .codex/skills is dirty.\n"
+            "Fix: commit/stash/reset changes inside .codex/skills, then retry."
+        )
+
+    _ensure_catalog_present(skills_repo_dir)
+    catalog = _load_catalog(skills_repo_dir)
+    by_id = _catalog_by_id(catalog)
+    for skill_id in next_ids:
+        if skill_id not in by_id:
+            raise SkillsCtlError(f"[ERROR] Unknown skill id: {skill_id!r}")
+
+    _write_manifest(ctx.root, next_ids)
+    paths = _resolve_paths(catalog, next_ids)
+    _set_sparse(skills_repo_dir, paths)
+    if ctx.store:
+        _link_from_store(skills_repo_dir, paths)
+    _record_applied_fingerprint(ctx.root, next_ids, store=ctx.store)
+    _write_lock(ctx.root, next_ids, catalog)
+
+    if stage:
+        _stage_project_files(ctx.root)
+    return True
+
+
+def cmd_install(args: argparse.Namespace) -> int:
+    ctx = _ctx_from_repo_flags(args)
+    with _repo_lock(ctx.root):
+        current = _load_manifest(ctx.root)
+        incoming = _validate_ids(args.ids)
+        next_ids = sorted(set(current).union(incoming))
+        _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
+        catalog = _load_catalog(ctx.root / SUBMODULE_REL)
+        required = sorted(set(_resolve_ids(catalog, incoming)) - set(next_ids))
+        print(f"[OK] Installed {len(incoming)} skill(s). Selected total: {len(next_ids)}.")
+        if required:
+            print(f"[OK] Also checked out required skill(s): {', '.join(required)}")
+        if args.claude:
+            _export_claude_after_apply(ctx.root, next_ids, stage=args.stage)
+    return 0
+
+
+def cmd_remove(args: argparse.Namespace) -> int:
+    ctx = _ctx_from_repo_flags(args)
+    with _repo_lock(ctx.root):
+        current = _load_manifest(ctx.root)
+        remove_ids = set(_validate_ids(args.ids))
+        next_ids = [i for i in current if i not in remove_ids]
+        _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
+        dependents = _dependents(_load_catalog(ctx.root / SUBMODULE_REL), next_ids, remove_ids)
+        print(f"[OK] Removed {len(remove_ids)} skill(s). Selected total: {len(next_ids)}.")
+        for skill_id, users in sorted(dependents.items()):
+            _eprint(
+                f"[WARN] {skill_id} is still required by {', '.join(users)}; it stays checked out "
+                "(remove those too to drop it)."
+            )
+        if args.claude:
+            _export_claude_after_apply(ctx.root, next_ids, stage=args.stage)
+    return 0
+
+
+def cmd_set(args: argparse.Namespace) -> int:
+    ctx = _ctx_from_repo_flags(args)
+    next_ids = sorted(set(_validate_ids(args.ids)))
+    with _repo_lock(ctx.root):
+        _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
+        print(f"[OK] Set selection to {len(next_ids)} skill(s).")
+        if args.claude:
+            _export_claude_after_apply(ctx.root, next_ids, stage=args.stage)
+    return 0
+
+
+def _is_partial_clone(skills_repo_dir: Path) -> bool:
+    git_dir = _git_dir(skills_repo_dir)
+    cfg = _read_git_config_file(_git_common_dir(git_dir) / "config") if git_dir else None
+    if cfg is None:
+        return False
+    return any(
+        section.startswith("remote.") and (values.get("promisor") == "true" or "partialclonefilter" in values)
+        for section, values in cfg.items()
+    )
+
+
+def _tree_entries(skills_repo_dir: Path, commit: str, paths: list[str]) -> dict[str, list[tuple[str, int | None]]]:
+    """
+    Blobs under each path at commit: {path: [(blob oid, size or None)]}. Never touches the worktree.
+
+    In a partial clone, sizes come from local objects only (None when the blob was never fetched),
+    so planning does not trigger lazy fetches.
+    """
+    out: dict[str, list[tuple[str, int | None]]] = {p: [] for p in paths}
+    if not paths:
+        return out
+    partial = _is_partial_clone(skills_repo_dir)
+    args = ["ls-tree", "-r", "--full-tree"] + ([] if partial else ["-l"]) + [commit, "--", *paths]
+    rows: list[tuple[str, str, int | None]] = []
+    for line in _git(args, cwd=skills_repo_dir).stdout.splitlines():
+        meta, _, rel = line.partition("\t")
+        fields = meta.split()
+        if len(fields) < 3 or fields[1] != "blob":
+            continue
+        size = int(fields[3]) if len(fields) > 3 and fields[3].isdigit() else None
+        owner = max((p for p in paths if rel == p or rel.startswith(p + "/")), key=len, default=None)
+        if owner is not None:
+            rows.append((owner, fields[2], size))
+    if partial:
+        # `ls-tree -l` would fetch every missing blob to size it; size only the local ones.
+        sizes = _blob_sizes(skills_repo_dir, sorted({oid for _, oid, _ in rows}))
+        rows = [(owner, oid, sizes.get(oid)) for owner, oid, _ in rows]
+    for owner, oid, size in rows:
+        out[owner].append((oid, size))
+    return out
+
+
+def _human_bytes(n: int | None) -> str:
+    if n is None:
+        return "?"
+    size = float(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{n} B"
+
+
+def _build_plan(root: Path, next_ids: list[str]) -> dict[str, Any]:
+    skills_repo_dir = root / SUBMODULE_REL
+    if not _is_git_repo(skills_repo_dir):
+        raise SkillsCtlError("[ERROR] Missing .codex/skills. Run `skillsctl bootstrap` first.")
+    head = _read_head_commit(skills_repo_dir)
+    if head is None:
+        raise SkillsCtlError("[ERROR] Cannot resolve HEAD of .codex/skills.")
+    _ensure_catalog_present(skills_repo_dir)
+    catalog = _load_catalog(skills_repo_dir)
+    target_paths = _resolve_paths(catalog, next_ids)
+    current_paths = _read_sparse_paths(skills_repo_dir) or []
+
+    path_owner: dict[str, str] = {}
+    for skill_id, item in _catalog_by_id(catalog).items():
+        codex = (item.get("targets") or {}).get("codex")
+        path = codex.get("path") if isinstance(codex, dict) else None
+        if isinstance(path, str) and path.strip():
+            path_owner[path.strip().strip("/")] = skill_id
+
+    added = sorted(set(target_paths) - set(current_paths))
+    removed = sorted(set(current_paths) - set(target_paths))
+    entries = _tree_entries(skills_repo_dir, head, added + removed)
+    changes: list[dict[str, Any]] = []
+    totals = {"add_files": 0, "add_bytes": 0, "remove_files": 0, "remove_bytes": 0, "unknown_sizes": 0}
+    for action, paths in (("add", added), ("remove", removed)):
+        for path in paths:
+            blobs = entries[path]
+            sizes = [size for _, size in blobs]
+            known = sum(size for size in sizes if size is not None)
+            unknown = sum(1 for size in sizes if size is None)
+            changes.append(
+                {
+                    "action": action,
+                    "id": path_owner.get(path),
+                    "path": path,
+                    "files": len(blobs),
+                    "bytes": known,
+                    "unknown_sizes": unknown,
+                }
+            )
+            totals[f"{action}_files"] += len(blobs)
+            totals[f"{action}_bytes"] += known
+            totals["unknown_sizes"] += unknown
+
+    return {
+        "schema_version": PLAN_SCHEMA_VERSION,
+        "root": str(root),
+        "base": {
+            "head": head,
+            "gitlink": _read_gitlink(root, SUBMODULE_REL),
+            "manifest_ids": _load_manifest(root),
+            "sparse_paths": current_paths,
+        },
+        "target": {"ids": next_ids, "paths": target_paths},
+        "changes": changes,
+        "totals": totals,
+    }
+
+
+def _print_plan(plan: dict[str, Any]) -> None:
+    target = plan["target"]
+    print(f"plan: {len(plan['base']['manifest_ids'])} -> {len(target['ids'])} skill(s) selected")
+    width = max([len(c["id"] or c["path"]) for c in plan["changes"]] + [1])
+    for change in plan["changes"]:
+        sign = "+" if change["action"] == "add" else "-"
+        size = _human_bytes(change["bytes"])
+        if change["unknown_sizes"]:
+            size += f" + {change['unknown_sizes']} unfetched blob(s)"
+        print(f"  {sign} {change['id'] or change['path']:<{width}} {change['files']:>6} files  {size}")
+    totals = plan["totals"]
+    print(
+        f"total: +{totals['add_files']} files ({_human_bytes(totals['add_bytes'])}), "
+        f"-{totals['remove_files']} files ({_human_bytes(totals['remove_bytes'])})"
+    )
+    base = plan["base"]
+    if base["gitlink"] and base["gitlink"] != base["head"]:
+        print("[WARN] .codex/skills HEAD differs from the recorded gitlink; `sync` would also move it.")
+
+
+def cmd_plan(args: argparse.Namespace) -> int:
+    root = _repo_root()
+    incoming = _validate_ids(args.ids)
+    current = _load_manifest(root)
+    if args.remove:
+        next_ids = [i for i in current if i not in set(incoming)]
+    elif args.set:
+        next_ids = sorted(set(incoming))
+    else:
+        next_ids = sorted(set(current).union(incoming))
+    plan = _build_plan(root, next_ids)
+
+    if args.out:
+        _write_file_atomic(Path(args.out), json.dumps(plan, indent=2, ensure_ascii=False) + "\n")
+    if args.toon:
+        print(_dump_toon(plan))
+        return 0
+    _print_plan(plan)
+    if args.out:
+        print(f"[OK] Wrote plan to {args.out}. Apply with: skillsctl apply {args.out}")
     return 0
 
 
-def _apply_selection(
-    *,
-    ctx: _Ctx,
-    next_ids: list[str],
-    stage: bool,
-) -> None:
-    _ensure_submodule(ctx.root, repo_url=ctx.repo_url, branch=ctx.branch)
+def _read_plan(spec: str) -> dict[str, Any]:
+    try:
+        text = sys.stdin.read() if spec == "-" else Path(spec).expanduser().read_text(encoding="utf-8")
+        plan = json.loads(text)
+    except OSError as e:
+        raise SkillsCtlError(f"[ERROR] Cannot read plan {spec}: {e}") from e
+    except json.JSONDecodeError as e:
+        raise SkillsCtlError(f"[ERROR] Invalid plan JSON: {spec} ({e})") from e
+    if not isinstance(plan, dict) or plan.get("schema_version") != PLAN_SCHEMA_VERSION:
+        raise SkillsCtlError(f"[ERROR] Unsupported plan: {spec}")
+    base, target, totals = plan.get("base"), plan.get("target"), plan.get("totals")
+    if not (
+        isinstance(plan.get("root"), str)
+        and isinstance(base, dict)
+        and isinstance(target, dict)
+        and _is_str_list(target.get("ids"))
+        and _is_str_list(target.get("paths"))
+        and isinstance(totals, dict)
+        and all(isinstance(totals.get(k), int) for k in ("add_files", "remove_files"))
+    ):
+        raise SkillsCtlError(f"[ERROR] Malformed plan: {spec}. Re-run `skillsctl plan --out`.")
+    return plan
+
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def cmd_apply(args: argparse.Namespace) -> int:
+    plan = _read_plan(args.plan)
+    root = _repo_root()
+    skills_repo_dir = root / SUBMODULE_REL
+    if Path(plan.get("root", "")).resolve() != root.resolve():
+        raise SkillsCtlError(f"[ERROR] Plan was made for {plan.get('root')}, not {root}.")
+    base, target = plan["base"], plan["target"]
+    next_ids = _validate_ids(target["ids"])
+    with _repo_lock(root):
+        current = {
+            "head": _read_head_commit(skills_repo_dir),
+            "manifest_ids": _load_manifest(root),
+            "sparse_paths": _read_sparse_paths(skills_repo_dir) or [],
+        }
+        stale = [key for key, value in current.items() if base.get(key) != value]
+        if stale:
+            raise SkillsCtlError(
+                f"[ERROR] Plan is stale ({', '.join(stale)} changed since it was made).\n"
+                "Fix: re-run `skillsctl plan`, review it, then apply the new plan."
+            )
+        if _submodule_dirty(skills_repo_dir):
+            raise SkillsCtlError(
+                "[ERROR] Refusing to change sparse-checkout selection because .codex/skills is dirty.\n"
+                "Fix: commit/stash/reset changes inside .codex/skills, then retry."
+            )
+        # Paths are re-derived from the ids, never taken from the file.
+        catalog = _load_catalog(skills_repo_dir)
+        by_id = _catalog_by_id(catalog)
+        for skill_id in next_ids:
+            if skill_id not in by_id:
+                raise SkillsCtlError(f"[ERROR] Unknown skill id in plan: {skill_id!r}")
+        paths = _resolve_paths(catalog, next_ids)
+        if paths != target["paths"]:
+            raise SkillsCtlError(
+                "[ERROR] Plan paths do not match its skill ids in the catalog.\n"
+                "Fix: re-run `skillsctl plan`, review it, then apply the new plan."
+            )
+        _write_manifest(root, next_ids)
+        _set_sparse(skills_repo_dir, paths)
+        if _store_enabled(args.store):
+            _link_from_store(skills_repo_dir, paths)
+        _record_applied_fingerprint(root, next_ids, store=_store_enabled(args.store))
+        _write_lock(root, next_ids, catalog)
+        if args.stage:
+            _stage_project_files(root)
+    totals = plan["totals"]
+    print(
+        f"[OK] Applied plan: {len(next_ids)} skill(s) selected "
+        f"(+{totals['add_files']} files, -{totals['remove_files']} files)."
+    )
+    return 0
 
-    if not (ctx.root / CONFIG_REL).exists():
-        url, branch = _read_gitmodules_url_branch(ctx.root)
-        _write_config(ctx.root, repo_url=url or ctx.repo_url, branch=branch or ctx.branch)
 
-    skills_repo_dir = ctx.root / SUBMODULE_REL
+def _read_frontmatter_block(path: Path) -> str:
+    """
+    Raw frontmatter of a SKILL.md (text between the leading `---` fences); reads no further.
+    """
+    lines: list[str] = []
+    try:
+        with path.open("r", encoding="utf-8", errors="replace") as fh:
+            if fh.readline().strip() != "---":
+                return ""
+            for line in fh:
+                if line.strip() == "---":
+                    return "".join(lines)
+                lines.append(line)
+    except OSError:
+        return ""
+    return ""
+
+
+def _claude_wrapper(skill_id: str, item: dict[str, Any], path: str, digest: str) -> str:
+    title = str(item.get("title") or skill_id)
+    description = str(item.get("description") or title)
+    canonical = (SUBMODULE_REL / path / "SKILL.md").as_posix()
+    return (
+        "---\n"
+        f"name: {skill_id}\n"
+        f"description: {json.dumps(description, ensure_ascii=False)}\n"
+        "---\n"
+        f"<!-- skillsctl export-claude inputs={digest} -->\n"
+        "\n"
+        f"# {title}\n"
+        "\n"
+        f"The canonical instructions for this skill live in `{canonical}`.\n"
+        "Read that file and follow its instructions; paths it mentions are relative to its directory.\n"
+        "\n"
+        "Generated by `skillsctl export-claude` from the project manifest; do not edit by hand.\n"
+    )
 
-    if skills_repo_dir.exists() and _submodule_dirty(skills_repo_dir):
-        raise SkillsCtlError(
-            "[ERROR] Refusing to change sparse-checkout selection because .codex/skills is dirty.\n"
-            "Fix: commit/stash/reset changes inside .codex/skills, then retry."
-        )
 
+def _export_claude(root: Path, ids: list[str]) -> dict[str, list[str]]:
+    """
+    Bring `.claude/skills/<id>/SKILL.md` wrappers in line with the selection (requires included).
+
+    Each wrapper records a hash of its inputs (catalog entry + canonical frontmatter); only
+    wrappers whose hash changed are rewritten (atomically), and generated wrappers for ids no
+    longer selected are deleted. Hand-written skills in `.claude/skills` are never touched.
+    """
+    skills_repo_dir = root / SUBMODULE_REL
     _ensure_catalog_present(skills_repo_dir)
     catalog = _load_catalog(skills_repo_dir)
     by_id = _catalog_by_id(catalog)
-    for skill_id in next_ids:
-        if skill_id not in by_id:
-            raise SkillsCtlError(f"[ERROR] Unknown skill id: {skill_id!r}")
+    wanted = _resolve_ids(catalog, ids)
+    out_dir = root / CLAUDE_SKILLS_REL
+    result: dict[str, list[str]] = {"written": [], "unchanged": [], "removed": []}
+
+    for skill_id in wanted:
+        item = by_id[skill_id]
+        path = _skill_path(by_id, skill_id)
+        inputs = {
+            "version": CLAUDE_WRAPPER_VERSION,
+            "entry": {k: item.get(k) for k in ("id", "title", "description")},
+            "path": path,
+            "frontmatter": _read_frontmatter_block(skills_repo_dir / path / "SKILL.md"),
+        }
+        digest = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+        target = out_dir / skill_id / "SKILL.md"
+        try:
+            match = CLAUDE_WRAPPER_MARKER_RE.search(target.read_text(encoding="utf-8", errors="replace"))
+        except OSError:
+            match = None
+        if match is not None and match.group(1) == digest:
+            result["unchanged"].append(skill_id)
+            continue
+        _write_file_atomic(target, _claude_wrapper(skill_id, item, path, digest))
+        result["written"].append(skill_id)
+
+    if out_dir.is_dir():
+        keep = set(wanted)
+        for entry in sorted(out_dir.iterdir()):
+            target = entry / "SKILL.md"
+            if entry.name in keep or not target.is_file():
+                continue
+            try:
+                generated = CLAUDE_WRAPPER_MARKER_RE.search(target.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+            if generated is None:
+                continue
+            target.unlink()
+            try:
+                entry.rmdir()
+            except OSError:
+                pass
+            result["removed"].append(entry.name)
+    return result
+
+
+def _stage_claude_wrappers(root: Path) -> None:
+    # -A records deletions; the pathspec may match nothing if no wrapper was ever created.
+    _git(["add", "-A", "--", CLAUDE_SKILLS_REL.as_posix()], cwd=root, check=False)
+
+
+def _report_claude_export(result: dict[str, list[str]]) -> None:
+    total = len(result["written"]) + len(result["unchanged"])
+    print(
+        f"[OK] Claude wrappers in {CLAUDE_SKILLS_REL}: {total} exported "
+        f"({len(result['written'])} written, {len(result['removed'])} removed)."
+    )
 
-    _write_manifest(ctx.root, next_ids)
-    paths = _resolve_paths(catalog, next_ids)
-    _set_sparse(skills_repo_dir, paths)
 
+def _export_claude_after_apply(root: Path, ids: list[str], *, stage: bool, quiet: bool = False) -> None:
+    """
+    `--claude` on install/remove/set/sync: refresh the wrappers for the new selection.
+    """
+    result = _export_claude(root, ids)
     if stage:
-        _stage_project_files(ctx.root)
+        _stage_claude_wrappers(root)
+    if not quiet:
+        _report_claude_export(result)
 
 
-def cmd_install(args: argparse.Namespace) -> int:
-    ctx = _ctx_from_args(cli_repo_url=args.repo_url, cli_branch=args.branch)
-    current = _load_manifest(ctx.root)
-    incoming = _validate_ids(args.ids)
-    next_ids = sorted(set(current).union(incoming))
-    _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
-    print(f"[OK] Installed {len(incoming)} skill(s). Selected total: {len(next_ids)}.")
+def cmd_export_claude(args: argparse.Namespace) -> int:
+    root = _repo_root()
+    with _repo_lock(root):
+        result = _export_claude(root, _load_manifest(root))
+        if args.stage:
+            _stage_claude_wrappers(root)
+    if args.toon:
+        print(_dump_toon(result))
+    else:
+        _report_claude_export(result)
     return 0
 
 
-def cmd_remove(args: argparse.Namespace) -> int:
-    ctx = _ctx_from_args(cli_repo_url=args.repo_url, cli_branch=args.branch)
-    current = _load_manifest(ctx.root)
-    remove_ids = set(_validate_ids(args.ids))
-    next_ids = [i for i in current if i not in remove_ids]
-    _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
-    print(f"[OK] Removed {len(remove_ids)} skill(s). Selected total: {len(next_ids)}.")
-    return 0
+def _sync_root(ctx: _Ctx, *, stage: bool, claude: bool = False) -> tuple[list[str], bool]:
+    """
+    Apply the committed manifest of one project. Returns (selected ids, whether git ran).
+    """
+    with _repo_lock(ctx.root):
+        if not (ctx.root / MANIFEST_REL).exists():
+            _write_manifest(ctx.root, [])
+        ids = _load_manifest(ctx.root)
+        changed = _apply_selection(ctx=ctx, next_ids=ids, stage=stage)
+        if claude:
+            _export_claude_after_apply(ctx.root, ids, stage=stage, quiet=True)
+        return ids, changed
 
 
-def cmd_set(args: argparse.Namespace) -> int:
-    ctx = _ctx_from_args(cli_repo_url=args.repo_url, cli_branch=args.branch)
-    next_ids = sorted(set(_validate_ids(args.ids)))
-    _apply_selection(ctx=ctx, next_ids=next_ids, stage=args.stage)
-    print(f"[OK] Set selection to {len(next_ids)} skill(s).")
-    return 0
+def _read_roots_file(spec: str) -> list[str]:
+    try:
+        text = sys.stdin.read() if spec == "-" else Path(spec).expanduser().read_text(encoding="utf-8")
+    except OSError as e:
+        raise SkillsCtlError(f"[ERROR] Cannot read roots file {spec!r}: {e}") from e
+    roots: list[str] = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if line and not line.startswith("#") and line not in roots:
+            roots.append(line)
+    return roots
+
+
+def _sync_one_of_many(args: argparse.Namespace, raw_root: str) -> dict[str, Any]:
+    started = time.monotonic()
+    out: dict[str, Any] = {"root": raw_root, "ok": False}
+    try:
+        root = _find_git_root(Path(raw_root).expanduser().resolve())
+        if root is None:
+            raise SkillsCtlError("[ERROR] Not inside a git repository (needed for .codex/ bootstrap).")
+        out["root"] = str(root)
+        with _phase(f"sync {root}"):
+            ids, changed = _sync_root(_ctx_from_repo_flags(args, root=root), stage=args.stage, claude=args.claude)
+        out.update(ok=True, ids=ids, changed=changed)
+    except subprocess.CalledProcessError as e:
+        detail = (e.stderr or "").strip() or str(e)
+        out["error"] = f"[ERROR] {' '.join(e.cmd)} failed: {detail}"
+    except Exception as e:  # one bad checkout must not stop the fan-out
+        out["error"] = str(e) or type(e).__name__
+    out["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+    return out
+
+
+def _sync_many(args: argparse.Namespace) -> int:
+    """
+    Sync every checkout listed in --roots-from on a bounded thread pool, one NDJSON line each.
+    """
+    roots = _read_roots_file(args.roots_from)
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(_sync_one_of_many, args, raw) for raw in roots]
+        for fut in as_completed(futures):
+            result = fut.result()
+            failed += 0 if result["ok"] else 1
+            print(_dump_toon(result), flush=True)
+    return 1 if failed else 0
 
 
 def cmd_sync(args: argparse.Namespace) -> int:
-    ctx = _ctx_from_args(cli_repo_url=args.repo_url, cli_branch=args.branch)
-    if not (ctx.root / MANIFEST_REL).exists():
-        _write_manifest(ctx.root, [])
-    ids = _load_manifest(ctx.root)
-    _apply_selection(ctx=ctx, next_ids=ids, stage=args.stage)
-    print(f"[OK] Synced .codex/skills to manifest ({len(ids)} skill(s)).")
+    if args.roots_from:
+        return _sync_many(args)
+    ctx = _ctx_from_repo_flags(args)
+    ids, changed = _sync_root(ctx, stage=args.stage)
+    suffix = "" if changed else " Already up to date."
+    print(f"[OK] Synced .codex/skills to manifest ({len(ids)} skill(s)).{suffix}")
+    if args.claude:
+        with _repo_lock(ctx.root):
+            _export_claude_after_apply(ctx.root, ids, stage=args.stage)
     return 0
 
 
@@ -641,29 +3139,32 @@ def cmd_status(args: argparse.Namespace) -> int:
     config = _load_config(root) if config_present else {}
 
     submodule_present = (root / SUBMODULE_REL).exists() and _is_git_repo(root / SUBMODULE_REL)
-    submodule_dirty = _submodule_dirty(root / SUBMODULE_REL) if submodule_present else False
+    # --fast answers from files on disk only; the dirty check is the one worktree scan.
+    submodule_dirty: bool | None = False
+    if submodule_present:
+        submodule_dirty = None if args.fast else _submodule_dirty(root / SUBMODULE_REL)
 
     manifest_present = (root / MANIFEST_REL).exists()
     manifest_ids = _load_manifest(root) if manifest_present else []
 
     sparse_paths: list[str] = []
     if submodule_present:
-        res = _git(["sparse-checkout", "list"], cwd=root / SUBMODULE_REL, check=False)
-        if res.returncode == 0:
-            sparse_paths = [ln.strip() for ln in res.stdout.splitlines() if ln.strip()]
+        sparse_paths = _read_sparse_paths(root / SUBMODULE_REL) or []
 
-    git_version = _extract_semver(_run(["git", "--version"], check=False).stdout.strip() or "")
+    git_version = _probe_version("git")[1]
 
     out = {
         "repo_root": str(root),
         "config_present": config_present,
         "repo_url": config.get("repo_url"),
         "branch": config.get("branch"),
+        "clone_filter": config.get("clone_filter"),
         "submodule_present": submodule_present,
         "submodule_dirty": submodule_dirty,
         "manifest_present": manifest_present,
         "manifest_ids": manifest_ids,
         "sparse_paths": sparse_paths,
+        "index_tuning": _index_tuning(root / SUBMODULE_REL) if submodule_present else None,
         "git_version": git_version,
     }
 
@@ -676,32 +3177,26 @@ def cmd_status(args: argparse.Namespace) -> int:
     if config_present:
         print(f"  repo_url: {config.get('repo_url')}")
         print(f"  branch: {config.get('branch') or DEFAULT_BRANCH}")
+        if config.get("clone_filter"):
+            print(f"  clone_filter: {config.get('clone_filter')}")
     print(f"submodule: {'present' if submodule_present else 'missing'}")
     if submodule_present:
-        print(f"  dirty: {submodule_dirty}")
+        print(f"  dirty: {'unknown (--fast)' if submodule_dirty is None else submodule_dirty}")
     print(f"manifest: {'present' if manifest_present else 'missing'} ({len(manifest_ids)} selected)")
     return 0
 
 
-def cmd_doctor(_args: argparse.Namespace) -> int:
+def cmd_doctor(args: argparse.Namespace) -> int:
     root, is_git_repo = _detect_root()
+    use_cache = not args.no_cache
 
-    git_version = _extract_semver(_run(["git", "--version"], check=False).stdout.strip() or "")
+    git_version = _probe_version("git", use_cache=use_cache)[1]
 
     python_project = _is_python_project(root)
     prek_profile = "python" if python_project else "generic"
 
-    bd_present = shutil.which("bd") is not None
-    bd_version = None
-    if bd_present:
-        res = _run(["bd", "--version"], check=False)
-        bd_version = _extract_semver(res.stdout.strip()) or None
-
-    uvx_present = shutil.which("uvx") is not None
-    uvx_version = None
-    if uvx_present:
-        res = _run(["uvx", "--version"], check=False)
-        uvx_version = _extract_semver(res.stdout.strip()) or None
+    bd_present, bd_version = _probe_version("bd", use_cache=use_cache)
+    uvx_present, uvx_version = _probe_version("uvx", use_cache=use_cache)
 
     beads_path = root / ".beads"
     beads_present = beads_path.exists()
@@ -713,9 +3208,8 @@ def cmd_doctor(_args: argparse.Namespace) -> int:
 
     precommit_hook_present = False
     if is_git_repo:
-        hook_rel = _run(["git", "rev-parse", "--git-path", "hooks/pre-commit"], check=False).stdout.strip()
-        if hook_rel:
-            precommit_hook_present = (root / hook_rel).exists()
+        hook = _hook_path(root, "pre-commit")
+        precommit_hook_present = hook is not None and hook.exists()
 
     needs_bd = not beads_present
     needs_prek = (not precommit_config_present) or (
@@ -745,10 +3239,9 @@ def cmd_doctor(_args: argparse.Namespace) -> int:
     codex_sparse_paths: list[str] | None = None
     codex_catalog_present = None
     if codex_skills_present:
-        res = _git(["sparse-checkout", "list"], cwd=submodule_dir, check=False)
-        if res.returncode == 0:
-            codex_sparse_paths = [ln.strip() for ln in res.stdout.splitlines() if ln.strip()]
+        codex_sparse_paths = _read_sparse_paths(submodule_dir)
         codex_catalog_present = (submodule_dir / CATALOG_REL).exists()
+    codex_index_tuning = _index_tuning(submodule_dir) if codex_skills_present else None
 
     manifest_present = (root / MANIFEST_REL).exists()
     manifest_ids = _load_manifest(root) if manifest_present else []
@@ -797,12 +3290,14 @@ def cmd_doctor(_args: argparse.Namespace) -> int:
         "codex_config_present": codex_config_present,
         "codex_repo_url": codex_config.get("repo_url"),
         "codex_branch": codex_config.get("branch"),
+        "codex_clone_filter": codex_config.get("clone_filter"),
         "effective_repo_url": effective_repo_url,
         "effective_branch": effective_branch,
         "codex_skills_present": codex_skills_present,
         "codex_skills_registered": codex_skills_registered,
         "codex_skills_dirty": codex_skills_dirty,
         "codex_sparse_paths": codex_sparse_paths,
+        "codex_index_tuning": codex_index_tuning,
         "codex_catalog_present": codex_catalog_present,
         "skills_manifest_present": manifest_present,
         "skills_manifest_ids": manifest_ids,
@@ -814,24 +3309,523 @@ def cmd_doctor(_args: argparse.Namespace) -> int:
     return 0
 
 
+def _clone_file(src: Path, dst: Path) -> str:
+    """
+    Create dst (must not exist) with src's content: hardlink, else reflink, else copy.
+
+    Returns the method used. Hardlinks fail across devices (EXDEV) or at the link limit; reflinks
+    need a CoW filesystem (btrfs, XFS) on Linux.
+    """
+    try:
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        pass
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fin, open(dst, "xb") as fout:
+                fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+            return "reflink"
+        except OSError:
+            dst.unlink(missing_ok=True)
+    shutil.copyfile(src, dst)
+    return "copy"
+
+
+def _adopt_into_store(target: Path, blob: Path, executable: bool) -> None:
+    """
+    Publish a checked-out file as the store copy of its blob (hardlinked when on the same device).
+
+    Store files are read-only so an in-place edit in one project cannot leak into the others.
+    """
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    tmp = blob.with_name(f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        try:
+            os.link(target, tmp)
+        except OSError:
+            shutil.copyfile(target, tmp)
+        os.chmod(tmp, 0o555 if executable else 0o444)
+        try:
+            os.link(tmp, blob)
+        except FileExistsError:
+            pass  # another project published it first
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@_traced("store")
+def _link_from_store(skills_repo_dir: Path, paths: list[str]) -> dict[str, int]:
+    """
+    Back the checked-out files under paths with the user-level blob store.
+
+    Every tracked file whose content matches its index OID is replaced (via rename) by a
+    hardlink to `<store>/<oid>` (reflink or copy across devices). A store blob is checked
+    against its OID before it is handed out, and blobs missing or damaged there are adopted
+    from this checkout. A shared inode edited in place (after a chmod) fails the check: it is
+    left alone here and evicted from the store. The index stat data is refreshed afterwards so
+    `git status` stays clean and fast. Returns counts per method.
+    """
+    cache_dir = _user_cache_dir()
+    store = cache_dir / STORE_SUBDIR
+    counts = {"linked": 0, "stored": 0, "hardlink": 0, "reflink": 0, "copy": 0}
+    unlinked: set[str] = set()
+    res = _git(["ls-files", "--stage", "-z", "--", *paths], cwd=skills_repo_dir)
+    with _file_lock(cache_dir / STORE_LOCK_NAME):
+        for record in res.stdout.split("\0"):
+            meta, _, rel = record.partition("\t")
+            fields = meta.split(" ")
+            if len(fields) != 3 or fields[0] not in ("100644", "100755"):
+                continue
+            mode, oid = fields[0], fields[1]
+            executable = mode == "100755"
+            hash_len = len(oid) // 2
+            target = skills_repo_dir / rel
+            blob = store / oid[:2] / (oid[2:] + (".x" if executable else ""))
+            try:
+                st = target.lstat()
+            except FileNotFoundError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            if _git_object_id("blob", target.read_bytes(), hash_len) != oid:
+                with contextlib.suppress(OSError):
+                    if os.path.samestat(st, blob.stat()):
+                        blob.unlink()  # edited through a shared link: stop handing it out
+                continue  # locally modified; leave it alone
+            try:
+                blob_st: os.stat_result | None = blob.stat()
+            except FileNotFoundError:
+                blob_st = None
+            if blob_st is not None and os.path.samestat(st, blob_st):
+                counts["linked"] += 1
+                continue
+            if blob_st is not None and _git_object_id("blob", blob.read_bytes(), hash_len) != oid:
+                blob.unlink()  # damaged store copy: replace it with this verified file
+                blob_st = None
+            if blob_st is None:
+                _adopt_into_store(target, blob, executable)
+                counts["stored"] += 1
+                if os.path.samestat(st, blob.stat()):
+                    continue
+            tmp = target.with_name(f".{target.name}.skillsctl-{os.getpid()}")
+            tmp.unlink(missing_ok=True)
+            method = _clone_file(blob, tmp)
+            if method != "hardlink":
+                os.chmod(tmp, 0o755 if executable else 0o644)
+                unlinked.add(blob.relative_to(store).as_posix())
+            os.replace(tmp, target)
+            counts[method] += 1
+        _record_store_user(skills_repo_dir, sorted(unlinked))
+    _git(["update-index", "-q", "--refresh"], cwd=skills_repo_dir, check=False)
+    return counts
+
+
+def _record_store_user(skills_repo_dir: Path, blobs: list[str]) -> None:
+    """
+    List the store blobs this checkout uses without a hardlink (caller holds the store lock).
+    """
+    checkout = str(skills_repo_dir.resolve())
+    digest = hashlib.sha256(checkout.encode("utf-8")).hexdigest()[:16]
+    path = _user_cache_dir() / STORE_USERS_SUBDIR / f"{digest}.json"
+    if blobs:
+        _write_file_atomic(path, json.dumps({"checkout": checkout, "blobs": blobs}) + "\n")
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _store_blobs_in_use() -> set[str]:
+    """
+    Store blobs (`<oid[:2]>/<rest>`) that live checkouts use as reflinks or copies. Entries of
+    deleted checkouts are dropped (caller holds the store lock).
+    """
+    in_use: set[str] = set()
+    users_dir = _user_cache_dir() / STORE_USERS_SUBDIR
+    for path in sorted(users_dir.glob("*.json")) if users_dir.is_dir() else []:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            checkout, blobs = Path(data["checkout"]), data["blobs"]
+        except (OSError, ValueError, KeyError, TypeError):
+            path.unlink(missing_ok=True)
+            continue
+        if not checkout.is_dir():
+            path.unlink(missing_ok=True)
+            continue
+        in_use.update(str(b) for b in blobs)
+    return in_use
+
+
+def _prune_store() -> int:
+    """
+    Delete store blobs no checkout uses any more: link count 1 and not listed by a checkout
+    that holds a reflink or copy. Returns the number removed.
+    """
+    cache_dir = _user_cache_dir()
+    store = cache_dir / STORE_SUBDIR
+    removed = 0
+    if not store.is_dir():
+        return 0
+    with _file_lock(cache_dir / STORE_LOCK_NAME):
+        in_use = _store_blobs_in_use()
+        for bucket in store.iterdir():
+            if not bucket.is_dir():
+                continue
+            for blob in bucket.iterdir():
+                try:
+                    if blob.stat().st_nlink == 1 and f"{bucket.name}/{blob.name}" not in in_use:
+                        blob.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+            with contextlib.suppress(OSError):
+                bucket.rmdir()
+    return removed
+
+
+def cmd_cache_gc(args: argparse.Namespace) -> int:
+    objects_dir = _user_cache_dir() / OBJECT_CACHE_SUBDIR
+    max_age = args.max_age_days * 86400
+    kept: list[str] = []
+    removed: list[str] = []
+    caches = sorted(p for p in objects_dir.glob("*.git") if p.is_dir()) if objects_dir.is_dir() else []
+    for cache in caches:
+        lock_path = cache.with_name(cache.name + ".lock")
+        with _file_lock(lock_path):
+            alive = _cache_users_alive(cache)
+            users_path = cache / OBJECT_CACHE_USERS
+            if alive:
+                users_path.write_text("\n".join(alive) + "\n", encoding="utf-8")
+                # Repack for size but never drop objects: borrowers may need unreachable ones.
+                _git(["gc", "--quiet", "--prune=never"], cwd=cache, check=False)
+                kept.append(str(cache))
+                continue
+            last_used = _stat_key(users_path) or _stat_key(cache)
+            idle = time.time() - (last_used[0] / 1e9 if last_used else 0)
+            if idle < max_age:
+                kept.append(str(cache))
+                continue
+            shutil.rmtree(cache, ignore_errors=True)
+            removed.append(str(cache))
+        if removed and removed[-1] == str(cache):
+            lock_path.unlink(missing_ok=True)
+
+    store_removed = _prune_store()
+
+    if args.toon:
+        print(
+            _dump_toon(
+                {"cache_dir": str(objects_dir), "kept": kept, "removed": removed, "store_removed": store_removed}
+            )
+        )
+        return 0
+    for path in removed:
+        print(f"removed: {path}")
+    print(f"[OK] Cache gc: kept {len(kept)}, removed {len(removed)}, pruned {store_removed} store blob(s).")
+    return 0
+
+
+def _daemon_socket_path(root: Path) -> Path:
+    runtime = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    base = Path(runtime) / "skillsctl" if runtime else Path(tempfile.gettempdir()) / f"skillsctl-{os.getuid()}"
+    digest = hashlib.sha256(str(root.resolve()).encode("utf-8")).hexdigest()[:16]
+    return base / f"{digest}.sock"
+
+
+def _daemon_socket_problem(sock_path: Path, *, check_socket: bool = True) -> str | None:
+    """
+    Why a daemon socket cannot be trusted, or None. Without XDG_RUNTIME_DIR the directory has a
+    predictable name in the shared temp dir, so another local user could pre-create it and answer
+    (or sniff) our requests: it must be a real directory we own with no group/other access, and
+    the socket must be ours too.
+    """
+    uid = os.getuid()
+    checks = [(sock_path.parent, stat.S_ISDIR, "directory")]
+    if check_socket:
+        checks.append((sock_path, stat.S_ISSOCK, "socket"))
+    for path, is_kind, kind in checks:
+        try:
+            st = os.lstat(path)
+        except OSError as e:
+            return f"cannot stat {path}: {e.strerror}"
+        if not is_kind(st.st_mode):
+            return f"{path} is not a {kind}"
+        if st.st_uid != uid:
+            return f"{path} is owned by uid {st.st_uid}, not {uid}"
+        if kind == "directory" and st.st_mode & 0o077:
+            return f"{path} is accessible to other users (mode {stat.S_IMODE(st.st_mode):o})"
+    return None
+
+
+def _code_stamp() -> list[int]:
+    """
+    Identify the running skillsctl code; a daemon started from other code must not answer.
+    """
+    key = _stat_key(Path(__file__))
+    return list(key) if key else []
+
+
+def _daemon_env(env: dict[str, str]) -> dict[str, str]:
+    return {k: v for k, v in env.items() if k.startswith(DAEMON_ENV_PREFIX)}
+
+
+def _recv_line(conn: socket.socket) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def _daemon_request(sock_path: Path, request: dict[str, Any], *, timeout: float | None) -> dict[str, Any] | None:
+    """
+    Send one JSON request to a running daemon. Returns None if no daemon answers.
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(DAEMON_CONNECT_TIMEOUT)
+            conn.connect(str(sock_path))
+            conn.settimeout(timeout)
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            data = _recv_line(conn)
+    except OSError:
+        return None
+    try:
+        reply = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def _daemon_eligible(argv: list[str]) -> bool:
+    if not hasattr(socket, "AF_UNIX") or os.environ.get("SKILLSCTL_NO_DAEMON", "").strip() not in ("", "0"):
+        return False
+    if _git_env_overrides():
+        return False
+    cmd = next((a for a in argv if not a.startswith("-")), None)
+    return cmd in DAEMON_COMMANDS and not any(a in ("-h", "--help") for a in argv)
+
+
+def _try_daemon(argv: list[str]) -> int | None:
+    """
+    Run argv on this repo's daemon if one is running; None means "run in-process".
+    """
+    if not _daemon_eligible(argv):
+        return None
+    root = _find_git_root(Path.cwd())
+    if root is None:
+        return None
+    sock_path = _daemon_socket_path(root)
+    if not os.path.exists(sock_path):
+        return None
+    problem = _daemon_socket_problem(sock_path)
+    if problem is not None:
+        _eprint(f"[WARN] Ignoring skillsctl daemon socket: {problem}")
+        return None
+    reply = _daemon_request(
+        sock_path,
+        {
+            "op": "run",
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": _daemon_env(dict(os.environ)),
+            "code": _code_stamp(),
+        },
+        timeout=DAEMON_REQUEST_TIMEOUT,
+    )
+    if reply is None or not isinstance(reply.get("rc"), int):
+        return None
+    sys.stdout.write(str(reply.get("stdout", "")))
+    sys.stderr.write(str(reply.get("stderr", "")))
+    return int(reply["rc"])
+
+
+def _serve_one(request: dict[str, Any]) -> dict[str, Any]:
+    argv = request.get("argv")
+    cwd = request.get("cwd")
+    env = request.get("env") or {}
+    if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv) or not isinstance(cwd, str):
+        return {"rc": 2, "stdout": "", "stderr": "[ERROR] Bad daemon request.\n"}
+    if not _daemon_eligible(argv):
+        return {"rc": None}
+
+    saved_cwd = os.getcwd()
+    saved_env = _daemon_env(dict(os.environ))
+    out, err = io.StringIO(), io.StringIO()
+    with _FORK_COUNTS_LOCK:
+        _FORK_COUNTS.clear()
+    try:
+        os.chdir(cwd)
+        for key in saved_env:
+            os.environ.pop(key, None)
+        os.environ.update(_daemon_env({str(k): str(v) for k, v in env.items()}))
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                rc = main(argv)
+            except SystemExit as e:
+                rc = e.code if isinstance(e.code, int) else 1
+    except OSError as e:
+        return {"rc": 1, "stdout": out.getvalue(), "stderr": err.getvalue() + f"[ERROR] {e}\n"}
+    except Exception:
+        # main() maps only SkillsCtlError; anything else fails this request alone, not the daemon.
+        return {"rc": 1, "stdout": out.getvalue(), "stderr": err.getvalue() + traceback.format_exc()}
+    finally:
+        os.chdir(saved_cwd)
+        for key in _daemon_env(dict(os.environ)):
+            os.environ.pop(key, None)
+        os.environ.update(saved_env)
+    return {"rc": rc, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        raise SkillsCtlError("[ERROR] skillsctl serve needs Unix domain sockets.")
+    root = _repo_root()
+    sock_path = _daemon_socket_path(root)
+
+    if args.stop:
+        if not os.path.exists(sock_path):
+            print("[OK] No skillsctl daemon running.")
+            return 0
+        problem = _daemon_socket_problem(sock_path)
+        if problem is not None:
+            raise SkillsCtlError(f"[ERROR] Refusing to talk to the daemon socket: {problem}")
+        reply = _daemon_request(sock_path, {"op": "stop"}, timeout=10)
+        if reply is None:
+            print("[OK] No skillsctl daemon running.")
+            return 0
+        print(f"[OK] Stopped skillsctl daemon (served {reply.get('served', 0)} request(s)).")
+        return 0
+
+    try:
+        sock_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    except OSError as e:
+        raise SkillsCtlError(f"[ERROR] Cannot create {sock_path.parent}: {e.strerror}") from None
+    problem = _daemon_socket_problem(sock_path, check_socket=False)
+    if problem is not None:
+        raise SkillsCtlError(
+            f"[ERROR] Refusing to serve: {problem}. Remove it or set XDG_RUNTIME_DIR to a private directory."
+        )
+    if os.path.lexists(sock_path):
+        if _daemon_request(sock_path, {"op": "ping"}, timeout=2) is not None:
+            raise SkillsCtlError(f"[ERROR] A skillsctl daemon is already serving {root} ({sock_path}).")
+        sock_path.unlink(missing_ok=True)
+
+    code = _code_stamp()
+    served = 0
+    idle_timeout = args.idle_timeout if args.idle_timeout > 0 else None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(sock_path))
+        server.listen(16)
+        server.settimeout(idle_timeout)
+        _eprint(f"[OK] Serving {root} on {sock_path}")
+        try:
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    _eprint(f"[OK] Idle for {args.idle_timeout:g}s; exiting.")
+                    break
+                with conn:
+                    conn.settimeout(DAEMON_REQUEST_TIMEOUT)
+                    try:
+                        request = json.loads(_recv_line(conn).decode("utf-8"))
+                    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+                        continue
+                    op = request.get("op") if isinstance(request, dict) else None
+                    stop = op == "stop" or (op == "run" and request.get("code") != code)
+                    if op == "run" and not stop:
+                        reply = _serve_one(request)
+                        served += 1
+                    else:
+                        reply = {"served": served, "rc": None}
+                    with contextlib.suppress(OSError):
+                        conn.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+                if stop:
+                    break
+        finally:
+            sock_path.unlink(missing_ok=True)
+    return 0
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(
         prog="skillsctl",
         description="Manage repo-scoped Codex skills via submodule+sparse.",
     )
+    parser.add_argument(
+        "--fork-stats",
+        action="store_true",
+        help="Print subprocess counts per command to stderr (also: SKILLSCTL_FORK_STATS=1).",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write phase/subprocess spans as Chrome trace-event JSON and a summary to stderr (also: SKILLSCTL_TRACE=FILE).",
+    )
     sub = parser.add_subparsers(dest="cmd", required=True)
 
+    def add_store_flag(p: argparse.ArgumentParser) -> None:
+        p.add_argument(
+            "--store",
+            action="store_true",
+            help="Hardlink selected skill files from a machine-wide blob store in ~/.cache/skillsctl/store "
+            "(reflink/copy across devices; also: SKILLSCTL_STORE=1).",
+        )
+
     def add_repo_flags(p: argparse.ArgumentParser) -> None:
         p.add_argument("--repo-url", help="Skills repo URL (defaults: config/env/hardcoded).")
         p.add_argument("--branch", help="Skills repo branch (default: main).")
+        p.add_argument(
+            "--filter",
+            help="Partial-clone .codex/skills with this filter (e.g. blob:none); saved to config.",
+        )
+        p.add_argument(
+            "--shared-cache",
+            action="store_true",
+            help="Borrow objects from a machine-wide mirror in ~/.cache/skillsctl (also: SKILLSCTL_SHARED_CACHE=1).",
+        )
+        add_store_flag(p)
         p.add_argument("--stage", action="store_true", help="Stage project file changes (git add).")
         p.add_argument("--yes", action="store_true", help="Non-interactive mode (reserved for future prompts).")
 
+    def add_claude_flag(p: argparse.ArgumentParser) -> None:
+        p.add_argument(
+            "--claude",
+            action="store_true",
+            help=f"Also refresh Claude Code wrappers in {CLAUDE_SKILLS_REL}/<id>/SKILL.md (see export-claude).",
+        )
+
     p_bootstrap = sub.add_parser("bootstrap", help="Initialize .codex/skills submodule + sparse-checkout catalog.")
     add_repo_flags(p_bootstrap)
     p_bootstrap.set_defaults(func=cmd_bootstrap)
 
     p_catalog = sub.add_parser("catalog", help="List the catalog of available skills.")
+    p_catalog.add_argument(
+        "--tag",
+        action="append",
+        help="Only skills carrying this tag (repeatable; all must match).",
+    )
+    p_catalog.add_argument("--prefix", help="Only skills whose id starts with this prefix.")
+    p_catalog.add_argument(
+        "--fields",
+        help="Comma-separated fields to emit with --toon/--ndjson (e.g. id,title).",
+    )
+    p_catalog.add_argument("--limit", type=int, help="Max entries to return (default: all).")
+    p_catalog.add_argument("--offset", type=int, default=0, help="Skip this many matching entries (default: 0).")
+    p_catalog.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one minified JSON entry per line.",
+    )
+    p_catalog.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Ignore catalog/skills.offsets.json and filter the fully parsed catalog.",
+    )
     p_catalog.add_argument(
         "--toon",
         "--json",
@@ -844,6 +3838,16 @@ def main(argv: list[str]) -> int:
     p_suggest = sub.add_parser("suggest", help="Suggest skills for a query using catalog scoring.")
     p_suggest.add_argument("query", help="Query string (e.g. 'pdf', 'security', 'rust cli').")
     p_suggest.add_argument("--limit", type=int, default=10, help="Max results (default: 10).")
+    p_suggest.add_argument(
+        "--deep",
+        action="store_true",
+        help="Full-text search SKILL.md bodies and reference docs (BM25 + snippets via SQLite FTS5).",
+    )
+    p_suggest.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Ignore catalog/skills.index.json and score every catalog entry.",
+    )
     p_suggest.add_argument(
         "--toon",
         "--json",
@@ -855,24 +3859,120 @@ def main(argv: list[str]) -> int:
 
     p_install = sub.add_parser("install", help="Add skill id(s) to the manifest and update sparse-checkout.")
     add_repo_flags(p_install)
+    add_claude_flag(p_install)
     p_install.add_argument("ids", nargs="+", help="Skill id(s) to install.")
     p_install.set_defaults(func=cmd_install)
 
     p_remove = sub.add_parser("remove", help="Remove skill id(s) from the manifest and update sparse-checkout.")
     add_repo_flags(p_remove)
+    add_claude_flag(p_remove)
     p_remove.add_argument("ids", nargs="+", help="Skill id(s) to remove.")
     p_remove.set_defaults(func=cmd_remove)
 
+    p_plan = sub.add_parser(
+        "plan",
+        help="Show files/bytes an install (or --remove/--set) would materialize, without touching the worktree.",
+    )
+    p_plan.add_argument("ids", nargs="+", help="Skill id(s) to install (or remove/set).")
+    plan_mode = p_plan.add_mutually_exclusive_group()
+    plan_mode.add_argument("--remove", action="store_true", help="Plan removing the ids instead.")
+    plan_mode.add_argument("--set", action="store_true", help="Plan replacing the selection with the ids.")
+    p_plan.add_argument("--out", help="Write the plan JSON to this file (input for `skillsctl apply`).")
+    p_plan.add_argument(
+        "--toon",
+        "--json",
+        dest="toon",
+        action="store_true",
+        help="Token-optimized machine output (minified JSON).",
+    )
+    p_plan.set_defaults(func=cmd_plan)
+
+    p_apply = sub.add_parser("apply", help="Apply a plan from `skillsctl plan --out` in one sparse-checkout pass.")
+    p_apply.add_argument("plan", help="Plan JSON file ('-' for stdin).")
+    p_apply.add_argument("--stage", action="store_true", help="Stage project file changes (git add).")
+    add_store_flag(p_apply)
+    p_apply.set_defaults(func=cmd_apply)
+
     p_set = sub.add_parser("set", help="Replace the manifest selection with the given skill id(s).")
     add_repo_flags(p_set)
+    add_claude_flag(p_set)
     p_set.add_argument("ids", nargs="*", help="Skill id(s) to set (empty clears selection).")
     p_set.set_defaults(func=cmd_set)
 
     p_sync = sub.add_parser("sync", help="Sync submodule+sparse-checkout to the committed manifest.")
     add_repo_flags(p_sync)
+    add_claude_flag(p_sync)
+    p_sync.add_argument(
+        "--roots-from",
+        metavar="FILE",
+        help="Sync every checkout listed in FILE (one path per line, '-' for stdin); prints NDJSON.",
+    )
+    p_sync.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_SYNC_JOBS,
+        help=f"Parallel repos with --roots-from (default: {DEFAULT_SYNC_JOBS}).",
+    )
     p_sync.set_defaults(func=cmd_sync)
 
+    p_export_claude = sub.add_parser(
+        "export-claude",
+        help=f"Write {CLAUDE_SKILLS_REL}/<id>/SKILL.md wrappers for the selected skills (only changed ones).",
+    )
+    p_export_claude.add_argument("--stage", action="store_true", help="Stage wrapper changes (git add).")
+    p_export_claude.add_argument(
+        "--toon",
+        "--json",
+        dest="toon",
+        action="store_true",
+        help="Token-optimized machine output (minified JSON).",
+    )
+    p_export_claude.set_defaults(func=cmd_export_claude)
+
+    p_outdated = sub.add_parser(
+        "outdated",
+        help="Fetch the branch tip and report which selected skills changed since the pinned gitlink.",
+    )
+    p_outdated.add_argument("--branch", help="Branch to compare against (default: config/main).")
+    p_outdated.add_argument(
+        "--exit-code",
+        action="store_true",
+        help="Exit 1 when any selected skill changed upstream.",
+    )
+    p_outdated.add_argument(
+        "--toon",
+        "--json",
+        dest="toon",
+        action="store_true",
+        help="Token-optimized machine output (minified JSON).",
+    )
+    p_outdated.set_defaults(func=cmd_outdated)
+
+    p_verify = sub.add_parser(
+        "verify",
+        help="Check materialized skill files against the tree hashes pinned in .codex/skills.lock.",
+    )
+    p_verify.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_VERIFY_JOBS,
+        help=f"Parallel `git hash-object` processes for large selections (default: {DEFAULT_VERIFY_JOBS}).",
+    )
+    p_verify.add_argument(
+        "--toon",
+        "--json",
+        dest="toon",
+        action="store_true",
+        help="Token-optimized machine output (minified JSON).",
+    )
+    p_verify.set_defaults(func=cmd_verify)
+
     p_status = sub.add_parser("status", help="Show current bootstrap/selection status.")
+    p_status.add_argument(
+        "--fast",
+        action="store_true",
+        help="Read state from disk only (no git status scan); submodule_dirty is reported as null.",
+    )
     p_status.add_argument(
         "--toon",
         "--json",
@@ -883,18 +3983,76 @@ def main(argv: list[str]) -> int:
     p_status.set_defaults(func=cmd_status)
 
     p_doctor = sub.add_parser("doctor", help="Run environment and project checks.")
+    p_doctor.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run tool version probes instead of using the per-binary cache.",
+    )
     p_doctor.set_defaults(func=cmd_doctor)
 
+    p_cache = sub.add_parser("cache", help="Manage the machine-wide shared object cache.")
+    cache_sub = p_cache.add_subparsers(dest="cache_cmd", required=True)
+    p_cache_gc = cache_sub.add_parser(
+        "gc",
+        help="Repack caches still borrowed by projects; delete unused ones idle for --max-age-days; prune unlinked store blobs.",
+    )
+    p_cache_gc.add_argument(
+        "--max-age-days",
+        type=float,
+        default=OBJECT_CACHE_MAX_AGE_DAYS,
+        help=f"Keep unused caches touched within this many days (default: {OBJECT_CACHE_MAX_AGE_DAYS}).",
+    )
+    p_cache_gc.add_argument(
+        "--toon",
+        "--json",
+        dest="toon",
+        action="store_true",
+        help="Token-optimized machine output (minified JSON).",
+    )
+    p_cache_gc.set_defaults(func=cmd_cache_gc)
+
+    p_serve = sub.add_parser(
+        "serve",
+        help="Keep catalog/manifest/submodule state in memory and answer status/catalog/suggest over a Unix socket.",
+    )
+    p_serve.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DAEMON_IDLE_TIMEOUT,
+        help=f"Exit after this many idle seconds; 0 = never (default: {DAEMON_IDLE_TIMEOUT:g}).",
+    )
+    p_serve.add_argument("--stop", action="store_true", help="Stop the daemon serving this repo.")
+    p_serve.set_defaults(func=cmd_serve)
+
     args = parser.parse_args(argv)
+    global _TRACE
+    trace_path = args.trace or os.environ.get("SKILLSCTL_TRACE", "").strip()
+    _TRACE = _Tracer(Path(trace_path)) if trace_path else None
     try:
-        return int(args.func(args))
+        with _phase(args.cmd):
+            return int(args.func(args))
     except SkillsCtlError as e:
         _eprint(str(e))
         return 1
+    finally:
+        if _fork_stats_enabled(args.fork_stats):
+            _print_fork_stats()
+        if _TRACE is not None:
+            try:
+                _TRACE.write()
+            except OSError as e:
+                _eprint(f"[WARN] Could not write trace {_TRACE.path}: {e}")
+            for line in _TRACE.summary():
+                _eprint(line)
+            _TRACE = None
 
 
 def cli() -> int:
-    return main(sys.argv[1:])
+    argv = sys.argv[1:]
+    rc = _try_daemon(argv)
+    if rc is not None:
+        return rc
+    return main(argv)
 
 
 if __name__ == "__main__":